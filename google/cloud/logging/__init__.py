@@ -20,11 +20,18 @@ from google.cloud.logging_v2 import ASCENDING
 from google.cloud.logging_v2 import DESCENDING
 
 from google.cloud.logging_v2.client import Client
+from google.cloud.logging_v2.async_client import AsyncClient
+from google.cloud.logging_v2.async_logger import AsyncBatch
+from google.cloud.logging_v2.async_logger import AsyncLogger
 from google.cloud.logging_v2.entries import logger_name_from_path
 from google.cloud.logging_v2.entries import LogEntry
 from google.cloud.logging_v2.entries import TextEntry
 from google.cloud.logging_v2.entries import StructEntry
 from google.cloud.logging_v2.entries import ProtobufEntry
+from google.cloud.logging_v2.entry_cache import EntryCache
+from google.cloud.logging_v2.entry_frame import LogEntryFrame
+from google.cloud.logging_v2.filters import compile_filter
+from google.cloud.logging_v2.filters import FilterSyntaxError
 from google.cloud.logging_v2 import handlers
 from google.cloud.logging_v2.logger import Logger
 from google.cloud.logging_v2.logger import Batch
@@ -36,13 +43,20 @@ from google.cloud.logging_v2 import types
 __all__ = (
     "__version__",
     "ASCENDING",
+    "AsyncBatch",
+    "AsyncClient",
+    "AsyncLogger",
     "Batch",
     "Client",
+    "compile_filter",
     "DESCENDING",
+    "EntryCache",
+    "FilterSyntaxError",
     "handlers",
     "logger_name_from_path",
     "Logger",
     "LogEntry",
+    "LogEntryFrame",
     "Metric",
     "ProtobufEntry",
     "Resource",
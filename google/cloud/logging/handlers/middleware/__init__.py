@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from google.cloud.logging_v2.handlers.middleware.asgi import ASGIRequestMiddleware
 from google.cloud.logging_v2.handlers.middleware.request import RequestMiddleware
+from google.cloud.logging_v2.handlers.middleware.wsgi import WSGIRequestMiddleware
 
-__all__ = ["RequestMiddleware"]
+__all__ = ["ASGIRequestMiddleware", "RequestMiddleware", "WSGIRequestMiddleware"]
@@ -13,10 +13,11 @@
 # limitations under the License.
 
 """Transport classes for Python logging integration.
-Currently two options are provided, a synchronous transport that makes
-an API call for each log statement, and an asynchronous handler that
+Currently three options are provided, a synchronous transport that makes
+an API call for each log statement, an asynchronous handler that
 sends the API using a :class:`~google.cloud.logging.logger.Batch` object in
-the background.
+the background, and a transport that sends the logs of each request in a
+single API call when the request ends.
 """
 
 from google.cloud.logging_v2.handlers.transports.base import Transport
@@ -24,5 +25,13 @@ from google.cloud.logging_v2.handlers.transports.sync import SyncTransport
 from google.cloud.logging_v2.handlers.transports.background_thread import (
     BackgroundThreadTransport,
 )
+from google.cloud.logging_v2.handlers.transports.request_batch import (
+    RequestBatchTransport,
+)
 
-__all__ = ["BackgroundThreadTransport", "SyncTransport", "Transport"]
+__all__ = [
+    "BackgroundThreadTransport",
+    "RequestBatchTransport",
+    "SyncTransport",
+    "Transport",
+]
@@ -0,0 +1,287 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Log entries backed by the ``LogEntry`` protobufs returned over gRPC.
+
+Converting every entry read to its JSON mapping and then to a
+:class:`~logging_v2.entries.LogEntry` costs far more than most callers need,
+as they usually look at a handful of fields. The views here keep the
+protobuf and decode each field the first time it is accessed, producing the
+same values as :meth:`~logging_v2.entries.LogEntry.from_api_repr`.
+"""
+
+import datetime
+
+from google.protobuf.json_format import MessageToDict
+
+from google.cloud.logging_v2.entries import _int_or_none
+from google.cloud.logging_v2.entries import _logger_for_entry
+from google.cloud.logging_v2.entries import _register_proto_types
+from google.cloud.logging_v2.entries import LogEntry
+from google.cloud.logging_v2.entries import ProtobufEntry
+from google.cloud.logging_v2.entries import StructEntry
+from google.cloud.logging_v2.entries import TextEntry
+from google.cloud.logging_v2.resource import Resource
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _timestamp_to_datetime(timestamp_pb):
+    """Convert a ``Timestamp`` to a UTC datetime, truncating to microseconds."""
+    return _EPOCH + datetime.timedelta(
+        seconds=timestamp_pb.seconds, microseconds=timestamp_pb.nanos // 1000
+    )
+
+
+def _message_field_to_dict(entry_pb, field):
+    """Return the JSON mapping of a message field, or None if it is unset."""
+    if not entry_pb.HasField(field):
+        return None
+    return MessageToDict(getattr(entry_pb, field))
+
+
+def _decode_severity(entry_pb):
+    if not entry_pb.severity:
+        return None
+    enum_type = entry_pb.DESCRIPTOR.fields_by_name["severity"].enum_type
+    value = enum_type.values_by_number.get(entry_pb.severity)
+    return entry_pb.severity if value is None else value.name
+
+
+def _decode_timestamp(entry_pb, field="timestamp"):
+    if not entry_pb.HasField(field):
+        return None
+    return _timestamp_to_datetime(getattr(entry_pb, field))
+
+
+def _decode_resource(entry_pb):
+    if not entry_pb.HasField("resource"):
+        return None
+    return Resource(type=entry_pb.resource.type, labels=dict(entry_pb.resource.labels))
+
+
+def _decode_source_location(entry_pb):
+    source_location = _message_field_to_dict(entry_pb, "source_location")
+    if source_location is not None:
+        line = source_location.pop("line", None)
+        source_location["line"] = _int_or_none(line)
+    return source_location
+
+
+def _decode_proto_payload(entry_pb):
+    try:
+        return MessageToDict(entry_pb.proto_payload)
+    except TypeError:
+        if _register_proto_types():
+            return _decode_proto_payload(entry_pb)
+        # unknown payload type: hand back the ``Any`` itself
+        return entry_pb.proto_payload
+
+
+_FIELD_DECODERS = {
+    "log_name": lambda entry_pb: entry_pb.log_name,
+    "labels": lambda entry_pb: dict(entry_pb.labels) or None,
+    "insert_id": lambda entry_pb: entry_pb.insert_id or None,
+    "severity": _decode_severity,
+    "http_request": lambda entry_pb: _message_field_to_dict(entry_pb, "http_request"),
+    "timestamp": _decode_timestamp,
+    "resource": _decode_resource,
+    "trace": lambda entry_pb: entry_pb.trace or None,
+    "span_id": lambda entry_pb: entry_pb.span_id or None,
+    "trace_sampled": lambda entry_pb: entry_pb.trace_sampled or None,
+    "source_location": _decode_source_location,
+    "operation": lambda entry_pb: _message_field_to_dict(entry_pb, "operation"),
+}
+
+
+def _lazy_field(name, decode):
+    """Build a read-only property decoding ``name`` on first access."""
+
+    def getter(self):
+        try:
+            return self._decoded[name]
+        except KeyError:
+            value = self._decoded[name] = decode(self)
+            return value
+
+    return property(getter)
+
+
+class _EntryView(object):
+    """Mixin turning a :class:`~logging_v2.entries.LogEntry` into a protobuf view.
+
+    Fields are properties decoded from ``_entry_pb`` on first access; the
+    underlying tuple only holds the defaults. Tuple operations (iteration,
+    indexing, comparison, ``repr`` and pickling) are redirected to the
+    decoded values, so a view behaves like the equivalent eager entry.
+    """
+
+    # The eager entry class this view stands in for.
+    _eager_class = LogEntry
+
+    @classmethod
+    def from_pb(cls, entry_pb, client, *, loggers=None):
+        """Wrap an entry protobuf without decoding any of its fields.
+
+        Args:
+            entry_pb (google.logging.v2.log_entry_pb2.LogEntry): The raw entry
+                protobuf returned by the API. It must not be modified afterwards.
+            client (~logging_v2.client.Client):
+                Client which holds credentials and project configuration.
+            loggers (Optional[dict]):
+                A mapping of logger fullnames -> loggers, used to look up the
+                entry's logger once it is accessed.
+
+        Returns:
+            _EntryView: The entry view.
+        """
+        inst = cls()
+        inst._entry_pb = entry_pb
+        inst._client = client
+        inst._loggers = loggers
+        inst._decoded = {}
+        return inst
+
+    logger = _lazy_field(
+        "logger",
+        lambda self: _logger_for_entry(
+            self._entry_pb.log_name, self._client, self._loggers
+        ),
+    )
+
+    payload = _lazy_field("payload", lambda self: self._decode_payload())
+
+    def _decode_payload(self):
+        return None
+
+    @property
+    def received_timestamp(self):
+        if "received_timestamp" not in self._decoded:
+            self._decoded["received_timestamp"] = _decode_timestamp(
+                self._entry_pb, "receive_timestamp"
+            )
+        return self._decoded["received_timestamp"]
+
+    @received_timestamp.setter
+    def received_timestamp(self, value):
+        self._decoded["received_timestamp"] = value
+
+    def _materialize(self):
+        """Decode all fields into an instance of the eager entry class."""
+        entry = self._eager_class(*self)
+        if self.received_timestamp is not None:
+            entry.received_timestamp = self.received_timestamp
+        return entry
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __getitem__(self, index):
+        return tuple(iter(self))[index]
+
+    def __contains__(self, value):
+        return any(item == value for item in self)
+
+    def __eq__(self, other):
+        if isinstance(other, _EntryView):
+            other = tuple(iter(other))
+        return tuple(iter(self)) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(iter(self)))
+
+    def __repr__(self):
+        return repr(self._materialize())
+
+    def __reduce__(self):
+        # copies and pickles are plain entries
+        entry = self._materialize()
+        return (self._eager_class._make, (tuple(entry),), entry.__dict__ or None)
+
+    def _replace(self, **kwargs):
+        return self._materialize()._replace(**kwargs)
+
+
+for _name, _decode in _FIELD_DECODERS.items():
+    setattr(
+        _EntryView,
+        _name,
+        _lazy_field(_name, lambda self, decode=_decode: decode(self._entry_pb)),
+    )
+del _name, _decode
+
+
+class _LogEntryView(_EntryView, LogEntry):
+    __doc__ = LogEntry.__doc__
+
+
+class _TextEntryView(_EntryView, TextEntry):
+    __doc__ = TextEntry.__doc__
+    _eager_class = TextEntry
+
+    def _decode_payload(self):
+        return self._entry_pb.text_payload
+
+
+class _StructEntryView(_EntryView, StructEntry):
+    __doc__ = StructEntry.__doc__
+    _eager_class = StructEntry
+
+    def _decode_payload(self):
+        return MessageToDict(self._entry_pb.json_payload)
+
+
+class _ProtobufEntryView(_EntryView, ProtobufEntry):
+    __doc__ = ProtobufEntry.__doc__
+    _eager_class = ProtobufEntry
+
+    def _decode_payload(self):
+        return _decode_proto_payload(self._entry_pb)
+
+
+_VIEW_CLASSES = {
+    "text_payload": _TextEntryView,
+    "json_payload": _StructEntryView,
+    "proto_payload": _ProtobufEntryView,
+    None: _LogEntryView,
+}
+
+
+def entry_view_from_pb(entry_pb, client, loggers):
+    """Wrap an entry protobuf in the view matching its payload type.
+
+    The protobuf counterpart of :func:`~logging_v2._helpers.entry_from_resource`.
+
+    Args:
+        entry_pb (google.logging.v2.log_entry_pb2.LogEntry): One raw entry
+            protobuf from an API response.
+        client (~logging_v2.client.Client):
+            Client that owns the log entry.
+        loggers (dict):
+            A mapping of logger fullnames -> loggers.  If the logger
+            that owns the entry is not in ``loggers``, the entry
+            will have a newly-created logger.
+
+    Returns:
+        google.cloud.logging_v2.entries.LogEntry: A lazily decoded instance
+        of :class:`~logging_v2.entries.TextEntry`,
+        :class:`~logging_v2.entries.StructEntry`,
+        :class:`~logging_v2.entries.ProtobufEntry` or
+        :class:`~logging_v2.entries.LogEntry`.
+    """
+    view_class = _VIEW_CLASSES[entry_pb.WhichOneof("payload")]
+    return view_class.from_pb(entry_pb, client, loggers=loggers)
@@ -0,0 +1,173 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Apply a project's log exclusions before entries are sent.
+
+The server discards entries matching an active exclusion on arrival, after
+the client has spent the CPU, queue memory and bandwidth to send them. The
+exclusions are fetched periodically by a background thread and compiled with
+:func:`~logging_v2.filters.compile_filter`, so that excluded entries can be
+dropped when they are logged.
+"""
+
+import collections
+import logging
+import threading
+
+from google.cloud.logging_v2.filters import compile_filter
+
+_DEFAULT_REFRESH_INTERVAL = 300  # Seconds
+_REFRESHER_THREAD_NAME = "google.cloud.logging.ExclusionRefresher"
+_LOGGER = logging.getLogger(__name__)
+
+
+class _LocalExclusions(object):
+    """The active exclusions of a client's project, compiled locally.
+
+    Exclusions whose filters cannot be evaluated locally, such as those using
+    ``sample()``, are left to the server. Until the first refresh completes,
+    no entries are dropped.
+
+    Attributes:
+        dropped_counts (collections.Counter): The number of entries dropped,
+            by exclusion name.
+    """
+
+    def __init__(self, client, *, refresh_interval=_DEFAULT_REFRESH_INTERVAL):
+        """
+        Args:
+            client (~logging_v2.client.Client): The client whose project's
+                exclusions are applied.
+            refresh_interval (Optional[float]): How many seconds to wait
+                between two fetches of the exclusions.
+        """
+        self._client = client
+        self._refresh_interval = refresh_interval
+        self._filters = ()
+        self._counts_lock = threading.Lock()
+        self.dropped_counts = collections.Counter()
+        self._stopping = threading.Event()
+        self._operational_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def dropped(self):
+        """int: The number of entries dropped by all exclusions."""
+        return sum(self.dropped_counts.values())
+
+    @property
+    def exclusions(self):
+        """List[str]: The names of the exclusions applied locally."""
+        return [name for name, _ in self._filters]
+
+    @property
+    def is_alive(self):
+        """Returns True is the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self):
+        """Fetch and compile the project's active exclusions."""
+        filters = []
+        exclusions = self._client.sinks_api.list_exclusions(
+            f"projects/{self._client.project}"
+        )
+        for exclusion in exclusions:
+            if exclusion.get("disabled"):
+                continue
+            name = exclusion["name"]
+            try:
+                filters.append((name, compile_filter(exclusion["filter"])))
+            except ValueError:
+                _LOGGER.debug(
+                    "Exclusion %s cannot be evaluated locally.", name, exc_info=True
+                )
+        self._filters = tuple(filters)
+
+    def excluded(self, entry, logger=None):
+        """Check an entry against the exclusions, counting it if it matches.
+
+        Args:
+            entry (~logging_v2.entries.LogEntry): The entry to check.
+            logger (Optional[~logging_v2.logger.Logger]): The logger writing
+                the entry, whose name and labels apply to entries without
+                their own.
+
+        Returns:
+            bool: True if the entry matches an exclusion.
+        """
+        filters = self._filters
+        if not filters:
+            return False
+        if logger is not None:
+            entry = _with_logger_defaults(entry, logger)
+        for name, matches in filters:
+            if matches(entry):
+                with self._counts_lock:
+                    self.dropped_counts[name] += 1
+                return True
+        return False
+
+    def _thread_main(self):
+        """The entry point for the refresher thread."""
+        while not self._stopping.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                _LOGGER.warning("Failed to fetch log exclusions.", exc_info=True)
+            self._stopping.wait(self._refresh_interval)
+
+    def start(self):
+        """Starts the background thread."""
+        with self._operational_lock:
+            if self.is_alive:
+                return
+
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._thread_main, name=_REFRESHER_THREAD_NAME
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, *, timeout=None):
+        """Stops the background thread.
+
+        Args:
+            timeout (Optional[float]): If specified, block up to this many seconds
+                for an in-flight refresh to complete.
+
+        Returns:
+            bool: True if the thread terminated. False if the thread is still
+            running.
+        """
+        with self._operational_lock:
+            self._stopping.set()
+            if self._thread is None:
+                return True
+            self._thread.join(timeout=timeout)
+            success = not self._thread.is_alive()
+            self._thread = None
+            return success
+
+
+def _with_logger_defaults(entry, logger):
+    """Fill in the fields a write request supplies for a logger's entries."""
+    updates = {}
+    if entry.log_name is None:
+        updates["log_name"] = logger.full_name
+    if logger.labels:
+        updates["labels"] = {**logger.labels, **(entry.labels or {})}
+    if entry.resource is None and logger.default_resource is not None:
+        updates["resource"] = logger.default_resource
+    return entry._replace(**updates) if updates else entry
@@ -0,0 +1,470 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Resumable export of log entries to local files.
+
+Entries are streamed page by page into numbered part files in a destination
+directory, so memory use is bounded by the page size. Each time a part file
+is complete, a JSON checkpoint records the page token to continue from, and
+the timestamp and insert IDs of the last exported entry. An interrupted
+export run again with the same checkpoint carries on after the last complete
+part file; if its page token has expired, the query restarts after the last
+exported entry instead.
+
+Also runnable from the command line; see :func:`main`.
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import sys
+
+from google.api_core.exceptions import BadRequest
+from google.protobuf.message import Message
+
+from google.cloud.logging_v2._helpers import _add_defaults_to_filter
+from google.cloud.logging_v2._timestamps import _NAT
+from google.cloud.logging_v2._timestamps import _rfc3339_to_nanos
+
+_CHECKPOINT_NAME = "_checkpoint.json"
+_DEFAULT_PAGE_SIZE = 1000
+_DEFAULT_MAX_ENTRIES_PER_FILE = 100000
+
+_STRING_COLUMNS = (
+    ("severity", "severity"),
+    ("log_name", "logName"),
+    ("insert_id", "insertId"),
+    ("trace", "trace"),
+    ("span_id", "spanId"),
+    ("text_payload", "textPayload"),
+)
+"""Arrow string columns, and the entry resource keys they are read from."""
+
+_JSON_COLUMNS = (
+    ("labels", "labels"),
+    ("json_payload", "jsonPayload"),
+    ("proto_payload", "protoPayload"),
+    ("http_request", "httpRequest"),
+    ("operation", "operation"),
+    ("source_location", "sourceLocation"),
+)
+"""Arrow columns holding the JSON encoding of nested entry fields."""
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: NO COVER
+        raise ImportError(
+            "pyarrow is required to export to Parquet or Arrow: "
+            "install google-cloud-logging[pyarrow]"
+        ) from exc
+    return pyarrow
+
+
+def _json_default(value):
+    """Encode payloads of protobuf types unknown to the library."""
+    if (
+        isinstance(value, Message)
+        and value.DESCRIPTOR.full_name == "google.protobuf.Any"
+    ):
+        return {
+            "@type": value.type_url,
+            "value": base64.b64encode(value.value).decode("ascii"),
+        }
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"), default=_json_default)
+
+
+class _NDJSONWriter(object):
+    """Write entry resources as gzip-compressed newline-delimited JSON."""
+
+    extension = ".ndjson.gz"
+
+    def __init__(self, path):
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, resources):
+        self._file.writelines(_dumps(resource) + "\n" for resource in resources)
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowBatchWriter(object):
+    """Base for writers converting each page to an Arrow record batch."""
+
+    def __init__(self, path):
+        self._pyarrow = pyarrow = _import_pyarrow()
+        timestamp = pyarrow.timestamp("ns", tz="UTC")
+        fields = [
+            ("timestamp", timestamp),
+            ("receive_timestamp", timestamp),
+            ("resource_type", pyarrow.string()),
+            ("resource_labels", pyarrow.string()),
+            ("trace_sampled", pyarrow.bool_()),
+        ]
+        fields.extend((name, pyarrow.string()) for name, _ in _STRING_COLUMNS)
+        fields.extend((name, pyarrow.string()) for name, _ in _JSON_COLUMNS)
+        self.schema = pyarrow.schema(fields)
+        self._writer = self._open(path)
+
+    def _record_batch(self, resources):
+        pyarrow = self._pyarrow
+        columns = {}
+        for name, key in (
+            ("timestamp", "timestamp"),
+            ("receive_timestamp", "receiveTimestamp"),
+        ):
+            nanos = _rfc3339_to_nanos([resource.get(key) for resource in resources])
+            columns[name] = pyarrow.array(
+                nanos, type=pyarrow.int64(), mask=nanos == _NAT
+            ).cast(self.schema.field(name).type)
+
+        monitored = [resource.get("resource") or {} for resource in resources]
+        columns["resource_type"] = [item.get("type") for item in monitored]
+        columns["resource_labels"] = [
+            _dumps(item["labels"]) if item.get("labels") else None for item in monitored
+        ]
+        columns["trace_sampled"] = [
+            resource.get("traceSampled") for resource in resources
+        ]
+        for name, key in _STRING_COLUMNS:
+            columns[name] = [resource.get(key) for resource in resources]
+        for name, key in _JSON_COLUMNS:
+            columns[name] = [
+                None if resource.get(key) is None else _dumps(resource[key])
+                for resource in resources
+            ]
+        return pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(columns[field.name], type=field.type)
+                for field in self.schema
+            ],
+            schema=self.schema,
+        )
+
+    def write(self, resources):
+        self._writer.write_batch(self._record_batch(resources))
+
+    def close(self):
+        self._writer.close()
+
+
+class _ParquetWriter(_ArrowBatchWriter):
+    """Write each page as a row group of a Parquet file."""
+
+    extension = ".parquet"
+
+    def _open(self, path):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(path, self.schema)
+
+
+class _ArrowFileWriter(_ArrowBatchWriter):
+    """Write each page as a record batch of an Arrow IPC file."""
+
+    extension = ".arrow"
+
+    def _open(self, path):
+        import pyarrow.ipc
+
+        return pyarrow.ipc.new_file(path, self.schema)
+
+
+_WRITERS = {
+    "ndjson": _NDJSONWriter,
+    "parquet": _ParquetWriter,
+    "arrow": _ArrowFileWriter,
+}
+
+
+class _PartFile(object):
+    """A part file, written under a temporary name until it is complete."""
+
+    def __init__(self, writer_class, destination, index):
+        self.path = os.path.join(
+            destination, f"part-{index:05d}{writer_class.extension}"
+        )
+        self._tmp_path = self.path + ".tmp"
+        self._writer = writer_class(self._tmp_path)
+        self.entries = 0
+
+    def write(self, resources):
+        self._writer.write(resources)
+        self.entries += len(resources)
+
+    def commit(self):
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        try:
+            self._writer.close()
+        finally:
+            os.remove(self._tmp_path)
+
+
+def _load_checkpoint(path):
+    try:
+        with open(path, encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(path, state):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(state, checkpoint_file, indent=2)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def _last_position(resources, last_timestamp, last_insert_ids):
+    """Return the timestamp and insert IDs of the last entry of a page.
+
+    Insert IDs are only unique for a given timestamp, so all the IDs seen with
+    the last timestamp are kept.
+    """
+    if not resources:
+        return last_timestamp, last_insert_ids
+    timestamp = resources[-1].get("timestamp")
+    insert_ids = [] if timestamp != last_timestamp else list(last_insert_ids)
+    for resource in reversed(resources):
+        if resource.get("timestamp") != timestamp:
+            break
+        insert_ids.append(resource.get("insertId"))
+    return timestamp, insert_ids
+
+
+def _resumed_pages(api, resource_names, state, order_by, page_size):
+    """Yield the pages left to export, as ``(resources, next_page_token)``."""
+    kw = {"order_by": order_by, "page_size": page_size}
+    token = state["page_token"]
+    if token is not None:
+        pages = api._list_entry_pages(
+            resource_names, filter_=state["filter"], page_token=token, **kw
+        )
+        try:
+            first = next(pages)
+        except StopIteration:
+            return
+        except BadRequest:
+            # page tokens expire: continue after the last exported entry
+            pass
+        else:
+            yield first
+            yield from pages
+            return
+
+    filter_ = state["filter"]
+    last_timestamp = state["last_timestamp"]
+    if last_timestamp is not None:
+        descending = order_by is not None and order_by.lower().endswith("desc")
+        operator = "<=" if descending else ">="
+        filter_ = f'({filter_}) AND timestamp{operator}"{last_timestamp}"'
+    exported = set(state["last_insert_ids"])
+    for resources, next_page_token in api._list_entry_pages(
+        resource_names, filter_=filter_, **kw
+    ):
+        yield [
+            resource
+            for resource in resources
+            if resource.get("timestamp") != last_timestamp
+            or resource.get("insertId") not in exported
+        ], next_page_token
+
+
+def _export_entries(
+    api,
+    destination,
+    *,
+    resource_names,
+    filter_=None,
+    order_by=None,
+    format_="ndjson",
+    checkpoint_path=None,
+    page_size=_DEFAULT_PAGE_SIZE,
+    max_entries_per_file=_DEFAULT_MAX_ENTRIES_PER_FILE,
+):
+    """Export the entries matching a query to part files.
+
+    See :meth:`~logging_v2.client.Client.export_entries`.
+
+    Returns:
+        int: The number of entries exported so far, including those exported
+        by earlier, interrupted runs.
+    """
+    try:
+        writer_class = _WRITERS[format_]
+    except KeyError:
+        raise ValueError(
+            f"format_ must be one of {sorted(_WRITERS)}, not {format_!r}"
+        ) from None
+    if max_entries_per_file < 1:
+        raise ValueError("max_entries_per_file must be positive")
+    if writer_class is not _NDJSONWriter:
+        _import_pyarrow()
+
+    os.makedirs(destination, exist_ok=True)
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(destination, _CHECKPOINT_NAME)
+    query = {
+        "resource_names": list(resource_names),
+        "filter": filter_,
+        "order_by": order_by,
+        "format": format_,
+    }
+    state = _load_checkpoint(checkpoint_path)
+    if state is None:
+        state = {
+            "query": query,
+            # resolved once, so that a resumed export covers the same time range
+            "filter": _add_defaults_to_filter(filter_),
+            "page_token": None,
+            "last_timestamp": None,
+            "last_insert_ids": [],
+            "files": 0,
+            "entries": 0,
+            "done": False,
+        }
+    elif state["query"] != query:
+        raise ValueError(
+            f"checkpoint {checkpoint_path} belongs to a different export: "
+            f"{state['query']}"
+        )
+    if state["done"]:
+        return state["entries"]
+
+    part = None
+    last_timestamp = state["last_timestamp"]
+    last_insert_ids = state["last_insert_ids"]
+    next_page_token = None
+
+    def commit_part():
+        part.commit()
+        state.update(
+            page_token=next_page_token,
+            last_timestamp=last_timestamp,
+            last_insert_ids=last_insert_ids,
+            files=state["files"] + 1,
+            entries=state["entries"] + part.entries,
+        )
+        _save_checkpoint(checkpoint_path, state)
+
+    try:
+        for resources, next_page_token in _resumed_pages(
+            api, resource_names, state, order_by, page_size
+        ):
+            if resources:
+                if part is None:
+                    part = _PartFile(writer_class, destination, state["files"])
+                part.write(resources)
+                last_timestamp, last_insert_ids = _last_position(
+                    resources, last_timestamp, last_insert_ids
+                )
+            if part is not None and part.entries >= max_entries_per_file:
+                commit_part()
+                part = None
+        if part is not None:
+            next_page_token = None
+            commit_part()
+            part = None
+    finally:
+        if part is not None:
+            part.discard()
+
+    state["done"] = True
+    _save_checkpoint(checkpoint_path, state)
+    return state["entries"]
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="google-cloud-logging-export",
+        description="Export Cloud Logging entries to local files. Run the "
+        "same command again to resume an interrupted export.",
+    )
+    parser.add_argument("destination", help="directory the part files are written to")
+    parser.add_argument("--project", help="project to export from and bill")
+    parser.add_argument(
+        "--resource-name",
+        action="append",
+        dest="resource_names",
+        help="parent resource to read entries from, e.g. 'projects/my-project'; "
+        "may be repeated (default: the project)",
+    )
+    parser.add_argument(
+        "--filter",
+        dest="filter_",
+        help="advanced logs filter (default: the last 24 hours)",
+    )
+    parser.add_argument(
+        "--order-by",
+        choices=("timestamp asc", "timestamp desc"),
+        default="timestamp asc",
+    )
+    parser.add_argument(
+        "--format", dest="format_", choices=sorted(_WRITERS), default="ndjson"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint_path",
+        help=f"checkpoint file (default: DESTINATION/{_CHECKPOINT_NAME})",
+    )
+    parser.add_argument("--page-size", type=int, default=_DEFAULT_PAGE_SIZE)
+    parser.add_argument(
+        "--max-entries-per-file", type=int, default=_DEFAULT_MAX_ENTRIES_PER_FILE
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command-line entry point, installed as ``google-cloud-logging-export``.
+
+    Args:
+        argv (Optional[Sequence[str]]): The arguments, without the program
+            name. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit status.
+    """
+    from google.cloud.logging_v2.client import Client
+
+    args = _parse_args(argv)
+    client = Client(project=args.project)
+    count = client.export_entries(
+        args.destination,
+        resource_names=args.resource_names,
+        filter_=args.filter_,
+        order_by=args.order_by,
+        format_=args.format_,
+        checkpoint_path=args.checkpoint_path,
+        page_size=args.page_size,
+        max_entries_per_file=args.max_entries_per_file,
+    )
+    print(f"exported {count} entries to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: NO COVER
+    sys.exit(main())
@@ -15,23 +15,36 @@
 """Wrapper for adapting the autogenerated gapic client to the hand-written
 client."""
 
+import grpc
+
 from google.cloud.logging_v2.services.config_service_v2 import ConfigServiceV2Client
 from google.cloud.logging_v2.services.logging_service_v2 import LoggingServiceV2Client
+from google.cloud.logging_v2.services.logging_service_v2 import (
+    LoggingServiceV2AsyncClient,
+)
 from google.cloud.logging_v2.services.metrics_service_v2 import MetricsServiceV2Client
 from google.cloud.logging_v2.types import CreateSinkRequest
 from google.cloud.logging_v2.types import UpdateSinkRequest
 from google.cloud.logging_v2.types import ListSinksRequest
+from google.cloud.logging_v2.types import ListExclusionsRequest
 from google.cloud.logging_v2.types import ListLogMetricsRequest
 from google.cloud.logging_v2.types import ListLogEntriesRequest
+from google.cloud.logging_v2.types import TailLogEntriesRequest
 from google.cloud.logging_v2.types import WriteLogEntriesRequest
 from google.cloud.logging_v2.types import LogSink
+from google.cloud.logging_v2.types import LogExclusion
 from google.cloud.logging_v2.types import LogMetric
 from google.cloud.logging_v2.types import LogEntry as LogEntryPB
 
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.json_format import ParseDict
 
-from google.cloud.logging_v2._helpers import entry_from_resource
+from google.cloud.logging_v2._entry_views import entry_view_from_pb
+from google.cloud.logging_v2._prefetch import _prefetch
+from google.cloud.logging_v2._tail import _AsyncEntryTail
+from google.cloud.logging_v2._tail import _buffer_window
+from google.cloud.logging_v2._tail import _EntryTail
+from google.cloud.logging_v2.entries import _register_proto_types
 from google.cloud.logging_v2.sink import Sink
 from google.cloud.logging_v2.metric import Metric
 
@@ -55,6 +68,8 @@ class _LoggingAPI(object):
         max_results=None,
         page_size=None,
         page_token=None,
+        raw=False,
+        prefetch_pages=0,
     ):
         """Return a generator of log entry resources.
 
@@ -81,8 +96,14 @@ class _LoggingAPI(object):
                 one at a time. If not passed, defaults to a value set by the API.
             page_token (str): opaque marker for the starting "page" of entries. If not
                 passed, the API will return the first page of entries.
+            raw (bool): If True, yield the ``LogEntry`` protobufs returned by the
+                API as they are, skipping all conversion. Otherwise entries are
+                decoded lazily, field by field, as they are accessed.
+            prefetch_pages (int): the number of pages fetched ahead in a background
+                thread while the current page is consumed, so that requests
+                overlap with processing. Disabled when 0.
         Returns:
-            Generator[~logging_v2.LogEntry]
+            Generator[Union[~logging_v2.LogEntry, google.logging.v2.log_entry_pb2.LogEntry]]
         """
         # full resource names are expected by the API
         resource_names = resource_names
@@ -95,12 +116,16 @@ class _LoggingAPI(object):
         )
 
         response = self._gapic_api.list_log_entries(request=request)
-        log_iter = iter(response)
+        if prefetch_pages:
+            pages = _prefetch(response.pages, prefetch_pages)
+            log_iter = (entry for page in pages for entry in page.entries)
+        else:
+            log_iter = iter(response)
 
-        # We attach a mutable loggers dictionary so that as Logger
-        # objects are created by entry_from_resource, they can be
+        # We attach the client's logger cache so that as Logger
+        # objects are created by the entries, they can be
         # re-used by other log entries from the same logger.
-        loggers = {}
+        loggers = self._client._entry_loggers
 
         if max_results is not None and max_results < 0:
             raise ValueError("max_results must be positive")
@@ -111,12 +136,82 @@ class _LoggingAPI(object):
             for entry in log_iter:
                 if max_results is not None and i >= max_results:
                     break
-                log_entry_dict = _parse_log_entry(LogEntryPB.pb(entry))
-                yield entry_from_resource(log_entry_dict, self._client, loggers=loggers)
+                entry_pb = LogEntryPB.pb(entry)
+                if raw:
+                    yield entry_pb
+                else:
+                    yield entry_view_from_pb(entry_pb, self._client, loggers)
                 i += 1
 
         return log_entries_pager(log_iter)
 
+    def tail_entries(
+        self, resource_names, *, filter_=None, buffer_window=None, raw=False
+    ):
+        """Return an iterator over log entries as they are written.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries.
+            filter_ (str): a filter expression. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+            buffer_window (Union[None, float, datetime.timedelta]): How long the
+                server holds entries back to return late-arriving ones in order,
+                in seconds. Between 0 and 60; defaults to 2 seconds.
+            raw (bool): If True, yield the ``LogEntry`` protobufs returned by the
+                API as they are, skipping all conversion.
+
+        Returns:
+            ~logging_v2._tail._EntryTail: The entry iterator.
+        """
+
+        def open_stream(session_filter):
+            request = TailLogEntriesRequest(
+                resource_names=resource_names,
+                filter=session_filter,
+                buffer_window=_buffer_window(buffer_window),
+            )
+            return self._gapic_api.tail_log_entries(requests=iter([request]))
+
+        return _EntryTail(
+            open_stream,
+            _tail_entry_maker(self._client, raw),
+            filter_=filter_,
+            buffer_window=buffer_window,
+        )
+
+    def _list_entry_pages(
+        self,
+        resource_names,
+        *,
+        filter_=None,
+        order_by=None,
+        page_size=None,
+        page_token=None,
+    ):
+        """Return a generator of pages of log entry resources.
+
+        Takes the same arguments as :meth:`list_entries`.
+
+        Returns:
+            Generator[Tuple[List[dict], Optional[str]]]: The entries of each
+            page in their JSON API representation, and the token of the page
+            after it (None after the last page).
+        """
+        request = ListLogEntriesRequest(
+            resource_names=resource_names,
+            filter=filter_,
+            order_by=order_by,
+            page_size=page_size,
+            page_token=page_token,
+        )
+        response = self._gapic_api.list_log_entries(request=request)
+        for page in response.pages:
+            resources = [
+                _parse_log_entry(LogEntryPB.pb(entry)) for entry in page.entries
+            ]
+            yield resources, page.next_page_token or None
+
     def write_entries(
         self,
         entries,
@@ -181,6 +276,148 @@ class _LoggingAPI(object):
         """
         self._gapic_api.delete_log(log_name=logger_name)
 
+    def warm_up(self, timeout):
+        """Connect the underlying gRPC channel ahead of the first request.
+
+        Waits for name resolution and the TCP, TLS and HTTP/2 handshakes,
+        which would otherwise delay the first call.
+
+        Args:
+            timeout (float): The longest time to wait for the channel, in seconds.
+
+        Returns:
+            bool: True if the channel is ready, False if it did not connect
+            within ``timeout``.
+        """
+        ready = grpc.channel_ready_future(self._gapic_api.transport.grpc_channel)
+        try:
+            ready.result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            ready.cancel()
+            return False
+        return True
+
+
+class _AsyncLoggingAPI(object):
+    """Helper mapping logging-related APIs onto the asyncio gapic client."""
+
+    def __init__(self, gapic_api, client):
+        self._gapic_api = gapic_api
+        self._client = client
+
+    async def list_entries(
+        self,
+        resource_names,
+        *,
+        filter_=None,
+        order_by=None,
+        max_results=None,
+        page_size=None,
+        page_token=None,
+        raw=False,
+    ):
+        """Return an async generator of log entry resources.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries.
+            filter_ (str): a filter expression. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+            order_by (str) One of :data:`~logging_v2.ASCENDING`
+                or :data:`~logging_v2.DESCENDING`.
+            max_results (Optional[int]):
+                Optional. The maximum number of entries to return.
+                Non-positive values are treated as 0. If None, uses API defaults.
+            page_size (int): number of entries to fetch in each API call.
+            page_token (str): opaque marker for the starting "page" of entries. If not
+                passed, the API will return the first page of entries.
+            raw (bool): If True, yield the ``LogEntry`` protobufs returned by the
+                API as they are, skipping all conversion.
+        Returns:
+            AsyncGenerator[Union[~logging_v2.LogEntry, google.logging.v2.log_entry_pb2.LogEntry]]
+        """
+        if max_results is not None and max_results < 0:
+            raise ValueError("max_results must be positive")
+
+        request = ListLogEntriesRequest(
+            resource_names=resource_names,
+            filter=filter_,
+            order_by=order_by,
+            page_size=page_size,
+            page_token=page_token,
+        )
+        response = await self._gapic_api.list_log_entries(request=request)
+        loggers = self._client._entry_loggers
+
+        i = 0
+        async for entry in response:
+            if max_results is not None and i >= max_results:
+                break
+            entry_pb = LogEntryPB.pb(entry)
+            if raw:
+                yield entry_pb
+            else:
+                yield entry_view_from_pb(entry_pb, self._client, loggers)
+            i += 1
+
+    def tail_entries(
+        self, resource_names, *, filter_=None, buffer_window=None, raw=False
+    ):
+        """Return an async iterator over log entries as they are written.
+
+        See :meth:`_LoggingAPI.tail_entries`.
+
+        Returns:
+            ~logging_v2._tail._AsyncEntryTail: The entry iterator.
+        """
+
+        def open_stream(session_filter):
+            async def requests():
+                yield TailLogEntriesRequest(
+                    resource_names=resource_names,
+                    filter=session_filter,
+                    buffer_window=_buffer_window(buffer_window),
+                )
+
+            return self._gapic_api.tail_log_entries(requests=requests())
+
+        return _AsyncEntryTail(
+            open_stream,
+            _tail_entry_maker(self._client, raw),
+            filter_=filter_,
+            buffer_window=buffer_window,
+        )
+
+    async def write_entries(
+        self,
+        entries,
+        *,
+        logger_name=None,
+        resource=None,
+        labels=None,
+        partial_success=True,
+        dry_run=False,
+    ):
+        """Log entry resources. See :meth:`_LoggingAPI.write_entries`."""
+        log_entry_pbs = [_log_entry_mapping_to_pb(entry) for entry in entries]
+
+        request = WriteLogEntriesRequest(
+            log_name=logger_name,
+            resource=resource,
+            labels=labels,
+            entries=log_entry_pbs,
+            partial_success=partial_success,
+        )
+        await self._gapic_api.write_log_entries(request=request)
+
+    async def logger_delete(self, logger_name):
+        """Delete all entries in a logger. See :meth:`_LoggingAPI.logger_delete`."""
+        await self._gapic_api.delete_log(log_name=logger_name)
+
+    async def close(self):
+        """Close the underlying gRPC channel."""
+        await self._gapic_api.transport.close()
+
 
 class _SinksAPI(object):
     """Helper mapping sink-related APIs."""
@@ -233,6 +470,26 @@ class _SinksAPI(object):
 
         return sinks_pager(sink_iter)
 
+    def list_exclusions(self, parent, *, page_size=None, page_token=None):
+        """List the log exclusions of the parent resource.
+
+        Args:
+            parent (str): The parent resource whose exclusions are to be listed,
+                such as ``"projects/[PROJECT_ID]"``.
+            page_size (int): number of exclusions to fetch in each API call.
+            page_token (str): opaque marker for the starting "page" of
+                exclusions.
+
+        Returns:
+            Generator[dict]: The exclusions, with ``name``, ``filter`` and
+                ``disabled`` keys.
+        """
+        request = ListExclusionsRequest(
+            parent=parent, page_size=page_size, page_token=page_token
+        )
+        response = self._gapic_api.list_exclusions(request)
+        return (LogExclusion.to_dict(exclusion) for exclusion in response)
+
     def sink_create(
         self, parent, sink_name, filter_, destination, *, unique_writer_identity=False
     ):
@@ -510,6 +767,14 @@ class _MetricsAPI(object):
         self._gapic_api.delete_log_metric(metric_name=path)
 
 
+def _tail_entry_maker(client, raw):
+    """Return the function converting the entry protobufs of a tail session."""
+    if raw:
+        return lambda entry_pb: entry_pb
+    loggers = client._entry_loggers
+    return lambda entry_pb: entry_view_from_pb(entry_pb, client, loggers)
+
+
 def _parse_log_entry(entry_pb):
     """Special helper to parse ``LogEntry`` protobuf into a dictionary.
 
@@ -534,6 +799,10 @@ def _parse_log_entry(entry_pb):
         )
     except TypeError:
         if entry_pb.HasField("proto_payload"):
+            if _register_proto_types():
+                # the payload may be one of the supported types, which are
+                # registered the first time a protoPayload is seen
+                return _parse_log_entry(entry_pb)
             proto_payload = entry_pb.proto_payload
             entry_pb.ClearField("proto_payload")
             entry_mapping = MessageToDict(
@@ -561,6 +830,8 @@ def _log_entry_mapping_to_pb(mapping):
     #       not cause any issues in the JSON->protobuf conversion
     #       of the corresponding ``proto_payload`` in the log entry
     #       (it is an ``Any`` field).
+    if "protoPayload" in mapping:
+        _register_proto_types()
     ParseDict(mapping, entry_pb)
     return LogEntryPB(entry_pb)
 
@@ -604,6 +875,29 @@ def make_logging_api(client):
     return _LoggingAPI(generated, client)
 
 
+def make_async_logging_api(client):
+    """Create an instance of the asyncio Logging API adapter.
+
+    Args:
+        client (~logging_v2.async_client.AsyncClient): The client
+            that holds configuration details.
+
+    Returns:
+        _AsyncLoggingAPI: A logging API instance with the proper credentials.
+    """
+    info = client._client_info
+    if isinstance(info, client_info.ClientInfo):
+        # convert into gapic-compatible subclass
+        info = _client_info_to_gapic(info)
+
+    generated = LoggingServiceV2AsyncClient(
+        credentials=client._credentials,
+        client_info=info,
+        client_options=client._client_options,
+    )
+    return _AsyncLoggingAPI(generated, client)
+
+
 def make_metrics_api(client):
     """Create an instance of the Metrics API adapter.
 
@@ -14,7 +14,9 @@
 
 """Common logging helpers."""
 
+import collections
 import logging
+import threading
 
 from datetime import datetime
 from datetime import timedelta
@@ -22,6 +24,7 @@ from datetime import timezone
 
 import requests
 
+from google.cloud.logging_v2._timestamps import _decode_page_timestamps
 from google.cloud.logging_v2.entries import LogEntry
 from google.cloud.logging_v2.entries import ProtobufEntry
 from google.cloud.logging_v2.entries import StructEntry
@@ -60,6 +63,62 @@ _TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
 METADATA_URL = "http://metadata.google.internal./computeMetadata/v1/"
 METADATA_HEADERS = {"Metadata-Flavor": "Google"}
 
+_metadata_session = None
+_metadata_session_lock = threading.Lock()
+
+_LOGGER_CACHE_SIZE = 1024
+"""Maximum number of loggers kept for entries read by a client."""
+
+
+class _LoggerCache(object):
+    """Thread-safe, size-bounded LRU mapping of logger fullnames -> loggers.
+
+    Shared by all reads made through a client, so entries from the same log
+    re-use a single :class:`~logging_v2.logger.Logger` across calls.
+    """
+
+    def __init__(self, maxsize=_LOGGER_CACHE_SIZE):
+        """
+        Args:
+            maxsize (Optional[int]): The maximum number of loggers to keep. The
+                least recently used logger is evicted once this is exceeded.
+        """
+        self._maxsize = maxsize
+        self._loggers = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._loggers)
+
+    def __contains__(self, fullname):
+        return fullname in self._loggers
+
+    def get(self, fullname, default=None):
+        with self._lock:
+            try:
+                self._loggers.move_to_end(fullname)
+            except KeyError:
+                return default
+            return self._loggers[fullname]
+
+    def __setitem__(self, fullname, logger):
+        with self._lock:
+            self._loggers[fullname] = logger
+            self._loggers.move_to_end(fullname)
+            while len(self._loggers) > self._maxsize:
+                self._loggers.popitem(last=False)
+
+
+def _entry_class(resource):
+    """Return the entry class matching the payload of an entry resource."""
+    if "textPayload" in resource:
+        return TextEntry
+    if "jsonPayload" in resource:
+        return StructEntry
+    if "protoPayload" in resource:
+        return ProtobufEntry
+    return LogEntry
+
 
 def entry_from_resource(resource, client, loggers):
     """Detect correct entry type from resource and instantiate.
@@ -77,16 +136,47 @@ def entry_from_resource(resource, client, loggers):
         google.cloud.logging_v2.entries._BaseEntry:
             The entry instance, constructed via the resource
     """
-    if "textPayload" in resource:
-        return TextEntry.from_api_repr(resource, client, loggers=loggers)
+    return _entry_class(resource).from_api_repr(resource, client, loggers=loggers)
 
-    if "jsonPayload" in resource:
-        return StructEntry.from_api_repr(resource, client, loggers=loggers)
 
-    if "protoPayload" in resource:
-        return ProtobufEntry.from_api_repr(resource, client, loggers=loggers)
+def entries_from_resources(resources, client, loggers):
+    """Instantiate the entries of a page of entry resources.
+
+    Equivalent to calling :func:`entry_from_resource` on each resource, but
+    the timestamps of the page are decoded together.
+
+    Args:
+        resources (Sequence[dict]): Entry resources from one API response.
+        client (~logging_v2.client.Client):
+            Client that owns the log entries.
+        loggers (dict):
+            A mapping of logger fullnames -> loggers.
 
-    return LogEntry.from_api_repr(resource, client, loggers=loggers)
+    Returns:
+        List[google.cloud.logging_v2.entries._BaseEntry]: The entry instances.
+    """
+    timestamps, received = _decode_page_timestamps(resources)
+    return [
+        _entry_class(resource)._from_api_repr(
+            resource, client, loggers, timestamp, received_timestamp
+        )
+        for resource, timestamp, received_timestamp in zip(
+            resources, timestamps, received
+        )
+    ]
+
+
+def _get_metadata_session():
+    """Return the session shared by all metadata server requests.
+
+    Requests made through it reuse pooled connections to the server.
+    """
+    global _metadata_session
+    if _metadata_session is None:
+        with _metadata_session_lock:
+            if _metadata_session is None:
+                _metadata_session = requests.Session()
+    return _metadata_session
 
 
 def retrieve_metadata_server(metadata_key, timeout=5):
@@ -107,7 +197,9 @@ def retrieve_metadata_server(metadata_key, timeout=5):
     url = METADATA_URL + metadata_key
 
     try:
-        response = requests.get(url, headers=METADATA_HEADERS, timeout=timeout)
+        response = _get_metadata_session().get(
+            url, headers=METADATA_HEADERS, timeout=timeout
+        )
 
         if response.status_code == requests.codes.ok:
             return response.text
@@ -14,13 +14,14 @@
 
 """Interact with Cloud Logging via JSON-over-HTTP."""
 
-import functools
-
 from google.api_core import page_iterator
 from google.cloud import _http
 
 from google.cloud.logging_v2 import __version__
-from google.cloud.logging_v2._helpers import entry_from_resource
+from google.cloud.logging_v2._helpers import entries_from_resources
+from google.cloud.logging_v2._prefetch import _prefetch
+from google.cloud.logging_v2._tail import _POLL_PAGE_SIZE
+from google.cloud.logging_v2._tail import _PolledTail
 from google.cloud.logging_v2.sink import Sink
 from google.cloud.logging_v2.metric import Metric
 
@@ -76,6 +77,8 @@ class _LoggingAPI(object):
         max_results=None,
         page_size=None,
         page_token=None,
+        raw=False,
+        prefetch_pages=0,
     ):
         """Return a page of log entry resources.
 
@@ -102,9 +105,40 @@ class _LoggingAPI(object):
                 one at a time. If not passed, defaults to a value set by the API.
             page_token (str): opaque marker for the starting "page" of entries. If not
                 passed, the API will return the first page of entries.
+            raw (bool): Unsupported over HTTP, which has no protobufs to yield.
+            prefetch_pages (int): the number of pages fetched ahead in a background
+                thread while the current page is consumed, so that requests
+                overlap with processing. Disabled when 0.
         Returns:
             Generator[~logging_v2.LogEntry]
+
+        Raises:
+            ValueError: If ``raw`` is True.
         """
+        if raw:
+            raise ValueError("raw protobuf entries require the gRPC transport")
+
+        iterator = self._entries_iterator(
+            resource_names, filter_, order_by, page_size, page_token
+        )
+        pages = iterator.pages
+        if prefetch_pages:
+            pages = _prefetch(pages, prefetch_pages)
+        # We attach the client's logger cache so that as Logger
+        # objects are created by entries_from_resources, they can be
+        # re-used by other log entries from the same logger.
+        loggers = self._client._entry_loggers
+        entries = (
+            entry
+            for page in pages
+            for entry in entries_from_resources(list(page), self._client, loggers)
+        )
+        return _entries_pager(entries, max_results)
+
+    def _entries_iterator(
+        self, resource_names, filter_, order_by, page_size, page_token
+    ):
+        """Build the iterator over the pages of an ``entries.list`` query."""
         extra_params = {"resourceNames": resource_names}
 
         if filter_ is not None:
@@ -117,24 +151,81 @@ class _LoggingAPI(object):
             extra_params["pageSize"] = page_size
 
         path = "/entries:list"
-        # We attach a mutable loggers dictionary so that as Logger
-        # objects are created by entry_from_resource, they can be
-        # re-used by other log entries from the same logger.
-        loggers = {}
-        item_to_value = functools.partial(_item_to_entry, loggers=loggers)
         iterator = page_iterator.HTTPIterator(
             client=self._client,
             api_request=self._client._connection.api_request,
             path=path,
-            item_to_value=item_to_value,
+            item_to_value=_item_to_entry_resource,
             items_key="entries",
             page_token=page_token,
             extra_params=extra_params,
         )
         # This method uses POST to make a read-only request.
         iterator._HTTP_METHOD = "POST"
+        return iterator
 
-        return _entries_pager(iterator, max_results)
+    def _list_entry_pages(
+        self,
+        resource_names,
+        *,
+        filter_=None,
+        order_by=None,
+        page_size=None,
+        page_token=None,
+    ):
+        """Return a generator of pages of log entry resources.
+
+        Takes the same arguments as :meth:`list_entries`.
+
+        Returns:
+            Generator[Tuple[List[dict], Optional[str]]]: The JSON entry resources
+            of each page, and the token of the page after it (None after the
+            last page).
+        """
+        iterator = self._entries_iterator(
+            resource_names, filter_, order_by, page_size, page_token
+        )
+        for page in iterator.pages:
+            yield list(page), iterator.next_page_token
+
+    def tail_entries(
+        self, resource_names, *, filter_=None, buffer_window=None, raw=False
+    ):
+        """Return an iterator over log entries as they are written.
+
+        HTTP has no streaming RPCs, so entries are polled for.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries.
+            filter_ (str): a filter expression. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+            buffer_window (Union[None, float, datetime.timedelta]): How far
+                before the newest entry returned each poll starts, to pick up
+                late-arriving entries, in seconds. Defaults to 2 seconds.
+            raw (bool): Unsupported over HTTP, which has no protobufs to yield.
+
+        Returns:
+            ~logging_v2._tail._PolledTail: The entry iterator.
+
+        Raises:
+            ValueError: If ``raw`` is True.
+        """
+        if raw:
+            raise ValueError("raw protobuf entries require the gRPC transport")
+
+        loggers = self._client._entry_loggers
+        return _PolledTail(
+            lambda poll_filter: self._list_entry_pages(
+                resource_names,
+                filter_=poll_filter,
+                order_by="timestamp asc",
+                page_size=_POLL_PAGE_SIZE,
+            ),
+            lambda resources: entries_from_resources(resources, self._client, loggers),
+            filter_=filter_,
+            buffer_window=buffer_window,
+        )
 
     def write_entries(
         self,
@@ -267,6 +358,38 @@ class _SinksAPI(object):
 
         return _entries_pager(iterator, max_results)
 
+    def list_exclusions(self, parent, *, page_size=None, page_token=None):
+        """List the log exclusions of the parent resource.
+
+        See
+        https://cloud.google.com/logging/docs/reference/v2/rest/v2/projects.exclusions/list
+
+        Args:
+            parent (str): The parent resource whose exclusions are to be listed,
+                such as ``"projects/[PROJECT_ID]"``.
+            page_size (int): number of exclusions to fetch in each API call.
+            page_token (str): opaque marker for the starting "page" of
+                exclusions.
+
+        Returns:
+            Generator[dict]: The exclusion resources returned by the API.
+        """
+        extra_params = {}
+
+        if page_size is not None:
+            extra_params["pageSize"] = page_size
+
+        iterator = page_iterator.HTTPIterator(
+            client=self._client,
+            api_request=self._client._connection.api_request,
+            path=f"/{parent}/exclusions",
+            item_to_value=_item_to_exclusion,
+            items_key="exclusions",
+            page_token=page_token,
+            extra_params=extra_params,
+        )
+        return iter(iterator)
+
     def sink_create(
         self, parent, sink_name, filter_, destination, *, unique_writer_identity=False
     ):
@@ -493,31 +616,21 @@ def _entries_pager(page_iter, max_results=None):
         i += 1
 
 
-def _item_to_entry(iterator, resource, loggers):
-    """Convert a log entry resource to the native object.
+def _item_to_entry_resource(iterator, resource):
+    """Pass a log entry resource through unchanged.
 
-    .. note::
-
-        This method does not have the correct signature to be used as
-        the ``item_to_value`` argument to
-        :class:`~google.api_core.page_iterator.Iterator`. It is intended to be
-        patched with a mutable ``loggers`` argument that can be updated
-        on subsequent calls. For an example, see how the method is
-        used above in :meth:`_LoggingAPI.list_entries`.
+    Entries are instantiated a page at a time by :meth:`_LoggingAPI.list_entries`,
+    so that their timestamps can be decoded together.
 
     Args:
         iterator (google.api_core.page_iterator.Iterator): The iterator that
             is currently in use.
         resource (dict): Log entry JSON resource returned from the API.
-        loggers (Mapping[str, logging_v2.logger.Logger]):
-            A mapping of logger fullnames -> loggers.  If the logger
-            that owns the entry is not in ``loggers``, the entry
-            will have a newly-created logger.
 
     Returns:
-        ~logging_v2.entries._BaseEntry: The next log entry in the page.
+        dict: The resource.
     """
-    return entry_from_resource(resource, iterator.client, loggers)
+    return resource
 
 
 def _item_to_sink(iterator, resource):
@@ -534,6 +647,20 @@ def _item_to_sink(iterator, resource):
     return Sink.from_api_repr(resource, iterator.client)
 
 
+def _item_to_exclusion(iterator, resource):
+    """Pass an exclusion resource through unchanged.
+
+    Args:
+        iterator (google.api_core.page_iterator.Iterator): The iterator that
+            is currently in use.
+        resource (dict): Exclusion JSON resource returned from the API.
+
+    Returns:
+        dict: The resource.
+    """
+    return resource
+
+
 def _item_to_metric(iterator, resource):
     """Convert a metric resource to the native object.
 
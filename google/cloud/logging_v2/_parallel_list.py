@@ -0,0 +1,170 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run a ``list_entries`` query as concurrent shards.
+
+The query is split by resource name and into consecutive time windows. The
+shards of a window are merged in timestamp order while the shards of the
+next window already run, and windows are emitted one after the other. All
+shards share a pool of ``max_workers`` threads.
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from google.cloud.logging_v2._helpers import _TIME_FORMAT
+from google.cloud.logging_v2._prefetch import _prefetch
+
+_DEFAULT_MAX_WORKERS = 8
+_DEFAULT_DURATION = timedelta(days=1)
+# Entries are handed from the shard threads to the merge in chunks.
+_CHUNK_SIZE = 100
+_CHUNKS_PER_SHARD = 10
+_WORKER_THREAD_NAME = "google.cloud.logging.ParallelList"
+
+
+def _as_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _time_windows(start_time, end_time, count):
+    """Split ``[start_time, end_time)`` into ``count`` consecutive windows."""
+    step = (end_time - start_time) / count
+    bounds = [start_time + step * index for index in range(count)] + [end_time]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _window_filter(filter_, window_start, window_end):
+    time_filter = (
+        f'timestamp>="{window_start.strftime(_TIME_FORMAT)}" '
+        f'AND timestamp<"{window_end.strftime(_TIME_FORMAT)}"'
+    )
+    if filter_ is None:
+        return time_filter
+    return f"({filter_}) AND {time_filter}"
+
+
+def _chunks(entries):
+    entries = iter(entries)
+    while True:
+        chunk = list(itertools.islice(entries, _CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _dedupe(entries):
+    """Drop repeated entries from a stream ordered by timestamp.
+
+    Copies of an entry share its timestamp, so only the ids seen at the
+    current timestamp are remembered.
+    """
+    timestamp = None
+    seen = set()
+    for entry in entries:
+        if entry.timestamp != timestamp:
+            timestamp = entry.timestamp
+            seen.clear()
+        if entry.insert_id is not None:
+            key = (entry.log_name, entry.insert_id)
+            if key in seen:
+                continue
+            seen.add(key)
+        yield entry
+
+
+def _list_entries_parallel(
+    client,
+    *,
+    resource_names,
+    filter_=None,
+    order_by=None,
+    start_time=None,
+    end_time=None,
+    time_shards=1,
+    max_workers=_DEFAULT_MAX_WORKERS,
+    max_results=None,
+    page_size=None,
+):
+    """Implementation of :meth:`~logging_v2.client.Client.list_entries_parallel`."""
+    if time_shards < 1:
+        raise ValueError("time_shards must be positive")
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive")
+    if max_results is not None and max_results < 0:
+        raise ValueError("max_results must be positive")
+
+    end_time = _as_utc(end_time or datetime.now(timezone.utc))
+    start_time = _as_utc(start_time or end_time - _DEFAULT_DURATION)
+    if start_time >= end_time:
+        raise ValueError("start_time must be before end_time")
+
+    descending = order_by is not None and order_by.lower().endswith("desc")
+    windows = _time_windows(start_time, end_time, time_shards)
+    if descending:
+        windows.reverse()
+
+    def shard_entries(resource_name, window):
+        # a generator, so that even the first request runs in the shard's thread
+        yield from client.list_entries(
+            resource_names=[resource_name],
+            filter_=_window_filter(filter_, *window),
+            order_by=order_by,
+            page_size=page_size,
+        )
+
+    def start_window(window, executor):
+        return [
+            _prefetch(
+                _chunks(shard_entries(resource_name, window)),
+                _CHUNKS_PER_SHARD,
+                executor=executor,
+            )
+            for resource_name in resource_names
+        ]
+
+    def merged_windows():
+        # the workers run the requests of all shards, one chunk at a time
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix=_WORKER_THREAD_NAME
+        )
+        shards = []
+        pending = start_window(windows[0], executor)
+        try:
+            for index in range(len(windows)):
+                # the next window's shards run while this one is merged
+                shards = pending
+                pending = []
+                if index + 1 < len(windows):
+                    pending = start_window(windows[index + 1], executor)
+                yield from heapq.merge(
+                    *(itertools.chain.from_iterable(shard) for shard in shards),
+                    key=lambda entry: entry.timestamp,
+                    reverse=descending,
+                )
+        finally:
+            for shard in itertools.chain(shards, pending):
+                shard.close()
+            executor.shutdown(wait=False)
+
+    entries = _dedupe(merged_windows())
+    if max_results is not None:
+        entries = itertools.islice(entries, max_results)
+    return entries
@@ -0,0 +1,210 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fetch pages of results ahead of the consumer.
+
+Pagers only request the next page once the current one has been consumed,
+so the consumer sits idle during every RPC. :func:`_prefetch` moves the page
+requests to a background thread that stays a bounded number of pages ahead,
+or to a thread pool shared by several iterators.
+"""
+
+import queue
+import threading
+
+_PREFETCH_THREAD_NAME = "google.cloud.logging.Prefetch"
+
+
+_END = object()
+
+
+def _fetch_pages(pages, fetched, stopping):
+    """The entry point for the prefetch thread."""
+    try:
+        for page in pages:
+            fetched.put((page, None))
+            if stopping.is_set():
+                return
+    except Exception as exc:
+        fetched.put((_END, exc))
+        return
+    fetched.put((_END, None))
+
+
+class _Prefetcher(object):
+    """Iterator over pages fetched ahead by a background thread."""
+
+    def __init__(self, pages, depth):
+        self._fetched = queue.Queue(maxsize=depth)
+        self._stopping = threading.Event()
+        self._done = False
+        thread = threading.Thread(
+            target=_fetch_pages,
+            args=(pages, self._fetched, self._stopping),
+            name=_PREFETCH_THREAD_NAME,
+        )
+        thread.daemon = True
+        thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        page, error = self._fetched.get()
+        if page is _END:
+            self._done = True
+            if error is not None:
+                raise error
+            raise StopIteration
+        return page
+
+    def close(self):
+        """Stop fetching pages. The request in flight, if any, still completes."""
+        self._done = True
+        self._stopping.set()
+        # make room for the page in flight, so the thread can see it should stop
+        while True:
+            try:
+                self._fetched.get_nowait()
+            except queue.Empty:
+                break
+
+    def __del__(self):
+        self.close()
+
+
+class _PooledPrefetcher(object):
+    """Iterator over pages fetched ahead by the workers of a thread pool.
+
+    Each page is fetched by its own task, so iterators sharing a pool never
+    hold a worker while they wait for their consumer. At most one page of
+    the iterator is fetched at a time.
+    """
+
+    def __init__(self, pages, depth, executor):
+        self._pages = iter(pages)
+        self._depth = depth
+        self._executor = executor
+        self._fetched = queue.Queue()
+        self._lock = threading.Lock()
+        # pages fetched or being fetched, and not yet consumed
+        self._pending = 0
+        self._fetching = False
+        self._exhausted = False
+        self._closed = False
+        self._done = False
+        self._schedule()
+
+    def _schedule(self):
+        """Submit the next fetch, unless one is running or enough are waiting."""
+        with self._lock:
+            if (
+                self._fetching
+                or self._exhausted
+                or self._closed
+                or self._pending >= self._depth
+            ):
+                return
+            self._fetching = True
+            self._pending += 1
+        self._executor.submit(self._fetch)
+
+    def _fetch(self):
+        """The task fetching a single page."""
+        if self._closed:
+            item = None
+        else:
+            try:
+                item = (next(self._pages), None)
+            except StopIteration:
+                item = (_END, None)
+            except Exception as exc:
+                item = (_END, exc)
+        with self._lock:
+            self._fetching = False
+            self._exhausted = item is None or item[0] is _END
+            closed = self._closed
+        if closed:
+            self._close_pages()
+            return
+        self._fetched.put(item)
+        self._schedule()
+
+    def _close_pages(self):
+        close = getattr(self._pages, "close", None)
+        if close is not None:
+            close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        page, error = self._fetched.get()
+        with self._lock:
+            self._pending -= 1
+        if page is _END:
+            self._done = True
+            if error is not None:
+                raise error
+            raise StopIteration
+        self._schedule()
+        return page
+
+    def close(self):
+        """Stop fetching pages. The request in flight, if any, still completes."""
+        self._done = True
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            fetching = self._fetching
+        if not fetching:
+            self._close_pages()
+
+    def __del__(self):
+        self.close()
+
+
+def _prefetch(pages, depth, executor=None):
+    """Iterate over ``pages`` while a background thread fetches them ahead.
+
+    Fetching starts right away. At most ``depth`` fetched pages wait in memory
+    for the consumer. Errors raised while fetching are re-raised to the
+    consumer in order. Closing the iterator before it is exhausted stops the
+    thread once its in-flight request completes.
+
+    Args:
+        pages (Iterable): The pages to fetch, typically an iterator's ``pages``.
+        depth (int): The maximum number of pages fetched ahead of the consumer.
+        executor (Optional[concurrent.futures.Executor]): Fetch the pages with
+            the workers of this executor instead of a dedicated thread. The
+            executor must not be shut down before the iterator is closed or
+            exhausted.
+
+    Returns:
+        Union[_Prefetcher, _PooledPrefetcher]: An iterator over the items of
+        ``pages``.
+
+    Raises:
+        ValueError: If ``depth`` is smaller than 1.
+    """
+    if depth < 1:
+        raise ValueError("depth must be positive")
+    if executor is not None:
+        return _PooledPrefetcher(pages, depth, executor)
+    return _Prefetcher(pages, depth)
@@ -0,0 +1,476 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Follow log entries as they are written.
+
+Over gRPC, entries are streamed by ``TailLogEntries`` sessions. A session is a
+streaming RPC which the server ends after its session limit, or which breaks
+on transient errors. The iterators here open a new session whenever one
+ends, restricted to the entries from shortly before the newest one seen so
+that entries written while no session was open are not missed, and drop
+the entries delivered twice around a reconnect.
+
+Over HTTP, which has no streaming RPCs, :class:`_PolledTail` repeatedly lists
+the entries newer than the last one returned instead.
+"""
+
+import asyncio
+import collections
+import datetime
+import threading
+import time
+
+from google.api_core import exceptions
+
+from google.cloud.logging_v2._timestamps import _nanos_to_rfc3339
+from google.cloud.logging_v2._timestamps import _page_nanos
+from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+
+_RECONNECT_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ServiceUnavailable,
+)
+"""Errors ending a session after which a new one is opened."""
+
+_POLL_RETRY_ERRORS = _RECONNECT_ERRORS + (exceptions.TooManyRequests,)
+"""Errors after which a poll is retried."""
+
+_INITIAL_BACKOFF = 1.0  # Seconds
+_MAX_BACKOFF = 60.0  # Seconds
+_DEDUPE_WINDOW = 10000
+"""Number of recent entry keys remembered to drop duplicates."""
+
+_DEFAULT_BUFFER_WINDOW = datetime.timedelta(seconds=2)
+"""The server's default buffer window, also used between polls."""
+_MIN_POLL_INTERVAL = 1.0  # Seconds
+_MAX_POLL_INTERVAL = 30.0  # Seconds
+_POLL_PAGE_SIZE = 1000
+
+
+def _buffer_window(value):
+    """Convert a buffer window given in seconds to a timedelta."""
+    if value is None or isinstance(value, datetime.timedelta):
+        return value
+    return datetime.timedelta(seconds=value)
+
+
+def _buffer_nanos(buffer_window):
+    """Return a buffer window in nanoseconds, the default one if None."""
+    if buffer_window is None:
+        buffer_window = _DEFAULT_BUFFER_WINDOW
+    micros = _buffer_window(buffer_window) // datetime.timedelta(microseconds=1)
+    return micros * 1000
+
+
+def _since_filter(filter_, since):
+    """Restrict a filter to the entries from ``since`` on, in nanoseconds."""
+    time_filter = f'timestamp>="{_nanos_to_rfc3339(since)}"'
+    if not filter_:
+        return time_filter
+    return f"({filter_}) AND {time_filter}"
+
+
+class _RecentKeys(object):
+    """Bounded set of the most recently added keys."""
+
+    def __init__(self, maxsize=_DEDUPE_WINDOW):
+        self._keys = collections.OrderedDict()
+        self._maxsize = maxsize
+
+    def add(self, key):
+        """Add a key.
+
+        Returns:
+            bool: False if the key was already present.
+        """
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self._maxsize:
+            self._keys.popitem(last=False)
+        return True
+
+
+class _TailState(object):
+    """Bookkeeping shared by the sync and async tail iterators."""
+
+    def __init__(self, make_entry, filter_, buffer_window, clock):
+        self._make_entry = make_entry
+        self._filter = filter_
+        self._buffer = _buffer_nanos(buffer_window)
+        # the newest timestamp seen, from when the tail started
+        self._high_water = int(clock() * 1000000) * 1000
+        self._sessions = 0
+        self._recent = _RecentKeys()
+        self._backoff = _INITIAL_BACKOFF
+        self.suppressed_counts = collections.Counter()
+        self.duplicates = 0
+        self.reconnects = 0
+
+    def entries(self, response):
+        """Return the new entries of a ``TailLogEntriesResponse``."""
+        self._backoff = _INITIAL_BACKOFF
+        for info in response.suppression_info:
+            self.suppressed_counts[info.reason.name] += info.suppressed_count
+        entries = []
+        for entry in response.entries:
+            entry_pb = LogEntryPB.pb(entry)
+            timestamp = (
+                entry_pb.timestamp.seconds * 1000000000 + entry_pb.timestamp.nanos
+            )
+            self._high_water = max(self._high_water, timestamp)
+            # insert IDs are unique within a log for a given timestamp
+            if entry_pb.insert_id and not self._recent.add(
+                (
+                    entry_pb.log_name,
+                    entry_pb.insert_id,
+                    entry_pb.timestamp.seconds,
+                    entry_pb.timestamp.nanos,
+                )
+            ):
+                self.duplicates += 1
+                continue
+            entries.append(self._make_entry(entry_pb))
+        return entries
+
+    def session_filter(self):
+        """Return the filter of the next session.
+
+        Sessions after the first start a buffer window before the newest
+        entry seen, so that they return the entries written since.
+        """
+        self._sessions += 1
+        if self._sessions == 1:
+            return self._filter
+        return _since_filter(self._filter, self._high_water - self._buffer)
+
+    def reconnect_delay(self, session_failed):
+        """Return the delay before opening the next session.
+
+        Sessions reaching their time limit are replaced at once. Consecutive
+        failures without any response back off exponentially.
+        """
+        self.reconnects += 1
+        if not session_failed:
+            return 0
+        delay = self._backoff
+        self._backoff = min(self._backoff * 2, _MAX_BACKOFF)
+        return delay
+
+
+class _EntryTail(object):
+    """Iterator over log entries as they are written.
+
+    Returned by :meth:`~logging_v2.client.Client.tail_entries`. Iteration
+    blocks until new entries arrive, and only ends once :meth:`close` is
+    called. Errors other than the transient ones ending a session are raised.
+
+    Attributes:
+        suppressed_counts (collections.Counter): The number of entries the
+            server reported as omitted from the sessions, by reason
+            (``"RATE_LIMIT"`` or ``"NOT_CONSUMED"``).
+        duplicates (int): The number of entries dropped because they were
+            already returned.
+        reconnects (int): The number of sessions opened after the first.
+    """
+
+    def __init__(
+        self,
+        open_stream,
+        make_entry,
+        *,
+        filter_=None,
+        buffer_window=None,
+        sleep=time.sleep,
+        clock=time.time,
+    ):
+        """
+        Args:
+            open_stream (Callable[[Optional[str]], Iterable]): Opens a session
+                returning the entries matching a filter.
+            make_entry (Callable[[google.logging.v2.LogEntry], object]):
+                Converts an entry protobuf to the entry returned.
+            filter_ (Optional[str]): The filter entries must match.
+            buffer_window (Union[None, float, datetime.timedelta]): The
+                sessions' buffer window. Defaults to 2 seconds.
+            sleep (Callable[[float], None]): Waits between sessions.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        self._state = _TailState(make_entry, filter_, buffer_window, clock)
+        self._open_stream = open_stream
+        self._sleep = sleep
+        self._stream = None
+        self._closed = False
+        self._entries = self._iter_entries()
+
+    @property
+    def suppressed_counts(self):
+        return self._state.suppressed_counts
+
+    @property
+    def duplicates(self):
+        return self._state.duplicates
+
+    @property
+    def reconnects(self):
+        return self._state.reconnects
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._entries)
+
+    def _iter_entries(self):
+        while not self._closed:
+            session_failed = True
+            try:
+                self._stream = self._open_stream(self._state.session_filter())
+                for response in self._stream:
+                    session_failed = False
+                    yield from self._state.entries(response)
+            except _RECONNECT_ERRORS:
+                pass
+            except exceptions.Cancelled:
+                if not self._closed:
+                    raise
+            finally:
+                self._stream = None
+            if not self._closed:
+                self._sleep(self._state.reconnect_delay(session_failed))
+
+    def close(self):
+        """Stop tailing and cancel the current session.
+
+        May be called from another thread to interrupt a blocked iteration.
+        """
+        self._closed = True
+        stream = self._stream
+        if stream is not None:
+            stream.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _AsyncEntryTail(object):
+    """Async iterator over log entries as they are written.
+
+    Returned by :meth:`~logging_v2.async_client.AsyncClient.tail_entries`.
+    See :class:`_EntryTail`; the attributes are the same.
+    """
+
+    def __init__(
+        self,
+        open_stream,
+        make_entry,
+        *,
+        filter_=None,
+        buffer_window=None,
+        clock=time.time,
+    ):
+        self._state = _TailState(make_entry, filter_, buffer_window, clock)
+        self._open_stream = open_stream
+        self._stream = None
+        self._closed = False
+        self._entries = self._iter_entries()
+
+    @property
+    def suppressed_counts(self):
+        return self._state.suppressed_counts
+
+    @property
+    def duplicates(self):
+        return self._state.duplicates
+
+    @property
+    def reconnects(self):
+        return self._state.reconnects
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._entries.__anext__()
+
+    async def _iter_entries(self):
+        while not self._closed:
+            session_failed = True
+            try:
+                self._stream = await self._open_stream(self._state.session_filter())
+                async for response in self._stream:
+                    session_failed = False
+                    for entry in self._state.entries(response):
+                        yield entry
+            except _RECONNECT_ERRORS:
+                pass
+            except (exceptions.Cancelled, asyncio.CancelledError):
+                if not self._closed:
+                    raise
+            finally:
+                self._stream = None
+            if not self._closed:
+                await asyncio.sleep(self._state.reconnect_delay(session_failed))
+
+    async def close(self):
+        """Stop tailing and cancel the current session."""
+        self._closed = True
+        stream = self._stream
+        if stream is not None:
+            stream.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class _PolledTail(object):
+    """Iterator over log entries as they are written, by polling.
+
+    Returned by :meth:`~logging_v2.client.Client.tail_entries` when the
+    client uses HTTP. Each poll lists the entries from the newest timestamp
+    returned so far, less ``buffer_window`` to pick up entries which arrive
+    late, and the entries already returned are dropped. Entries arriving
+    later than the buffer window are missed.
+
+    Polls follow each other more closely while entries arrive, and further
+    apart while none do. Iteration blocks until new entries arrive, and only
+    ends once :meth:`close` is called.
+
+    Attributes:
+        suppressed_counts (collections.Counter): Always empty; polls do not
+            report omitted entries.
+        duplicates (int): The number of entries dropped because they were
+            already returned.
+        reconnects (int): The number of polls retried after a transient error.
+        polls (int): The number of polls completed.
+    """
+
+    def __init__(
+        self,
+        list_pages,
+        make_entries,
+        *,
+        filter_=None,
+        buffer_window=None,
+        sleep=None,
+        clock=time.time,
+    ):
+        """
+        Args:
+            list_pages (Callable[[str], Iterable[Tuple[List[dict], str]]]):
+                Lists the pages of entry resources matching a filter, in
+                ascending timestamp order.
+            make_entries (Callable[[List[dict]], list]): Converts a page of
+                entry resources to the entries returned.
+            filter_ (Optional[str]): The filter entries must match.
+            buffer_window (Union[None, float, datetime.timedelta]): How far
+                before the newest entry each poll starts. Defaults to 2
+                seconds.
+            sleep (Optional[Callable[[float], None]]): Waits between polls.
+                Defaults to a wait which :meth:`close` interrupts.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        self._list_pages = list_pages
+        self._make_entries = make_entries
+        self._filter = filter_
+        self._buffer = _buffer_nanos(buffer_window)
+        self._closing = threading.Event()
+        self._sleep = self._closing.wait if sleep is None else sleep
+        self._high_water = int(clock() * 1000000) * 1000
+        self._recent = _RecentKeys()
+        self._interval = _MIN_POLL_INTERVAL
+        self._backoff = _INITIAL_BACKOFF
+        self.suppressed_counts = collections.Counter()
+        self.duplicates = 0
+        self.reconnects = 0
+        self.polls = 0
+        self._entries = self._iter_entries()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._entries)
+
+    def _poll_filter(self):
+        """Restrict the filter to entries from the buffer window on."""
+        return _since_filter(self._filter, self._high_water - self._buffer)
+
+    def _new_resources(self, resources):
+        """Drop the resources of a page which were already returned."""
+        timestamps = _page_nanos([resource.get("timestamp") for resource in resources])
+        new = []
+        for resource, timestamp in zip(resources, timestamps):
+            insert_id = resource.get("insertId")
+            # insert IDs are unique within a log for a given timestamp
+            if insert_id and not self._recent.add(
+                (resource.get("logName"), insert_id, timestamp)
+            ):
+                self.duplicates += 1
+                continue
+            if timestamp is not None and timestamp > self._high_water:
+                self._high_water = timestamp
+            new.append(resource)
+        return new
+
+    def _next_interval(self, found):
+        """Poll twice as often after new entries, half as often otherwise."""
+        if found:
+            self._interval = max(self._interval / 2, _MIN_POLL_INTERVAL)
+        else:
+            self._interval = min(self._interval * 2, _MAX_POLL_INTERVAL)
+        return self._interval
+
+    def _iter_entries(self):
+        while not self._closing.is_set():
+            found = 0
+            try:
+                for resources, _ in self._list_pages(self._poll_filter()):
+                    resources = self._new_resources(resources)
+                    found += len(resources)
+                    for entry in self._make_entries(resources):
+                        if self._closing.is_set():
+                            return
+                        yield entry
+            except _POLL_RETRY_ERRORS:
+                self.reconnects += 1
+                delay = self._backoff
+                self._backoff = min(self._backoff * 2, _MAX_BACKOFF)
+            else:
+                self.polls += 1
+                self._backoff = _INITIAL_BACKOFF
+                delay = self._next_interval(found)
+            if not self._closing.is_set():
+                self._sleep(delay)
+
+    def close(self):
+        """Stop polling.
+
+        May be called from another thread to interrupt the wait between polls.
+        """
+        self._closing.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,161 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk decoding of log entry timestamps.
+
+Parsing RFC3339 strings one at a time costs a regular expression match and a
+``strptime`` call per timestamp. When NumPy is installed, the helpers here
+convert a whole page of timestamps at once into int64 nanoseconds since the
+epoch, which NumPy reads as ``datetime64[ns]``.
+"""
+
+import calendar
+import datetime
+import time
+
+from google.cloud._helpers import _rfc3339_nanos_to_datetime
+
+_NAT = -(2**63)
+"""int64 value NumPy reads as ``NaT``, used for missing timestamps."""
+
+_MIN_BULK_SIZE = 8
+"""Pages smaller than this are decoded one timestamp at a time."""
+
+
+def _import_numpy():
+    """Return the ``numpy`` module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:  # pragma: NO COVER
+        return None
+    return numpy
+
+
+def _rfc3339_to_nanos(values):
+    """Convert RFC3339 timestamps to nanoseconds since the epoch.
+
+    Args:
+        values (Sequence[Optional[str]]): Timestamps in the ``Z``-suffixed
+            RFC3339 format used by the API, or None.
+
+    Returns:
+        numpy.ndarray: int64 nanoseconds since the epoch, with ``NaT`` for None.
+            Use ``.view("datetime64[ns]")`` to read them as datetimes.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a timestamp is not in RFC3339 format.
+    """
+    numpy = _import_numpy()
+    if numpy is None:  # pragma: NO COVER
+        raise ImportError("numpy is required to decode timestamps in bulk")
+
+    stripped = []
+    for value in values:
+        if value is None:
+            stripped.append("NaT")
+        elif value.endswith("Z"):
+            # NumPy does not accept timezone designators
+            stripped.append(value[:-1])
+        else:
+            raise ValueError(f"Timestamp: {value!r} is not in RFC3339 UTC format")
+    try:
+        parsed = numpy.array(stripped, dtype="datetime64[ns]")
+    except ValueError as exc:
+        raise ValueError(f"Timestamp is not in RFC3339 UTC format: {exc}") from exc
+    return parsed.view(numpy.int64)
+
+
+def _page_nanos(values):
+    """Convert a page of RFC3339 timestamps to integer nanoseconds.
+
+    Args:
+        values (Sequence[Optional[str]]): Timestamps in the ``Z``-suffixed
+            RFC3339 format used by the API, or None.
+
+    Returns:
+        List[Optional[int]]: Nanoseconds since the epoch, None for None.
+
+    Raises:
+        ValueError: If a timestamp is not in RFC3339 format.
+    """
+    if len(values) >= _MIN_BULK_SIZE and _import_numpy() is not None:
+        return [
+            None if value == _NAT else value
+            for value in _rfc3339_to_nanos(values).tolist()
+        ]
+    nanos = []
+    for value in values:
+        if value is None:
+            nanos.append(None)
+            continue
+        if not value.endswith("Z"):
+            raise ValueError(f"Timestamp: {value!r} is not in RFC3339 UTC format")
+        seconds, _, fraction = value[:-1].partition(".")
+        if fraction and not fraction.isdigit():
+            raise ValueError(f"Timestamp: {value!r} is not in RFC3339 UTC format")
+        seconds = calendar.timegm(time.strptime(seconds, "%Y-%m-%dT%H:%M:%S"))
+        nanos.append(seconds * 1000000000 + int(fraction[:9].ljust(9, "0")))
+    return nanos
+
+
+def _nanos_to_rfc3339(nanos):
+    """Format nanoseconds since the epoch as an RFC3339 UTC timestamp."""
+    seconds, fraction = divmod(nanos, 1000000000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + (
+        f".{fraction:09d}Z"
+    )
+
+
+def _nanos_to_datetimes(nanos):
+    """Convert int64 nanoseconds to UTC datetimes, truncated to microseconds.
+
+    Args:
+        nanos (numpy.ndarray): int64 nanoseconds since the epoch.
+
+    Returns:
+        List[Optional[datetime.datetime]]: The datetimes, None for ``NaT``.
+    """
+    utc = datetime.timezone.utc
+    micros = nanos.view("datetime64[ns]").astype("datetime64[us]").astype(object)
+    return [None if value is None else value.replace(tzinfo=utc) for value in micros]
+
+
+def _decode_page_timestamps(resources):
+    """Decode the timestamps of a page of entry resources.
+
+    Args:
+        resources (Sequence[dict]): Entry resources returned by the API.
+
+    Returns:
+        Tuple[list, list]: The ``timestamp`` and ``receiveTimestamp`` of each
+            resource, as UTC datetimes or None.
+    """
+    timestamps = [resource.get("timestamp") for resource in resources]
+    received = [resource.get("receiveTimestamp") for resource in resources]
+    if len(resources) >= _MIN_BULK_SIZE and _import_numpy() is not None:
+        return (
+            _nanos_to_datetimes(_rfc3339_to_nanos(timestamps)),
+            _nanos_to_datetimes(_rfc3339_to_nanos(received)),
+        )
+    return (
+        [
+            None if value is None else _rfc3339_nanos_to_datetime(value)
+            for value in timestamps
+        ],
+        [
+            None if value is None else _rfc3339_nanos_to_datetime(value)
+            for value in received
+        ],
+    )
@@ -0,0 +1,139 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Background thread that keeps a client's access token fresh.
+
+API calls only fetch a new token once the current one is about to expire,
+which blocks the calling thread (usually the handler's worker thread) on an
+OAuth round trip. The refresher renews the token ahead of time instead.
+"""
+
+import datetime
+import logging
+import threading
+
+import google.auth.transport.requests
+
+_DEFAULT_REFRESH_MARGIN = 300  # Seconds
+_DEFAULT_RETRY_INTERVAL = 30  # Seconds
+_REFRESHER_THREAD_NAME = "google.cloud.logging.TokenRefresher"
+_LOGGER = logging.getLogger(__name__)
+
+
+def _utcnow():
+    """Naive UTC datetime, matching ``google.auth`` credential expiries."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class _BackgroundTokenRefresher(object):
+    """Refreshes a client's credentials before their token expires."""
+
+    def __init__(
+        self,
+        client,
+        *,
+        refresh_margin=_DEFAULT_REFRESH_MARGIN,
+        retry_interval=_DEFAULT_RETRY_INTERVAL,
+    ):
+        """
+        Args:
+            client (~logging_v2.client.Client): The client whose credentials
+                are refreshed. Deferred credentials are resolved by the
+                background thread.
+            refresh_margin (Optional[float]): How many seconds before expiry the
+                token is renewed. Must exceed the window in which ``google.auth``
+                considers a token expired, so requests never refresh it themselves.
+            retry_interval (Optional[float]): How long to wait after a failed
+                refresh, and the shortest time between two refreshes.
+        """
+        self._client = client
+        self._refresh_margin = refresh_margin
+        self._retry_interval = retry_interval
+        self._stopping = threading.Event()
+        self._operational_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def is_alive(self):
+        """Returns True is the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _seconds_until_refresh(self, credentials):
+        remaining = (credentials.expiry - _utcnow()).total_seconds()
+        return remaining - self._refresh_margin
+
+    def _refresh_if_needed(self):
+        """Refresh the token if it is missing or about to expire.
+
+        Returns:
+            Optional[float]: The number of seconds until the next check, or None
+            if the credentials never need refreshing.
+        """
+        credentials = self._client._credentials
+        if credentials is None:
+            # the client was given an authorized ``_http`` object
+            return None
+        if credentials.valid and credentials.expiry is None:
+            return None
+        if not credentials.valid or self._seconds_until_refresh(credentials) <= 0:
+            credentials.refresh(google.auth.transport.requests.Request())
+            _LOGGER.debug("Refreshed access token.")
+        if credentials.expiry is None:
+            return None
+        return max(self._seconds_until_refresh(credentials), self._retry_interval)
+
+    def _thread_main(self):
+        """The entry point for the refresher thread."""
+        while not self._stopping.is_set():
+            try:
+                delay = self._refresh_if_needed()
+            except Exception:
+                _LOGGER.warning("Failed to refresh access token.", exc_info=True)
+                delay = self._retry_interval
+            if delay is None:
+                return
+            self._stopping.wait(delay)
+
+    def start(self):
+        """Starts the background thread."""
+        with self._operational_lock:
+            if self.is_alive:
+                return
+
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._thread_main, name=_REFRESHER_THREAD_NAME
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, *, timeout=None):
+        """Stops the background thread.
+
+        Args:
+            timeout (Optional[float]): If specified, block up to this many seconds
+                for an in-flight refresh to complete.
+
+        Returns:
+            bool: True if the thread terminated. False if the thread is still
+            running.
+        """
+        with self._operational_lock:
+            self._stopping.set()
+            if self._thread is None:
+                return True
+            self._thread.join(timeout=timeout)
+            success = not self._thread.is_alive()
+            self._thread = None
+            return success
@@ -0,0 +1,227 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fetch the log entries of many traces at once.
+
+Trace IDs are packed into ``trace=(... OR ...)`` filters, split so that the
+queries can run concurrently and each filter stays within the length limit.
+Traces whose time is known, from a caller's hint or from the trace ID
+itself, are sorted by time so that each query covers a narrow time range.
+"""
+
+import collections.abc
+import concurrent.futures
+import math
+import re
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from google.cloud.logging_v2._parallel_list import _as_utc
+from google.cloud.logging_v2._parallel_list import _chunks
+from google.cloud.logging_v2._parallel_list import _CHUNKS_PER_SHARD
+from google.cloud.logging_v2._parallel_list import _DEFAULT_DURATION
+from google.cloud.logging_v2._parallel_list import _DEFAULT_MAX_WORKERS
+from google.cloud.logging_v2._parallel_list import _window_filter
+from google.cloud.logging_v2._parallel_list import _WORKER_THREAD_NAME
+from google.cloud.logging_v2._prefetch import _prefetch
+
+_DEFAULT_TIME_MARGIN = timedelta(minutes=10)
+_MAX_FILTER_LENGTH = 20000
+"""The longest filter the API accepts, in characters."""
+_FILTER_OVERHEAD = 200
+"""Room left in each filter for the parentheses and timestamp restrictions."""
+
+_XRAY_TRACE_ID = re.compile(r"1-([0-9a-f]{8})-[0-9a-f]{24}\Z")
+"""AWS X-Ray trace IDs start with the epoch second the trace began."""
+
+
+def _trace_name(trace_id, project):
+    """Return the resource name entries hold in their ``trace`` field."""
+    if trace_id.startswith("projects/"):
+        return trace_id
+    return f"projects/{project}/traces/{trace_id}"
+
+
+def _trace_time(trace_id, hint):
+    """Return the time of a trace, given or inferred from its ID, or None."""
+    if hint is not None:
+        return _as_utc(hint)
+    match = _XRAY_TRACE_ID.match(trace_id.rpartition("/")[2])
+    if match is None:
+        return None
+    return datetime.fromtimestamp(int(match.group(1), 16), timezone.utc)
+
+
+def _split(names, target_size, budget):
+    """Split trace names into chunks of ``target_size`` within ``budget``.
+
+    Chunks are closed early when the next name would take the length of the
+    chunk's ``trace=(... OR ...)`` restriction over ``budget``.
+    """
+    chunks = []
+    chunk = []
+    length = 0
+    for name in names:
+        # the quoted name, and the " OR " separating it from the next one
+        cost = len(name) + 6
+        if chunk and (len(chunk) >= target_size or length + cost > budget):
+            chunks.append(chunk)
+            chunk = []
+            length = 0
+        chunk.append(name)
+        length += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _chunk_filter(filter_, names, start_time, end_time):
+    traces = " OR ".join(f'"{name}"' for name in names)
+    restriction = f"trace=({traces})"
+    if filter_:
+        restriction = f"({filter_}) AND {restriction}"
+    return _window_filter(restriction, start_time, end_time)
+
+
+def _chunk_queries(trace_times, filter_, *, start_time, end_time, time_margin, workers):
+    """Return the ``(filter, traces)`` of each query to run.
+
+    Traces whose time is known are looked for within ``time_margin`` of it,
+    and within the caller's bounds. They are queried in time order, and a
+    new query starts wherever two traces are more than ``2 * time_margin``
+    apart. The others are looked for from
+    ``start_time``, or over the 24 hours before ``end_time``.
+
+    Args:
+        trace_times (Dict[str, Optional[datetime]]): The time of each trace
+            name, if known.
+        filter_ (Optional[str]): The caller's filter.
+        start_time (Optional[datetime]): The start of the range set by the
+            caller, if any.
+        end_time (datetime): The (exclusive) end of the range.
+        time_margin (timedelta): How far around a trace's time its entries
+            are looked for.
+        workers (int): The number of queries that can run concurrently.
+    """
+    budget = _MAX_FILTER_LENGTH - _FILTER_OVERHEAD - len(filter_ or "")
+    target_size = math.ceil(len(trace_times) / min(workers, len(trace_times)))
+    timed = sorted(
+        (time, name) for name, time in trace_times.items() if time is not None
+    )
+    untimed = [name for name, time in trace_times.items() if time is None]
+
+    # traces further apart than two margins are never queried together
+    runs = []
+    previous = None
+    for time, name in timed:
+        if previous is None or time - previous > 2 * time_margin:
+            runs.append([])
+        runs[-1].append(name)
+        previous = time
+
+    queries = []
+    for names in (chunk for run in runs for chunk in _split(run, target_size, budget)):
+        chunk_start = trace_times[names[0]] - time_margin
+        chunk_end = trace_times[names[-1]] + time_margin
+        if start_time is not None:
+            chunk_start = max(chunk_start, start_time)
+        chunk_end = min(chunk_end, end_time)
+        if chunk_start < chunk_end:
+            queries.append(
+                (_chunk_filter(filter_, names, chunk_start, chunk_end), names)
+            )
+    default_start = start_time or end_time - _DEFAULT_DURATION
+    for names in _split(untimed, target_size, budget):
+        queries.append((_chunk_filter(filter_, names, default_start, end_time), names))
+    return queries
+
+
+def _entries_for_traces(
+    client,
+    trace_ids,
+    *,
+    resource_names,
+    filter_=None,
+    start_time=None,
+    end_time=None,
+    time_margin=_DEFAULT_TIME_MARGIN,
+    max_workers=_DEFAULT_MAX_WORKERS,
+    page_size=None,
+):
+    """Implementation of :meth:`~logging_v2.client.Client.entries_for_traces`."""
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive")
+
+    if isinstance(trace_ids, collections.abc.Mapping):
+        hints = trace_ids
+        trace_ids = list(trace_ids.keys())
+    else:
+        hints = {}
+        trace_ids = list(trace_ids)
+    keys = {}
+    trace_times = {}
+    for trace_id in trace_ids:
+        name = _trace_name(trace_id, client.project)
+        keys.setdefault(name, []).append(trace_id)
+        trace_times[name] = _trace_time(name, hints.get(trace_id))
+    results = {trace_id: [] for trace_id in trace_ids}
+    if not trace_times:
+        return results
+
+    end_time = _as_utc(end_time or datetime.now(timezone.utc))
+    if start_time is not None:
+        start_time = _as_utc(start_time)
+        if start_time >= end_time:
+            raise ValueError("start_time must be before end_time")
+
+    queries = _chunk_queries(
+        trace_times,
+        filter_,
+        start_time=start_time,
+        end_time=end_time,
+        time_margin=time_margin,
+        workers=max_workers,
+    )
+
+    def query_entries(query_filter):
+        # a generator, so that even the first request runs in the query's thread
+        yield from client.list_entries(
+            resource_names=resource_names,
+            filter_=query_filter,
+            order_by="timestamp asc",
+            page_size=page_size,
+        )
+
+    # the workers run the requests of all the queries, one chunk at a time
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers, thread_name_prefix=_WORKER_THREAD_NAME
+    )
+    shards = [
+        _prefetch(
+            _chunks(query_entries(query_filter)), _CHUNKS_PER_SHARD, executor=executor
+        )
+        for query_filter, _ in queries
+    ]
+    try:
+        for shard in shards:
+            for chunk in shard:
+                for entry in chunk:
+                    for trace_id in keys.get(entry.trace, ()):
+                        results[trace_id].append(entry)
+    finally:
+        for shard in shards:
+            shard.close()
+        executor.shutdown(wait=False)
+    return results
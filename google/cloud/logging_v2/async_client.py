@@ -0,0 +1,178 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asyncio client for interacting with the Cloud Logging API."""
+
+import google.api_core.client_options
+from google.api_core import client_info as api_client_info
+from google.cloud.client import ClientWithProject
+
+from google.cloud.logging_v2 import __version__
+from google.cloud.logging_v2._helpers import _add_defaults_to_filter
+from google.cloud.logging_v2._helpers import _LoggerCache
+from google.cloud.logging_v2.async_logger import AsyncLogger
+from google.cloud.logging_v2.client import _get_gapic
+from google.cloud.logging_v2.client import Client
+
+
+class AsyncClient(ClientWithProject):
+    """Asyncio client to bundle configuration needed for API requests.
+
+    Mirrors the logging methods of :class:`~logging_v2.client.Client`, as
+    coroutines. Requests are sent over gRPC with the generated
+    :class:`~logging_v2.services.logging_service_v2.LoggingServiceV2AsyncClient`.
+    """
+
+    _logging_api = None
+
+    SCOPE = Client.SCOPE
+    """The scopes required for authenticating as a Logging consumer."""
+
+    def __init__(
+        self,
+        *,
+        project=None,
+        credentials=None,
+        client_info=None,
+        client_options=None,
+    ):
+        """
+        Args:
+            project (Optional[str]): the project which the client acts on behalf of.
+                If not passed, falls back to the default inferred
+                from the environment.
+            credentials (Optional[google.auth.credentials.Credentials]):
+                The OAuth2 Credentials to use for this client. If not passed,
+                falls back to the default inferred from the environment.
+            client_info (Optional[Union[google.api_core.client_info.ClientInfo, google.api_core.gapic_v1.client_info.ClientInfo]]):
+                The client info used to send a user-agent string along with API
+                requests. If ``None``, then default info will be used.
+            client_options (Optional[Union[dict, google.api_core.client_options.ClientOptions]]):
+                Client options used to set user options
+                on the client. API Endpoint should be set through client_options.
+        """
+        if isinstance(client_options, dict):
+            client_options = google.api_core.client_options.from_dict(client_options)
+        super(AsyncClient, self).__init__(
+            project=project,
+            credentials=credentials,
+            client_options=client_options,
+        )
+        if client_info is None:
+            client_info = api_client_info.ClientInfo(client_library_version=__version__)
+        self._client_info = client_info
+        self._client_options = client_options
+        # loggers attached to entries read through this client
+        self._entry_loggers = _LoggerCache()
+
+    @property
+    def logging_api(self):
+        """Helper for logging-related API calls.
+
+        See
+        https://cloud.google.com/logging/docs/reference/v2/rest/v2/entries
+        https://cloud.google.com/logging/docs/reference/v2/rest/v2/projects.logs
+        """
+        if self._logging_api is None:
+            self._logging_api = _get_gapic().make_async_logging_api(self)
+        return self._logging_api
+
+    def logger(self, name, *, labels=None, resource=None):
+        """Creates a logger bound to the current client.
+
+        Args:
+            name (str): The name of the logger to be constructed.
+            resource (Optional[~logging_v2.Resource]): a monitored resource object
+                representing the resource the code was run on. If not given, will
+                be inferred from the environment.
+            labels (Optional[dict]): Mapping of default labels for entries written
+                via this logger.
+
+        Returns:
+            ~logging_v2.async_logger.AsyncLogger: Logger created with the current client.
+        """
+        return AsyncLogger(name, client=self, labels=labels, resource=resource)
+
+    def list_entries(
+        self,
+        *,
+        resource_names=None,
+        filter_=None,
+        order_by=None,
+        max_results=None,
+        page_size=None,
+        page_token=None,
+        raw=False,
+    ):
+        """Return an async iterator over log entry resources.
+
+        Takes the same arguments as :meth:`Client.list_entries`, other than
+        ``prefetch_pages``. Use with ``async for``:
+
+        .. code-block:: python
+
+            async for entry in client.list_entries(filter_="severity>=ERROR"):
+                ...
+
+        Returns:
+            AsyncIterator[Union[~logging_v2.LogEntry, google.logging.v2.log_entry_pb2.LogEntry]]
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+        filter_ = _add_defaults_to_filter(filter_)
+
+        return self.logging_api.list_entries(
+            resource_names=resource_names,
+            filter_=filter_,
+            order_by=order_by,
+            max_results=max_results,
+            page_size=page_size,
+            page_token=page_token,
+            raw=raw,
+        )
+
+    def tail_entries(
+        self, *, resource_names=None, filter_=None, buffer_window=None, raw=False
+    ):
+        """Return an async iterator over log entries as they are written.
+
+        Takes the same arguments as :meth:`Client.tail_entries`. Use with
+        ``async for``, and close it with ``await tail.close()`` or by using it
+        as an async context manager.
+
+        Returns:
+            ~logging_v2._tail._AsyncEntryTail: The entry iterator.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return self.logging_api.tail_entries(
+            resource_names,
+            filter_=filter_,
+            buffer_window=buffer_window,
+            raw=raw,
+        )
+
+    async def close(self):
+        """Close the connections used by the client."""
+        if self._logging_api is not None:
+            await self._logging_api.close()
+            self._logging_api = None
+        super(AsyncClient, self).close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
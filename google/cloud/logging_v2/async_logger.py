@@ -0,0 +1,171 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Define asyncio API Loggers."""
+
+from google.api_core.exceptions import InvalidArgument
+
+from google.cloud.logging_v2.entries import LogEntry
+from google.cloud.logging_v2.entries import ProtobufEntry
+from google.cloud.logging_v2.entries import StructEntry
+from google.cloud.logging_v2.entries import TextEntry
+from google.cloud.logging_v2.logger import _entry_class_for
+from google.cloud.logging_v2.logger import _STRUCT_EXTRACTABLE_FIELDS
+from google.cloud.logging_v2.logger import Batch
+from google.cloud.logging_v2.logger import Logger
+
+
+class AsyncLogger(Logger):
+    """Logger whose API calls are coroutines, bound to an
+    :class:`~logging_v2.async_client.AsyncClient`.
+
+    Entries are built exactly as by :class:`~logging_v2.logger.Logger`. If the
+    logger is created without a ``resource``, the first entry written looks up
+    the monitored resource from the environment, which may block the event
+    loop briefly; pass ``resource`` to avoid it.
+
+    See https://cloud.google.com/logging/docs/reference/v2/rest/v2/projects.logs
+    """
+
+    def batch(self, *, client=None, apply_exclusions=True):
+        """Return a batch to use as an async context manager.
+
+        Args:
+            client (Union[None, ~logging_v2.async_client.AsyncClient]):
+                The client to use.  If not passed, falls back to the
+                ``client`` stored on the current logger.
+            apply_exclusions (Optional[bool]): See :meth:`Logger.batch`.
+
+        Returns:
+            AsyncBatch: A batch to use as an async context manager.
+        """
+        client = self._require_client(client)
+        return AsyncBatch(self, client, apply_exclusions=apply_exclusions)
+
+    async def _do_log(self, client, _entry_class, payload=None, **kw):
+        """Helper for :meth:`log_empty`, :meth:`log_text`, etc."""
+        client = self._require_client(client)
+        entries = self._make_entries(_entry_class, payload, **kw)
+        # partial_success is true to avoid dropping instrumentation logs
+        await client.logging_api.write_entries(entries, partial_success=True)
+
+    async def log_empty(self, *, client=None, **kw):
+        """Log an empty message. See :meth:`Logger.log_empty`."""
+        await self._do_log(client, LogEntry, **kw)
+
+    async def log_text(self, text, *, client=None, **kw):
+        """Log a text message. See :meth:`Logger.log_text`."""
+        await self._do_log(client, TextEntry, text, **kw)
+
+    async def log_struct(self, info, *, client=None, **kw):
+        """Log a dictionary message. See :meth:`Logger.log_struct`."""
+        for field in _STRUCT_EXTRACTABLE_FIELDS:
+            # attempt to copy relevant fields from the payload into the LogEntry body
+            if field in info and field not in kw:
+                kw[field] = info[field]
+        await self._do_log(client, StructEntry, info, **kw)
+
+    async def log_proto(self, message, *, client=None, **kw):
+        """Log a protobuf message. See :meth:`Logger.log_proto`."""
+        await self._do_log(client, ProtobufEntry, message, **kw)
+
+    async def log(self, message=None, *, client=None, **kw):
+        """Log an arbitrary message. See :meth:`Logger.log`."""
+        entry_class = _entry_class_for(message)
+        if entry_class is StructEntry:
+            # also copies the entry fields found in the payload
+            await self.log_struct(message, client=client, **kw)
+        else:
+            await self._do_log(client, entry_class, message, **kw)
+
+    async def delete(self, logger_name=None, *, client=None):
+        """Delete all entries in a logger. See :meth:`Logger.delete`."""
+        client = self._require_client(client)
+        if logger_name is None:
+            logger_name = self.full_name
+        await client.logging_api.logger_delete(logger_name)
+
+    def list_entries(
+        self,
+        *,
+        resource_names=None,
+        filter_=None,
+        order_by=None,
+        max_results=None,
+        page_size=None,
+        page_token=None,
+    ):
+        """Return an async iterator over this logger's entries.
+
+        Takes the same arguments as :meth:`Logger.list_entries`, other than
+        ``prefetch_pages``. Use with ``async for``.
+
+        Returns:
+            AsyncIterator[~logging_v2.LogEntry]
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return self.client.list_entries(
+            resource_names=resource_names,
+            filter_=self._entries_filter(filter_),
+            order_by=order_by,
+            max_results=max_results,
+            page_size=page_size,
+            page_token=page_token,
+        )
+
+
+class AsyncBatch(Batch):
+    """Async context manager: collect entries to log via a single API call.
+
+    Helper returned by :meth:`AsyncLogger.batch`. Entries are added with the
+    same (synchronous) methods as :class:`~logging_v2.logger.Batch`, and are
+    written when the ``async with`` block exits without an error.
+    """
+
+    def __enter__(self):
+        raise TypeError("use 'async with' with an AsyncBatch")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+
+    async def commit(self, *, client=None, partial_success=True):
+        """Send saved log entries as a single API call.
+
+        Args:
+            client (Optional[~logging_v2.async_client.AsyncClient]):
+                The client to use.  If not passed, falls back to the
+                ``client`` stored on the current batch.
+            partial_success (Optional[bool]):
+                Whether a batch's valid entries should be written even
+                if some other entry failed due to a permanent error such
+                as INVALID_ARGUMENT or PERMISSION_DENIED.
+        """
+        if client is None:
+            client = self.client
+
+        entries, kwargs = self._prepare_write()
+        try:
+            await client.logging_api.write_entries(
+                entries, partial_success=partial_success, **kwargs
+            )
+        except InvalidArgument as e:
+            self._append_context_to_error(e)
+            raise e
+        del self.entries[:]
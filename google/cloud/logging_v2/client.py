@@ -14,19 +14,34 @@
 
 """Client for interacting with the Google Cloud Logging API."""
 
+import importlib.util
 import logging
 import os
 import sys
+import threading
 
 
 import google.api_core.client_options
+import google.auth
+import google.auth.credentials
+from google.auth import environment_vars
 from google.cloud.client import ClientWithProject
 from google.cloud.environment_vars import DISABLE_GRPC
+from google.cloud.logging_v2._export import _DEFAULT_MAX_ENTRIES_PER_FILE
+from google.cloud.logging_v2._export import _DEFAULT_PAGE_SIZE
+from google.cloud.logging_v2._export import _export_entries
 from google.cloud.logging_v2._helpers import _add_defaults_to_filter
+from google.cloud.logging_v2._helpers import _LoggerCache
 from google.cloud.logging_v2._http import Connection
 from google.cloud.logging_v2._http import _LoggingAPI as JSONLoggingAPI
 from google.cloud.logging_v2._http import _MetricsAPI as JSONMetricsAPI
 from google.cloud.logging_v2._http import _SinksAPI as JSONSinksAPI
+from google.cloud.logging_v2._parallel_list import _DEFAULT_MAX_WORKERS
+from google.cloud.logging_v2._parallel_list import _list_entries_parallel
+from google.cloud.logging_v2._exclusions import _LocalExclusions
+from google.cloud.logging_v2._traces import _DEFAULT_TIME_MARGIN
+from google.cloud.logging_v2._traces import _entries_for_traces
+from google.cloud.logging_v2._token_refresher import _BackgroundTokenRefresher
 from google.cloud.logging_v2.handlers import CloudLoggingHandler
 from google.cloud.logging_v2.handlers import StructuredLogHandler
 from google.cloud.logging_v2.handlers import setup_logging
@@ -41,20 +56,31 @@ from google.cloud.logging_v2.sink import Sink
 
 
 _DISABLE_GRPC = os.getenv(DISABLE_GRPC, False)
-_HAVE_GRPC = False
+# The gapic library pulls in the whole gRPC stack, so only check that gRPC is
+# installed here and import the library when a gRPC API is first needed.
+# If gRPC is missing, fall back to HTTP mode.
+_HAVE_GRPC = not _DISABLE_GRPC and importlib.util.find_spec("grpc") is not None
+_gapic = None
 
-try:
-    if not _DISABLE_GRPC:
-        # only import if DISABLE_GRPC is not set
-        from google.cloud.logging_v2 import _gapic
+_USE_GRPC = _HAVE_GRPC and not _DISABLE_GRPC
 
-        _HAVE_GRPC = True
-except ImportError:  # pragma: NO COVER
-    # could not import gapic library. Fall back to HTTP mode
-    _HAVE_GRPC = False
-    _gapic = None
 
-_USE_GRPC = _HAVE_GRPC and not _DISABLE_GRPC
+def _get_gapic():
+    """Import the gapic library on first use.
+
+    Returns:
+        module: The :mod:`google.cloud.logging_v2._gapic` module.
+    """
+    global _gapic
+    if _gapic is None:
+        from google.cloud.logging_v2 import _gapic as gapic_module
+
+        _gapic = gapic_module
+    return _gapic
+
+
+_DEFAULT_WARM_UP_TIMEOUT = 10.0  # Seconds
+_WARM_UP_THREAD_NAME = "google.cloud.logging.WarmUp"
 
 _GAE_RESOURCE_TYPE = "gae_app"
 _GKE_RESOURCE_TYPE = "k8s_container"
@@ -68,6 +94,14 @@ class Client(ClientWithProject):
     _logging_api = None
     _sinks_api = None
     _metrics_api = None
+    _token_refresher = None
+    local_exclusions = None
+    """Optional[~logging_v2._exclusions._LocalExclusions]: The exclusions
+    applied before entries are sent, if enabled by ``apply_exclusions``.
+    Its ``dropped_counts`` attribute counts the entries dropped, by
+    exclusion name."""
+    _deferred_options = None
+    """Client options used to resolve deferred credentials, if still pending."""
 
     SCOPE = (
         "https://www.googleapis.com/auth/logging.read",
@@ -86,6 +120,9 @@ class Client(ClientWithProject):
         _use_grpc=None,
         client_info=None,
         client_options=None,
+        defer_credentials=False,
+        refresh_token_in_background=False,
+        apply_exclusions=False,
     ):
         """
         Args:
@@ -118,20 +155,63 @@ class Client(ClientWithProject):
             client_options (Optional[Union[dict, google.api_core.client_options.ClientOptions]]):
                 Client options used to set user options
                 on the client. API Endpoint should be set through client_options.
+            defer_credentials (Optional[bool]): If True and neither ``credentials``
+                nor ``_http`` are passed, the default credentials (and the project,
+                if not passed or set in the environment) are only resolved when
+                first needed, rather than when the client is created. Errors
+                resolving them are raised at that point.
+            refresh_token_in_background (Optional[bool]): If True, a background
+                thread fetches the access token and renews it before it expires,
+                so API calls never wait on a token refresh. The thread is stopped
+                by :meth:`close`.
+            apply_exclusions (Optional[bool]): If True, the project's active
+                log exclusions are fetched by a background thread every five
+                minutes, and entries matching them are dropped when written
+                through this client's loggers and handlers, rather than being
+                sent and discarded by the server. Exclusions using functions
+                which cannot be evaluated locally, such as ``sample()``, are
+                still applied by the server only. The thread is stopped by
+                :meth:`close`.
         """
-        super(Client, self).__init__(
-            project=project,
-            credentials=credentials,
-            _http=_http,
-            client_options=client_options,
-        )
+        if isinstance(client_options, dict):
+            client_options = google.api_core.client_options.from_dict(client_options)
+        self._defaults_lock = threading.Lock()
+        self._api_lock = threading.Lock()
+        if (
+            defer_credentials
+            and credentials is None
+            and _http is None
+            and not (
+                client_options
+                and (
+                    client_options.credentials_file
+                    or getattr(client_options, "api_key", None)
+                )
+            )
+        ):
+            # resolved by _resolve_default_credentials on first use
+            self._deferred_options = (
+                client_options or google.api_core.client_options.ClientOptions()
+            )
+            self._credentials = None
+            self._http_internal = None
+            self._client_cert_source = self._deferred_options.client_cert_source
+            if project is None:
+                project = os.getenv(
+                    environment_vars.PROJECT,
+                    os.getenv(environment_vars.LEGACY_PROJECT),
+                )
+            self.project = project
+        else:
+            super(Client, self).__init__(
+                project=project,
+                credentials=credentials,
+                _http=_http,
+                client_options=client_options,
+            )
 
         kw_args = {"client_info": client_info}
         if client_options:
-            if isinstance(client_options, dict):
-                client_options = google.api_core.client_options.from_dict(
-                    client_options
-                )
             if client_options.api_endpoint:
                 api_endpoint = client_options.api_endpoint
                 kw_args["api_endpoint"] = api_endpoint
@@ -148,6 +228,81 @@ class Client(ClientWithProject):
             self._use_grpc = _USE_GRPC
         else:
             self._use_grpc = _use_grpc
+        # loggers attached to entries read through this client
+        self._entry_loggers = _LoggerCache()
+        if refresh_token_in_background:
+            self._token_refresher = _BackgroundTokenRefresher(self)
+            self._token_refresher.start()
+        if apply_exclusions:
+            self._enable_local_exclusions()
+
+    def _enable_local_exclusions(self):
+        """Start applying the project's exclusions locally, if not already."""
+        with self._api_lock:
+            if self.local_exclusions is None:
+                self.local_exclusions = _LocalExclusions(self)
+                self.local_exclusions.start()
+
+    @property
+    def project(self):
+        """Project the client acts on behalf of."""
+        if self._project is None and self._deferred_options is not None:
+            self._resolve_default_credentials()
+        return self._project
+
+    @project.setter
+    def project(self, value):
+        self._project = value
+
+    @property
+    def _credentials(self):
+        """Credentials used to authorize API requests."""
+        if self._deferred_options is not None:
+            self._resolve_default_credentials()
+        return self._resolved_credentials
+
+    @_credentials.setter
+    def _credentials(self, value):
+        self._resolved_credentials = value
+
+    def _resolve_default_credentials(self):
+        """Resolve deferred credentials and project from the environment.
+
+        Raises:
+            google.auth.exceptions.DefaultCredentialsError: If no default
+                credentials could be found.
+            EnvironmentError: If the project was not passed and could not
+                be determined from the environment.
+        """
+        with self._defaults_lock:
+            options = self._deferred_options
+            if options is None:
+                # resolved by another thread
+                return
+            scopes = options.scopes or self.SCOPE
+            credentials, project = google.auth.default(scopes=scopes)
+            credentials = google.auth.credentials.with_scopes_if_required(
+                credentials, scopes=scopes
+            )
+            if options.quota_project_id:
+                credentials = credentials.with_quota_project(options.quota_project_id)
+            if self._project is None:
+                if project is None:
+                    raise EnvironmentError(
+                        "Project was not passed and could not be "
+                        "determined from the environment."
+                    )
+                self._project = project
+            self._resolved_credentials = credentials
+            self._deferred_options = None
+
+    def close(self):
+        """Stop the background threads, if any, and close the transport."""
+        if self._token_refresher is not None:
+            self._token_refresher.stop()
+        if self.local_exclusions is not None:
+            self.local_exclusions.stop()
+        super(Client, self).close()
 
     @property
     def logging_api(self):
@@ -158,10 +313,13 @@ class Client(ClientWithProject):
         https://cloud.google.com/logging/docs/reference/v2/rest/v2/projects.logs
         """
         if self._logging_api is None:
-            if self._use_grpc:
-                self._logging_api = _gapic.make_logging_api(self)
-            else:
-                self._logging_api = JSONLoggingAPI(self)
+            # may be created concurrently by a warm-up and a transport thread
+            with self._api_lock:
+                if self._logging_api is None:
+                    if self._use_grpc:
+                        self._logging_api = _get_gapic().make_logging_api(self)
+                    else:
+                        self._logging_api = JSONLoggingAPI(self)
         return self._logging_api
 
     @property
@@ -173,7 +331,7 @@ class Client(ClientWithProject):
         """
         if self._sinks_api is None:
             if self._use_grpc:
-                self._sinks_api = _gapic.make_sinks_api(self)
+                self._sinks_api = _get_gapic().make_sinks_api(self)
             else:
                 self._sinks_api = JSONSinksAPI(self)
         return self._sinks_api
@@ -187,11 +345,43 @@ class Client(ClientWithProject):
         """
         if self._metrics_api is None:
             if self._use_grpc:
-                self._metrics_api = _gapic.make_metrics_api(self)
+                self._metrics_api = _get_gapic().make_metrics_api(self)
             else:
                 self._metrics_api = JSONMetricsAPI(self)
         return self._metrics_api
 
+    def warm_up(self, *, timeout=_DEFAULT_WARM_UP_TIMEOUT, block=True):
+        """Connect the gRPC channel used to write entries before the first write.
+
+        Without a warm-up, the first batch of entries waits for the connection
+        to be established. Combine with ``refresh_token_in_background`` to also
+        fetch the access token ahead of time. Does nothing when the client uses
+        the HTTP transport.
+
+        Args:
+            timeout (Optional[float]): The longest time to wait for the channel
+                to connect, in seconds.
+            block (Optional[bool]): If False, connect from a background thread
+                and return immediately.
+
+        Returns:
+            Optional[bool]: True if the channel is ready (or no warm-up is needed),
+            False if it did not connect within ``timeout``. None if ``block``
+            is False.
+        """
+        if not block:
+            thread = threading.Thread(
+                target=self.warm_up,
+                kwargs={"timeout": timeout},
+                name=_WARM_UP_THREAD_NAME,
+            )
+            thread.daemon = True
+            thread.start()
+            return None
+        if not self._use_grpc:
+            return True
+        return self.logging_api.warm_up(timeout)
+
     def logger(self, name, *, labels=None, resource=None):
         """Creates a logger bound to the current client.
 
@@ -217,6 +407,8 @@ class Client(ClientWithProject):
         max_results=None,
         page_size=None,
         page_token=None,
+        raw=False,
+        prefetch_pages=0,
     ):
         """Return a generator of log entry resources.
 
@@ -245,9 +437,19 @@ class Client(ClientWithProject):
                 one at a time. If not passed, defaults to a value set by the API.
             page_token (str): opaque marker for the starting "page" of entries. If not
                 passed, the API will return the first page of entries.
+            raw (bool): If True, yield the raw ``LogEntry`` protobufs returned by
+                the API instead of :class:`~logging_v2.entries.LogEntry` objects,
+                for consumers processing entries in bulk. Requires the gRPC
+                transport.
+            prefetch_pages (int): the number of pages fetched ahead in a background
+                thread while the current page is consumed, so that requests
+                overlap with processing. Disabled when 0.
 
         Returns:
-            Generator[~logging_v2.LogEntry]
+            Generator[Union[~logging_v2.LogEntry, google.logging.v2.log_entry_pb2.LogEntry]]
+
+        Raises:
+            ValueError: If ``raw`` is True and the client uses HTTP.
         """
         if resource_names is None:
             resource_names = [f"projects/{self.project}"]
@@ -260,6 +462,274 @@ class Client(ClientWithProject):
             max_results=max_results,
             page_size=page_size,
             page_token=page_token,
+            raw=raw,
+            prefetch_pages=prefetch_pages,
+        )
+
+    def tail_entries(
+        self, *, resource_names=None, filter_=None, buffer_window=None, raw=False
+    ):
+        """Return an iterator over log entries as they are written.
+
+        Tail sessions are reopened whenever the server ends them or they fail
+        with a transient error, and entries delivered again around a reconnect
+        are dropped. Iteration blocks until entries arrive and only ends once
+        the iterator is closed:
+
+        .. code-block:: python
+
+            with client.tail_entries(filter_="severity>=ERROR") as tail:
+                for entry in tail:
+                    ...
+
+        Over HTTP, which has no streaming RPCs, the entries newer than the
+        last one returned are polled for instead, more often while entries
+        arrive and less often while none do.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries. If not passed, defaults to
+                the project bound to the client.
+            filter_ (str): a filter expression. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+                Unlike :meth:`list_entries`, no time range is added.
+            buffer_window (Union[None, float, datetime.timedelta]): How long the
+                server holds entries back to return late-arriving ones in order,
+                in seconds. Between 0 and 60; defaults to 2 seconds. Over HTTP,
+                how far before the newest entry returned each poll starts.
+            raw (bool): If True, yield the raw ``LogEntry`` protobufs returned by
+                the API instead of :class:`~logging_v2.entries.LogEntry` objects.
+                Requires the gRPC transport.
+
+        Returns:
+            Union[~logging_v2._tail._EntryTail, ~logging_v2._tail._PolledTail]:
+                The entry iterator. Its ``suppressed_counts``, ``duplicates``
+                and ``reconnects`` attributes count the entries the server
+                omitted by reason, the duplicates dropped, and the sessions
+                reopened or polls retried.
+
+        Raises:
+            ValueError: If ``raw`` is True and the client uses HTTP.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return self.logging_api.tail_entries(
+            resource_names,
+            filter_=filter_,
+            buffer_window=buffer_window,
+            raw=raw,
+        )
+
+    def list_entries_parallel(
+        self,
+        *,
+        resource_names=None,
+        filter_=None,
+        order_by=None,
+        start_time=None,
+        end_time=None,
+        time_shards=1,
+        max_workers=_DEFAULT_MAX_WORKERS,
+        max_results=None,
+        page_size=None,
+    ):
+        """Return a generator of log entries, fetched by concurrent queries.
+
+        The query is split into one shard per resource name and time window,
+        and shards are run concurrently. Their results are merged in
+        ``order_by`` order, and entries returned by several shards (for
+        example, when a project is listed along with its folder) are only
+        returned once.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries:
+
+                ::
+
+                    "projects/[PROJECT_ID]"
+                    "organizations/[ORGANIZATION_ID]"
+                    "billingAccounts/[BILLING_ACCOUNT_ID]"
+                    "folders/[FOLDER_ID]"
+
+                If not passed, defaults to the project bound to the API's client.
+
+            filter_ (str): a filter expression, without timestamp restrictions.
+                See https://cloud.google.com/logging/docs/view/advanced_filters
+            order_by (str) One of :data:`~logging_v2.ASCENDING`
+                or :data:`~logging_v2.DESCENDING`.
+            start_time (Optional[datetime.datetime]): The start of the queried
+                time range. Defaults to 24 hours before ``end_time``. Naive
+                datetimes are taken to be UTC.
+            end_time (Optional[datetime.datetime]): The (exclusive) end of the
+                queried time range. Defaults to now.
+            time_shards (int): The number of equal windows the time range is
+                split into.
+            max_workers (int): The maximum number of concurrent API calls.
+            max_results (Optional[int]):
+                Optional. The maximum number of entries to return.
+            page_size (int): number of entries to fetch in each API call.
+
+        Returns:
+            Generator[~logging_v2.LogEntry]
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return _list_entries_parallel(
+            self,
+            resource_names=resource_names,
+            filter_=filter_,
+            order_by=order_by,
+            start_time=start_time,
+            end_time=end_time,
+            time_shards=time_shards,
+            max_workers=max_workers,
+            max_results=max_results,
+            page_size=page_size,
+        )
+
+    def entries_for_traces(
+        self,
+        trace_ids,
+        *,
+        resource_names=None,
+        filter_=None,
+        start_time=None,
+        end_time=None,
+        time_margin=_DEFAULT_TIME_MARGIN,
+        max_workers=_DEFAULT_MAX_WORKERS,
+        page_size=None,
+    ):
+        """Return the log entries of many traces, grouped by trace.
+
+        The trace IDs are split into chunks, each queried with a single
+        ``trace=(... OR ...)`` filter, and the chunks are queried
+        concurrently. There are enough chunks to use ``max_workers``
+        concurrent queries, and more if needed to keep each filter within
+        the API's length limit.
+
+        When the time of a trace is known, its entries are only looked for
+        within ``time_margin`` of it, and traces close in time are queried
+        together. Times are read from ``trace_ids`` when it maps trace IDs
+        to datetimes, and from AWS X-Ray trace IDs, which start with the
+        time of the trace:
+
+        .. code-block:: python
+
+            slow = {request.trace_id: request.start_time for request in requests}
+            for trace_id, entries in client.entries_for_traces(slow).items():
+                ...
+
+        Args:
+            trace_ids (Union[Iterable[str], Mapping[str, Optional[datetime.datetime]]]):
+                The trace IDs, either bare or as
+                ``projects/[PROJECT_ID]/traces/[TRACE_ID]`` resource names.
+                Bare IDs are taken to belong to the client's project. A
+                mapping may give the approximate time of each trace.
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries. If not passed, defaults to
+                the project bound to the client.
+            filter_ (str): a filter expression, without timestamp restrictions,
+                that entries must also match. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+            start_time (Optional[datetime.datetime]): The start of the queried
+                time range. Traces of unknown time are looked for over the 24
+                hours before ``end_time`` by default. Naive datetimes are taken
+                to be UTC.
+            end_time (Optional[datetime.datetime]): The (exclusive) end of the
+                queried time range. Defaults to now.
+            time_margin (datetime.timedelta): How far before and after the
+                time of a trace its entries are looked for.
+            max_workers (int): The maximum number of concurrent API calls.
+            page_size (int): number of entries to fetch in each API call.
+
+        Returns:
+            Dict[str, List[~logging_v2.LogEntry]]: The entries of each trace ID
+            passed, in ascending timestamp order. Traces without entries map
+            to empty lists.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return _entries_for_traces(
+            self,
+            trace_ids,
+            resource_names=resource_names,
+            filter_=filter_,
+            start_time=start_time,
+            end_time=end_time,
+            time_margin=time_margin,
+            max_workers=max_workers,
+            page_size=page_size,
+        )
+
+    def export_entries(
+        self,
+        destination,
+        *,
+        resource_names=None,
+        filter_=None,
+        order_by="timestamp asc",
+        format_="ndjson",
+        checkpoint_path=None,
+        page_size=_DEFAULT_PAGE_SIZE,
+        max_entries_per_file=_DEFAULT_MAX_ENTRIES_PER_FILE,
+    ):
+        """Export log entries to files in a local directory.
+
+        Entries are streamed to numbered part files (``part-00000.ndjson.gz``,
+        ...) one page at a time, so memory use does not grow with the number
+        of entries. A checkpoint is saved each time a part file is complete.
+        If the export is interrupted, calling this method again with the same
+        arguments continues after the last complete part file.
+
+        Also available from the command line as ``google-cloud-logging-export``.
+
+        Args:
+            destination (str): The directory to write the part files to. It
+                is created if needed.
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries. If not passed, defaults to
+                the project bound to the client.
+            filter_ (str): a filter expression. See
+                https://cloud.google.com/logging/docs/view/advanced_filters
+                Without a timestamp restriction, entries from the last 24 hours
+                are exported.
+            order_by (str) One of :data:`~logging_v2.ASCENDING`
+                or :data:`~logging_v2.DESCENDING`.
+            format_ (str): One of ``"ndjson"`` (gzip-compressed JSON entries,
+                one per line), ``"parquet"`` or ``"arrow"`` (an Arrow IPC
+                file). Parquet and Arrow files hold one record batch per page
+                and require ``pyarrow``.
+            checkpoint_path (Optional[str]): The checkpoint file. Defaults to
+                ``_checkpoint.json`` in ``destination``.
+            page_size (int): number of entries to fetch in each API call.
+            max_entries_per_file (int): A part file is completed, and a
+                checkpoint saved, once it holds at least this many entries.
+
+        Returns:
+            int: The total number of entries exported, including those
+            exported by interrupted calls.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different export, or if
+                ``format_`` is not supported.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self.project}"]
+
+        return _export_entries(
+            self.logging_api,
+            destination,
+            resource_names=resource_names,
+            filter_=filter_,
+            order_by=order_by,
+            format_=format_,
+            checkpoint_path=checkpoint_path,
+            page_size=page_size,
+            max_entries_per_file=max_entries_per_file,
         )
 
     def sink(self, name, *, filter_=None, destination=None):
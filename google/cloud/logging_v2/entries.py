@@ -27,11 +27,6 @@ from google.cloud._helpers import _name_from_project_path
 from google.cloud._helpers import _rfc3339_nanos_to_datetime
 from google.cloud._helpers import _datetime_to_rfc3339
 
-# import officially supported proto definitions
-import google.cloud.audit.audit_log_pb2  # noqa: F401
-import google.cloud.appengine_logging  # noqa: F401
-from google.iam.v1.logging import audit_data_pb2  # noqa: F401
-
 _GLOBAL_RESOURCE = Resource(type="global", labels={})
 
 
@@ -46,6 +41,32 @@ _LOGGER_TEMPLATE = re.compile(
 )
 
 
+_proto_types_registered = False
+
+
+def _register_proto_types():
+    """Import the officially supported ``protoPayload`` definitions.
+
+    Importing them registers their messages with the default protobuf
+    descriptor pool, which is required to encode and decode ``Any`` payloads.
+    This is deferred until a ``protoPayload`` is first handled, as the modules
+    are large and most processes never read or write one.
+
+    Returns:
+        bool: True if the definitions were registered by this call, False if
+        they were already registered.
+    """
+    global _proto_types_registered
+    if _proto_types_registered:
+        return False
+    import google.cloud.audit.audit_log_pb2  # noqa: F401
+    import google.cloud.appengine_logging  # noqa: F401
+    from google.iam.v1.logging import audit_data_pb2  # noqa: F401
+
+    _proto_types_registered = True
+    return True
+
+
 def logger_name_from_path(path, project=None):
     """Validate a logger URI path and get the logger name.
 
@@ -70,6 +91,33 @@ def _int_or_none(value):
     return value
 
 
+def _logger_for_entry(logger_fullname, client, loggers):
+    """Look up or create the logger that wrote an entry.
+
+    Args:
+        logger_fullname (str): The entry's ``logName``.
+        client (~logging_v2.client.Client): The client used to create loggers.
+        loggers (Optional[dict]): A mapping of logger fullnames -> loggers,
+            updated with any logger created here.
+
+    Returns:
+        Optional[~logging_v2.logger.Logger]: The logger, or None if the log
+        name is not scoped to a project.
+    """
+    if loggers is None:
+        loggers = {}
+    logger = loggers.get(logger_fullname)
+    if logger is None:
+        # attempt to create a logger if possible
+        try:
+            logger_name = logger_name_from_path(logger_fullname, client.project)
+            logger = loggers[logger_fullname] = client.logger(logger_name)
+        except ValueError:
+            # log name is not scoped to a project. Leave logger as None
+            pass
+    return logger
+
+
 _LOG_ENTRY_FIELDS = (  # (name, default)
     ("log_name", None),
     ("labels", None),
@@ -162,23 +210,25 @@ class LogEntry(_LogEntryTuple):
         Returns:
             google.cloud.logging.entries.LogEntry: Log entry parsed from ``resource``.
         """
-        if loggers is None:
-            loggers = {}
-        logger_fullname = resource["logName"]
-        logger = loggers.get(logger_fullname)
-        if logger is None:
-            # attempt to create a logger if possible
-            try:
-                logger_name = logger_name_from_path(logger_fullname, client.project)
-                logger = loggers[logger_fullname] = client.logger(logger_name)
-            except ValueError:
-                # log name is not scoped to a project. Leave logger as None
-                pass
-        payload = cls._extract_payload(resource)
-        insert_id = resource.get("insertId")
         timestamp = resource.get("timestamp")
         if timestamp is not None:
             timestamp = _rfc3339_nanos_to_datetime(timestamp)
+        received = resource.get("receiveTimestamp")
+        if received is not None:
+            received = _rfc3339_nanos_to_datetime(received)
+        return cls._from_api_repr(resource, client, loggers, timestamp, received)
+
+    @classmethod
+    def _from_api_repr(cls, resource, client, loggers, timestamp, received):
+        """Construct an entry from its API representation and decoded timestamps.
+
+        Helper for :meth:`from_api_repr`, also used when the timestamps of a
+        page of entries are decoded together.
+        """
+        logger_fullname = resource["logName"]
+        logger = _logger_for_entry(logger_fullname, client, loggers)
+        payload = cls._extract_payload(resource)
+        insert_id = resource.get("insertId")
         labels = resource.get("labels")
         severity = resource.get("severity")
         http_request = resource.get("httpRequest")
@@ -212,9 +262,8 @@ class LogEntry(_LogEntryTuple):
             logger=logger,
             payload=payload,
         )
-        received = resource.get("receiveTimestamp")
         if received is not None:
-            inst.received_timestamp = _rfc3339_nanos_to_datetime(received)
+            inst.received_timestamp = received
         return inst
 
     def to_api_repr(self):
@@ -338,6 +387,7 @@ class ProtobufEntry(LogEntry):
         info = super(ProtobufEntry, self).to_api_repr()
         proto_payload = None
         if self.payload_pb:
+            _register_proto_types()
             proto_payload = MessageToDict(self.payload)
         elif self.payload_json:
             proto_payload = dict(self.payload)
@@ -355,4 +405,5 @@ class ProtobufEntry(LogEntry):
         # NOTE: This assumes that ``payload`` is already a deserialized
         #       ``Any`` field and ``message`` has come from an imported
         #       ``pb2`` module with the relevant protobuf message type.
+        _register_proto_types()
         Parse(json.dumps(self.payload), message)
@@ -0,0 +1,414 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local SQLite cache for repeated log entry queries.
+
+An :class:`EntryCache` stores the entries it fetches in a SQLite database,
+indexed by timestamp, severity, log name and trace, and remembers which time
+ranges it holds all the entries matching a filter for. Repeating a query
+only fetches the parts of its time range that are not covered yet; the
+entries are then read back from the database and matched against the filter
+locally, with :func:`~logging_v2.filters.compile_filter`.
+"""
+
+import datetime
+import hashlib
+import json
+import sqlite3
+import threading
+
+from google.cloud.logging_v2._export import _dumps
+from google.cloud.logging_v2._helpers import entries_from_resources
+from google.cloud.logging_v2._parallel_list import _as_utc
+from google.cloud.logging_v2._parallel_list import _DEFAULT_DURATION
+from google.cloud.logging_v2._parallel_list import _window_filter
+from google.cloud.logging_v2._timestamps import _page_nanos
+from google.cloud.logging_v2.entry_frame import _datetime_to_nanos
+from google.cloud.logging_v2.entry_frame import _EPOCH
+from google.cloud.logging_v2.entry_frame import _severity_code
+from google.cloud.logging_v2.filters import _ORDERINGS
+from google.cloud.logging_v2.filters import _Parser
+from google.cloud.logging_v2.filters import _severity_rank
+from google.cloud.logging_v2.filters import _simplify
+from google.cloud.logging_v2.filters import compile_filter
+
+_DEFAULT_PAGE_SIZE = 1000
+_DEFAULT_SETTLE_TIME = datetime.timedelta(minutes=5)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    scope TEXT NOT NULL,
+    insert_id TEXT NOT NULL,
+    log_name TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    severity INTEGER NOT NULL,
+    trace TEXT,
+    resource TEXT NOT NULL,
+    PRIMARY KEY (scope, insert_id, log_name, timestamp)
+);
+CREATE INDEX IF NOT EXISTS entries_by_timestamp
+    ON entries (scope, timestamp);
+CREATE INDEX IF NOT EXISTS entries_by_severity
+    ON entries (scope, severity, timestamp);
+CREATE INDEX IF NOT EXISTS entries_by_log_name
+    ON entries (scope, log_name, timestamp);
+CREATE INDEX IF NOT EXISTS entries_by_trace
+    ON entries (scope, trace);
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT NOT NULL,
+    filter TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_by_query
+    ON coverage (scope, filter);
+"""
+"""Entry timestamps and coverage bounds are nanoseconds since the epoch.
+Severities are positions in :data:`~logging_v2.entry_frame.SEVERITY_NAMES`."""
+
+_COLUMNS = {"logName": "log_name", "trace": "trace"}
+"""Indexed entry fields an equality restriction can be looked up by."""
+
+
+def _merge(intervals):
+    """Merge overlapping and adjacent ``(start, end)`` intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _missing(start, end, covered):
+    """Return the parts of ``[start, end)`` outside the merged ``covered``."""
+    missing = []
+    for covered_start, covered_end in covered:
+        if covered_end <= start:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start))
+        start = max(start, covered_end)
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+
+def _nanos_to_datetime(nanos):
+    return _EPOCH + datetime.timedelta(microseconds=nanos // 1000)
+
+
+def _restriction(node):
+    """Return SQL for a restriction the indexes can narrow, or None."""
+    kind = node[0]
+    if kind == "compare":
+        _, path, operator, literal, position = node
+        if path == ["severity"] and operator in _ORDERINGS:
+            return f"severity {operator} ?", [_severity_rank(literal, position)]
+        if len(path) == 1 and path[0] in _COLUMNS and operator == "=":
+            return f"{_COLUMNS[path[0]]} = ?", [literal]
+    elif kind == "in":
+        _, path, literals, position = node
+        if path == ["severity"]:
+            params = [_severity_rank(literal, position) for literal in literals]
+            column = "severity"
+        elif len(path) == 1 and path[0] in _COLUMNS:
+            params = list(literals)
+            column = _COLUMNS[path[0]]
+        else:
+            return None
+        placeholders = ", ".join("?" * len(params))
+        return f"{column} IN ({placeholders})", params
+    return None
+
+
+def _sql_restrictions(filter_):
+    """Translate the top-level restrictions of a filter on indexed fields.
+
+    The conditions returned select a superset of the entries matching the
+    filter; the filter itself is still evaluated on each entry.
+
+    Returns:
+        Tuple[List[str], list]: SQL conditions and their parameters.
+    """
+    node = _simplify(_Parser(filter_ or "").parse())
+    terms = node[1] if node[0] == "and" else [node]
+    conditions = []
+    params = []
+    for term in terms:
+        restriction = _restriction(term)
+        if restriction is not None:
+            conditions.append(restriction[0])
+            params.extend(restriction[1])
+    return conditions, params
+
+
+def _entry_key(resource):
+    """Return the key identifying an entry within its log and timestamp.
+
+    The insert ID, or for entries without one a hash of their content, so
+    that distinct entries never replace each other while an entry fetched
+    twice is still stored once.
+    """
+    insert_id = resource.get("insertId")
+    if insert_id:
+        return insert_id
+    content = json.dumps(resource, sort_keys=True, separators=(",", ":"), default=str)
+    # insert IDs never start with a NUL character
+    return "\0" + hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class EntryCache(object):
+    """Cache the entries of a client's queries in a local SQLite database.
+
+    .. code-block:: python
+
+        with EntryCache(client, "incident.db") as cache:
+            errors = list(cache.list_entries(
+                filter_="severity>=ERROR", start_time=start, end_time=end,
+            ))
+
+    Queries are keyed by their resource names and filter, and the database
+    records the time ranges fetched for each. A query over a range fetched
+    without a filter is answered locally whatever its filter. As entries can
+    arrive a few minutes late, the most recent ``settle_time`` of a range is
+    fetched again by later queries.
+
+    Results answered locally follow the simplifications of
+    :func:`~logging_v2.filters.compile_filter`, so filters must be supported
+    by it.
+
+    Attributes:
+        fetched (int): The number of entries downloaded.
+        queries (int): The number of time ranges queried from the API.
+    """
+
+    def __init__(self, client, path=":memory:", *, settle_time=_DEFAULT_SETTLE_TIME):
+        """
+        Args:
+            client (~logging_v2.client.Client): The client used to fetch
+                entries missing from the cache.
+            path (str): The database file, created if needed. Defaults to a
+                database held in memory for the lifetime of the cache.
+            settle_time (datetime.timedelta): How far behind the current time
+                a fetched range is considered complete.
+        """
+        self._client = client
+        self._settle_time = settle_time
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self.fetched = 0
+        self.queries = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def clear(self):
+        """Remove all the entries and coverage records."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute("DELETE FROM coverage")
+
+    def list_entries(
+        self,
+        *,
+        resource_names=None,
+        filter_=None,
+        start_time=None,
+        end_time=None,
+        order_by=None,
+        max_results=None,
+        page_size=_DEFAULT_PAGE_SIZE,
+    ):
+        """Return the entries matching a query, fetching uncovered ranges.
+
+        The parts of the time range not covered yet are fetched before this
+        method returns; the entries are then read from the database.
+
+        Args:
+            resource_names (Sequence[str]): Names of one or more parent resources
+                from which to retrieve log entries. If not passed, defaults to
+                the project bound to the client.
+            filter_ (str): a filter expression, without timestamp restrictions.
+                See https://cloud.google.com/logging/docs/view/advanced_filters
+            start_time (Optional[datetime.datetime]): The start of the queried
+                time range. Defaults to 24 hours before ``end_time``. Naive
+                datetimes are taken to be UTC.
+            end_time (Optional[datetime.datetime]): The (exclusive) end of the
+                queried time range. Defaults to now.
+            order_by (str) One of :data:`~logging_v2.ASCENDING`
+                or :data:`~logging_v2.DESCENDING`.
+            max_results (Optional[int]): The maximum number of entries to return.
+            page_size (int): number of entries to fetch in each API call, and
+                to read from the database at a time.
+
+        Returns:
+            Generator[~logging_v2.LogEntry]
+
+        Raises:
+            ~logging_v2.filters.FilterSyntaxError: If the filter cannot be
+                evaluated locally.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self._client.project}"]
+        filter_ = filter_ or ""
+        matches = compile_filter(filter_)
+        conditions, params = _sql_restrictions(filter_)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        end_time = now if end_time is None else _as_utc(end_time)
+        if start_time is None:
+            start_time = end_time - _DEFAULT_DURATION
+        start = _datetime_to_nanos(_as_utc(start_time))
+        end = _datetime_to_nanos(end_time)
+        settled = _datetime_to_nanos(now - self._settle_time)
+        scope = "\n".join(sorted(resource_names))
+
+        for missing_start, missing_end in _missing(
+            start, end, self._coverage(scope, filter_)
+        ):
+            self._fetch(
+                resource_names, scope, filter_, missing_start, missing_end, page_size
+            )
+            if min(missing_end, settled) > missing_start:
+                self._add_coverage(
+                    scope, filter_, missing_start, min(missing_end, settled)
+                )
+
+        descending = order_by is not None and order_by.lower().endswith("desc")
+        direction = "DESC" if descending else "ASC"
+        query = (
+            "SELECT resource FROM entries"
+            " WHERE scope = ? AND timestamp >= ? AND timestamp < ?"
+            + "".join(f" AND {condition}" for condition in conditions)
+            + f" ORDER BY timestamp {direction}, insert_id {direction}"
+        )
+        return self._read(
+            query, [scope, start, end] + params, matches, max_results, page_size
+        )
+
+    def covered_ranges(self, *, resource_names=None, filter_=None):
+        """Return the time ranges a query is answered locally for.
+
+        Args:
+            resource_names (Sequence[str]): Names of the parent resources of
+                the query. If not passed, defaults to the project bound to
+                the client.
+            filter_ (str): The filter expression of the query.
+
+        Returns:
+            List[Tuple[datetime.datetime, datetime.datetime]]: The start and
+            (exclusive) end of each range, in ascending order.
+        """
+        if resource_names is None:
+            resource_names = [f"projects/{self._client.project}"]
+        scope = "\n".join(sorted(resource_names))
+        return [
+            (_nanos_to_datetime(start), _nanos_to_datetime(end))
+            for start, end in self._coverage(scope, filter_ or "")
+        ]
+
+    def _coverage(self, scope, filter_):
+        """Return the merged ranges covered for a filter or without one."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT start_time, end_time FROM coverage"
+                " WHERE scope = ? AND filter IN (?, '')",
+                (scope, filter_),
+            ).fetchall()
+        return _merge(rows)
+
+    def _add_coverage(self, scope, filter_, start, end):
+        with self._lock, self._connection:
+            rows = self._connection.execute(
+                "SELECT start_time, end_time FROM coverage"
+                " WHERE scope = ? AND filter = ?",
+                (scope, filter_),
+            ).fetchall()
+            self._connection.execute(
+                "DELETE FROM coverage WHERE scope = ? AND filter = ?", (scope, filter_)
+            )
+            self._connection.executemany(
+                "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+                [
+                    (scope, filter_, merged_start, merged_end)
+                    for merged_start, merged_end in _merge(rows + [(start, end)])
+                ],
+            )
+
+    def _fetch(self, resource_names, scope, filter_, start, end, page_size):
+        """Download and store the entries of one time range."""
+        window_filter = _window_filter(
+            filter_ or None, _nanos_to_datetime(start), _nanos_to_datetime(end)
+        )
+        self.queries += 1
+        for resources, _ in self._client.logging_api._list_entry_pages(
+            resource_names,
+            filter_=window_filter,
+            order_by="timestamp asc",
+            page_size=page_size,
+        ):
+            self._store(scope, resources)
+            self.fetched += len(resources)
+
+    def _store(self, scope, resources):
+        timestamps = _page_nanos([resource.get("timestamp") for resource in resources])
+        rows = [
+            (
+                scope,
+                _entry_key(resource),
+                resource.get("logName", ""),
+                timestamp,
+                _severity_code(resource.get("severity")),
+                resource.get("trace"),
+                _dumps(resource),
+            )
+            for resource, timestamp in zip(resources, timestamps)
+            if timestamp is not None
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _read(self, query, params, matches, max_results, page_size):
+        """Yield the entries selected by ``query`` that match the filter."""
+        loggers = self._client._entry_loggers
+        with self._lock:
+            cursor = self._connection.execute(query, params)
+        remaining = max_results
+        while remaining is None or remaining > 0:
+            with self._lock:
+                rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+            resources = [json.loads(resource) for resource, in rows]
+            resources = [resource for resource in resources if matches(resource)]
+            if remaining is not None:
+                resources = resources[:remaining]
+                remaining -= len(resources)
+            yield from entries_from_resources(resources, self._client, loggers)
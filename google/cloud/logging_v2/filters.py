@@ -0,0 +1,767 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Evaluate Logging query language filters locally.
+
+:func:`compile_filter` parses a filter in the syntax documented at
+https://cloud.google.com/logging/docs/view/logging-query-language and returns
+a predicate over :class:`~logging_v2.entries.LogEntry` objects or entry
+resources in their API representation.
+
+Literals are converted once, when the filter is compiled: timestamps to
+datetimes, numbers to floats, regular expressions to compiled patterns, and
+severity restrictions to the set of severity values they accept. Equality
+tests against several literals of one field are folded into a single set
+lookup, and constant subexpressions are folded away.
+
+Local evaluation follows the server closely, with these simplifications:
+
+* ``=`` compares strings case-sensitively, while ``:`` and global
+  restrictions match substrings case-insensitively.
+* ``!=`` and ``!~`` are the negations of ``=`` and ``=~``, so they also match
+  entries missing the field.
+* Regular expressions use Python's :mod:`re` module rather than RE2.
+* Timestamps are compared with microsecond precision.
+* ``log_id()`` is the only function supported.
+"""
+
+import datetime
+import functools
+import re
+import urllib.parse
+
+from google.cloud._helpers import _rfc3339_nanos_to_datetime
+
+from google.cloud.logging_v2.entries import LogEntry
+from google.cloud.logging_v2.entries import ProtobufEntry
+from google.cloud.logging_v2.entries import StructEntry
+from google.cloud.logging_v2.entries import TextEntry
+from google.cloud.logging_v2.entry_frame import _severity_code
+from google.cloud.logging_v2.entry_frame import SEVERITY_NAMES
+from google.cloud.logging_v2.resource import Resource
+
+
+class FilterSyntaxError(ValueError):
+    """Raised when a filter cannot be parsed or compiled.
+
+    Attributes:
+        position (int): Offset of the error in the filter string.
+    """
+
+    def __init__(self, message, position):
+        super(FilterSyntaxError, self).__init__(f"{message} at position {position}")
+        self.position = position
+
+
+_MISSING = object()
+
+# Token kinds
+_WORD = "WORD"
+_STRING = "STRING"
+_OP = "OP"
+_LPAREN = "("
+_RPAREN = ")"
+_MINUS = "-"
+_END = "END"
+
+_OPERATORS = ("=~", "!~", "!=", "<=", ">=", "=", "<", ">", ":")
+_WORD_DELIMITERS = frozenset(' \t\r\n()"=<>!:~')
+_STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+_FIELD_ALIASES = {
+    "log_name": "logName",
+    "insert_id": "insertId",
+    "receive_timestamp": "receiveTimestamp",
+    "http_request": "httpRequest",
+    "span_id": "spanId",
+    "trace_sampled": "traceSampled",
+    "source_location": "sourceLocation",
+    "text_payload": "textPayload",
+    "json_payload": "jsonPayload",
+    "proto_payload": "protoPayload",
+}
+
+# Entry attributes holding the top-level fields of the API representation.
+_ENTRY_ATTRIBUTES = {
+    "logName": "log_name",
+    "insertId": "insert_id",
+    "severity": "severity",
+    "timestamp": "timestamp",
+    "receiveTimestamp": "received_timestamp",
+    "labels": "labels",
+    "resource": "resource",
+    "httpRequest": "http_request",
+    "trace": "trace",
+    "spanId": "span_id",
+    "traceSampled": "trace_sampled",
+    "sourceLocation": "source_location",
+    "operation": "operation",
+}
+
+_PAYLOAD_CLASSES = {
+    "textPayload": TextEntry,
+    "jsonPayload": StructEntry,
+    "protoPayload": ProtobufEntry,
+}
+
+_TIMESTAMP_FIELDS = frozenset(["timestamp", "receiveTimestamp"])
+
+_NEGATED_OPERATORS = {"!=": "=", "!~": "=~"}
+
+
+class _Token(object):
+    __slots__ = ("kind", "value", "position", "path")
+
+    def __init__(self, kind, value, position, path=None):
+        self.kind = kind
+        self.value = value
+        self.position = position
+        # The segments of a dotted field path, for words.
+        self.path = path
+
+
+def _read_string(text, position):
+    """Read a double-quoted string starting at ``position``.
+
+    Returns:
+        Tuple[str, int]: The unescaped string and the offset following it.
+    """
+    chars = []
+    index = position + 1
+    while index < len(text):
+        char = text[index]
+        if char == '"':
+            return "".join(chars), index + 1
+        if char == "\\" and index + 1 < len(text):
+            index += 1
+            char = _STRING_ESCAPES.get(text[index], text[index])
+        chars.append(char)
+        index += 1
+    raise FilterSyntaxError("Unterminated string", position)
+
+
+def _read_word(text, position):
+    """Read a bare word, which may be a path with quoted segments.
+
+    Returns:
+        Tuple[str, List[str], int]: The word as written, its path segments
+            and the offset following it.
+    """
+    segments = []
+    segment = []
+    index = position
+    while index < len(text):
+        char = text[index]
+        if char == '"' and index > position and text[index - 1] == ".":
+            # a quoted path segment, as in labels."compute.googleapis.com/x"
+            value, index = _read_string(text, index)
+            segment.append(value)
+            continue
+        if char in _WORD_DELIMITERS:
+            break
+        if char == ".":
+            segments.append("".join(segment))
+            segment = []
+        else:
+            segment.append(char)
+        index += 1
+    segments.append("".join(segment))
+    return text[position:index], segments, index
+
+
+def _tokenize(text):
+    """Split a filter into tokens."""
+    tokens = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char.isspace():
+            index += 1
+            continue
+        if char in "()":
+            tokens.append(_Token(char, char, index))
+            index += 1
+            continue
+        if char == '"':
+            value, end = _read_string(text, index)
+            tokens.append(_Token(_STRING, value, index))
+            index = end
+            continue
+        operator = next((op for op in _OPERATORS if text.startswith(op, index)), None)
+        if operator is not None:
+            tokens.append(_Token(_OP, operator, index))
+            index += len(operator)
+            continue
+        if char == "!":
+            raise FilterSyntaxError("Unexpected '!'", index)
+        if (
+            char == "-"
+            and index + 1 < len(text)
+            and not text[index + 1].isspace()
+            and not (tokens and tokens[-1].kind == _OP)
+        ):
+            # negation, as in -severity=DEBUG; a value such as -5 follows
+            # an operator instead
+            tokens.append(_Token(_MINUS, char, index))
+            index += 1
+            continue
+        word, path, end = _read_word(text, index)
+        tokens.append(_Token(_WORD, word, index, path))
+        index = end
+    tokens.append(_Token(_END, None, len(text)))
+    return tokens
+
+
+# Syntax tree nodes are tuples:
+#   ("and", [nodes]), ("or", [nodes]), ("not", node)
+#   ("compare", path, operator, literal, position)
+#   ("search", literal)
+#   ("log_id", literal)
+#   ("in", path, literals)   -- produced by folding
+#   ("const", bool)
+
+
+class _Parser(object):
+    """Recursive descent parser for the Logging query language.
+
+    Unlike most languages, ``OR`` binds more tightly than ``AND``, so
+    ``a OR b AND c`` means ``(a OR b) AND c``.
+    """
+
+    def __init__(self, text):
+        self._tokens = _tokenize(text)
+        self._index = 0
+
+    def _peek(self):
+        return self._tokens[self._index]
+
+    def _next(self):
+        token = self._tokens[self._index]
+        self._index += 1
+        return token
+
+    def _is_keyword(self, token, keyword):
+        return token.kind == _WORD and token.value == keyword
+
+    def _expect(self, kind):
+        token = self._next()
+        if token.kind != kind:
+            raise FilterSyntaxError(f"Expected {kind!r}", token.position)
+        return token
+
+    def parse(self):
+        if self._peek().kind == _END:
+            return ("const", True)
+        node = self._conjunction(self._term)
+        token = self._peek()
+        if token.kind != _END:
+            raise FilterSyntaxError("Unexpected ')'", token.position)
+        return node
+
+    def _starts_term(self, token):
+        return token.kind in (_WORD, _STRING, _LPAREN, _MINUS) and not (
+            self._is_keyword(token, "AND") or self._is_keyword(token, "OR")
+        )
+
+    def _conjunction(self, term):
+        nodes = [self._disjunction(term)]
+        while True:
+            token = self._peek()
+            if self._is_keyword(token, "AND"):
+                self._next()
+            elif not self._starts_term(token):
+                break
+            # juxtaposed terms are implicitly joined by AND
+            nodes.append(self._disjunction(term))
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _disjunction(self, term):
+        nodes = [self._unary(term)]
+        while self._is_keyword(self._peek(), "OR"):
+            self._next()
+            nodes.append(self._unary(term))
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _unary(self, term):
+        token = self._peek()
+        if self._is_keyword(token, "NOT") or token.kind == _MINUS:
+            self._next()
+            return ("not", self._unary(term))
+        if token.kind == _LPAREN:
+            self._next()
+            node = self._conjunction(term)
+            self._expect(_RPAREN)
+            return node
+        return term()
+
+    def _literal(self):
+        token = self._next()
+        if token.kind not in (_WORD, _STRING):
+            raise FilterSyntaxError("Expected a value", token.position)
+        return token.value
+
+    def _term(self):
+        token = self._next()
+        if token.kind not in (_WORD, _STRING):
+            raise FilterSyntaxError("Expected a restriction", token.position)
+        following = self._peek()
+        if token.kind == _WORD and following.kind == _OP:
+            self._next()
+            return self._comparison(token, following)
+        if (
+            token.kind == _WORD
+            and following.kind == _LPAREN
+            and following.position == token.position + len(token.value)
+        ):
+            return self._function(token)
+        return ("search", token.value)
+
+    def _comparison(self, field, operator):
+        path = list(field.path)
+        if not all(path):
+            raise FilterSyntaxError("Invalid field path", field.position)
+        path[0] = _FIELD_ALIASES.get(path[0], path[0])
+        if self._peek().kind == _LPAREN:
+            # a value expression, as in severity=(ERROR OR CRITICAL)
+            self._next()
+            node = self._conjunction(
+                lambda: (
+                    "compare",
+                    path,
+                    operator.value,
+                    self._literal(),
+                    operator.position,
+                )
+            )
+            self._expect(_RPAREN)
+            return node
+        return ("compare", path, operator.value, self._literal(), operator.position)
+
+    def _function(self, name):
+        self._expect(_LPAREN)
+        if name.value != "log_id":
+            raise FilterSyntaxError(
+                f"Unsupported function {name.value!r}", name.position
+            )
+        node = ("log_id", self._literal())
+        self._expect(_RPAREN)
+        return node
+
+
+def _simplify(node):
+    """Flatten nested boolean operators, fold constants and equality sets."""
+    kind = node[0]
+    if kind == "not":
+        operand = _simplify(node[1])
+        if operand[0] == "not":
+            return operand[1]
+        if operand[0] == "const":
+            return ("const", not operand[1])
+        return ("not", operand)
+    if kind not in ("and", "or"):
+        return node
+
+    operands = []
+    for child in node[1]:
+        child = _simplify(child)
+        if child[0] == kind:
+            operands.extend(child[1])
+        else:
+            operands.append(child)
+
+    # an AND containing false, or an OR containing true, is constant
+    absorbing = kind == "or"
+    if any(child == ("const", absorbing) for child in operands):
+        return ("const", absorbing)
+    operands = [child for child in operands if child[0] != "const"]
+
+    if kind == "or":
+        operands = _fold_equalities(operands)
+    if not operands:
+        return ("const", not absorbing)
+    if len(operands) == 1:
+        return operands[0]
+    return (kind, operands)
+
+
+def _fold_equalities(operands):
+    """Merge the equality tests of each field into an ``in`` node."""
+    literals = {}
+    for child in operands:
+        if child[0] == "compare" and child[2] == "=":
+            literals.setdefault(tuple(child[1]), []).append(child[3])
+
+    folded = []
+    for child in operands:
+        if child[0] != "compare" or child[2] != "=":
+            folded.append(child)
+            continue
+        key = tuple(child[1])
+        if key not in literals:
+            # folded into the test of the field appended earlier
+            continue
+        if len(literals[key]) == 1:
+            folded.append(child)
+        else:
+            folded.append(("in", child[1], literals.pop(key), child[4]))
+    return folded
+
+
+def _walk(value, segments):
+    """Follow ``segments`` through nested mappings and objects."""
+    for segment in segments:
+        if value is None or value is _MISSING:
+            return _MISSING
+        if isinstance(value, dict):
+            value = value.get(segment, _MISSING)
+        elif isinstance(value, Resource):
+            value = getattr(value, segment, _MISSING)
+        else:
+            return _MISSING
+    return _MISSING if value is None else value
+
+
+def _make_getter(path):
+    """Build a function reading the field at ``path`` of an entry."""
+    head, rest = path[0], path[1:]
+    attribute = _ENTRY_ATTRIBUTES.get(head)
+    payload_class = _PAYLOAD_CLASSES.get(head)
+
+    def get(entry):
+        if isinstance(entry, dict):
+            value = entry.get(head)
+            for segment in rest:
+                if not isinstance(value, dict):
+                    return _MISSING
+                value = value.get(segment)
+            return _MISSING if value is None else value
+        if attribute is not None:
+            value = getattr(entry, attribute, _MISSING)
+        elif payload_class is not None and isinstance(entry, payload_class):
+            value = entry.payload
+        else:
+            return _MISSING
+        if rest:
+            return _walk(value, rest)
+        return _MISSING if value is None else value
+
+    return get
+
+
+def _parse_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(literal):
+    """Parse an RFC3339 timestamp or a date to an aware datetime, or None."""
+    value = literal.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    # datetime supports at most microseconds
+    value = re.sub(r"(\.\d{6})\d+", r"\1", value)
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _entry_timestamp(value):
+    if isinstance(value, str):
+        try:
+            return _rfc3339_nanos_to_datetime(value)
+        except ValueError:
+            return None
+    return value
+
+
+_ORDERINGS = {
+    "=": lambda left, right: left == right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+}
+
+
+def _severity_rank(literal, position):
+    """Return the position of a severity literal in ``SEVERITY_NAMES``."""
+    rank = _severity_code(int(literal) if literal.isdigit() else literal)
+    if rank == 0 and literal.upper() not in ("DEFAULT", "0"):
+        raise FilterSyntaxError(f"Unknown severity {literal!r}", position)
+    return rank
+
+
+def _compile_severity(operator, literals, position):
+    """Build a severity test from the set of severity values it accepts."""
+    ranks = [_severity_rank(literal, position) for literal in literals]
+    if operator == "in":
+        accepted = frozenset(ranks)
+    else:
+        compare = _ORDERINGS[operator]
+        (bound,) = ranks
+        accepted = {rank for rank in range(len(SEVERITY_NAMES)) if compare(rank, bound)}
+
+    matching = set()
+    for rank, name in enumerate(SEVERITY_NAMES):
+        if rank in accepted:
+            matching.update((name, name.lower(), rank * 100))
+            if rank == 0:
+                # entries without a severity have the DEFAULT severity
+                matching.add(_MISSING)
+    matching = frozenset(matching)
+    return matching.__contains__
+
+
+def _compile_timestamp(operator, literal, position):
+    bound = _parse_timestamp(literal)
+    if bound is None:
+        raise FilterSyntaxError(f"Invalid timestamp {literal!r}", position)
+    compare = _ORDERINGS[operator]
+
+    def test(value):
+        if value is _MISSING:
+            return False
+        value = _entry_timestamp(value)
+        if value is None:
+            return False
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return compare(value, bound)
+
+    return test
+
+
+def _any_value(test):
+    """Apply ``test`` to a value, or to each element of a repeated value."""
+
+    def any_value(value):
+        if isinstance(value, (list, tuple)):
+            return any(test(element) for element in value)
+        return test(value)
+
+    return any_value
+
+
+def _compile_value_test(operator, literal):
+    """Build the test of a plain field value against a literal."""
+    number = _parse_number(literal)
+    boolean = {"true": True, "false": False}.get(literal.lower())
+    compare = _ORDERINGS[operator]
+
+    if operator == "=" and number is None and boolean is None:
+        # only strings can equal the literal
+        def equals(value):
+            if isinstance(value, str):
+                return value == literal
+            return isinstance(value, (list, tuple)) and literal in value
+
+        return equals
+
+    def test(value):
+        if isinstance(value, bool):
+            return boolean is not None and compare(value, boolean)
+        if isinstance(value, (int, float)):
+            return number is not None and compare(value, number)
+        if isinstance(value, str):
+            if number is not None:
+                # 64-bit integers are strings in the API representation
+                value_number = _parse_number(value)
+                if value_number is not None:
+                    return compare(value_number, number)
+            return compare(value, literal)
+        return False
+
+    return _any_value(test)
+
+
+def _leaf_strings(value):
+    """Yield the scalar values nested in ``value`` as strings."""
+    if isinstance(value, dict):
+        for nested in value.values():
+            yield from _leaf_strings(nested)
+    elif isinstance(value, (list, tuple)):
+        for nested in value:
+            yield from _leaf_strings(nested)
+    elif value is not None and value is not _MISSING:
+        if isinstance(value, bool):
+            yield "true" if value else "false"
+        elif isinstance(value, datetime.datetime):
+            yield value.isoformat()
+        else:
+            yield str(value)
+
+
+def _compile_regex(literal, position):
+    try:
+        search = re.compile(literal).search
+    except re.error as exc:
+        raise FilterSyntaxError(f"Invalid regular expression: {exc.msg}", position)
+    return lambda value: any(search(text) is not None for text in _leaf_strings(value))
+
+
+def _compile_has(literal):
+    if literal == "*":
+        return lambda value: value is not _MISSING
+    needle = literal.lower()
+
+    def has(value):
+        if isinstance(value, str):
+            return needle in value.lower()
+        return any(needle in text.lower() for text in _leaf_strings(value))
+
+    return has
+
+
+def _compile_comparison(path, operator, literal, position):
+    if operator in _NEGATED_OPERATORS:
+        test = _compile_comparison(
+            path, _NEGATED_OPERATORS[operator], literal, position
+        )
+        return lambda entry: not test(entry)
+
+    get = _make_getter(path)
+    if path == ["severity"] and operator in _ORDERINGS:
+        test = _compile_severity(operator, [literal], position)
+        return lambda entry: test(get(entry))
+    if operator == ":":
+        test = _compile_has(literal)
+    elif operator == "=~":
+        test = _compile_regex(literal, position)
+    elif len(path) == 1 and path[0] in _TIMESTAMP_FIELDS:
+        test = _compile_timestamp(operator, literal, position)
+    else:
+        test = _compile_value_test(operator, literal)
+
+    def compare(entry):
+        value = get(entry)
+        return value is not _MISSING and test(value)
+
+    return compare
+
+
+def _compile_in(path, literals, position):
+    get = _make_getter(path)
+    if path == ["severity"]:
+        in_ranks = _compile_severity("in", literals, position)
+        return lambda entry: in_ranks(get(entry))
+    if (len(path) == 1 and path[0] in _TIMESTAMP_FIELDS) or any(
+        _parse_number(literal) is not None or literal.lower() in ("true", "false")
+        for literal in literals
+    ):
+        tests = [
+            _compile_comparison(path, "=", literal, position) for literal in literals
+        ]
+        return lambda entry: any(test(entry) for test in tests)
+
+    members = frozenset(literals)
+
+    def is_member(value):
+        if isinstance(value, (list, tuple)):
+            return any(
+                element in members for element in value if isinstance(element, str)
+            )
+        return isinstance(value, str) and value in members
+
+    return lambda entry: is_member(get(entry))
+
+
+def _compile_log_id(literal):
+    suffix = "/logs/" + urllib.parse.quote(literal, safe="")
+    get = _make_getter(["logName"])
+
+    def test(entry):
+        log_name = get(entry)
+        return isinstance(log_name, str) and log_name.endswith(suffix)
+
+    return test
+
+
+def _entry_fields(entry):
+    if isinstance(entry, dict):
+        return entry
+    if isinstance(entry, LogEntry):
+        return entry.to_api_repr()
+    return {}
+
+
+def _compile_search(literal):
+    needle = literal.lower()
+    return lambda entry: any(
+        needle in text.lower() for text in _leaf_strings(_entry_fields(entry))
+    )
+
+
+def _compile(node):
+    kind = node[0]
+    if kind == "const":
+        value = node[1]
+        return lambda entry: value
+    if kind == "not":
+        operand = _compile(node[1])
+        return lambda entry: not operand(entry)
+    if kind in ("and", "or"):
+        operands = [_compile(child) for child in node[1]]
+        if len(operands) == 2:
+            first, second = operands
+            if kind == "and":
+                return lambda entry: first(entry) and second(entry)
+            return lambda entry: first(entry) or second(entry)
+        if kind == "and":
+            return lambda entry: all(operand(entry) for operand in operands)
+        return lambda entry: any(operand(entry) for operand in operands)
+    if kind == "compare":
+        return _compile_comparison(*node[1:])
+    if kind == "in":
+        return _compile_in(*node[1:])
+    if kind == "log_id":
+        return _compile_log_id(node[1])
+    return _compile_search(node[1])
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(filter_):
+    """Compile a Logging query language filter into a predicate.
+
+    The predicate accepts :class:`~logging_v2.entries.LogEntry` objects,
+    including the lazily-decoded entries returned by
+    :meth:`~logging_v2.client.Client.list_entries`, and entry resources in
+    their API representation (``dict``), and returns whether the entry
+    matches the filter:
+
+    .. code-block:: python
+
+        matches = compile_filter('severity>=ERROR AND resource.type="gce_instance"')
+        errors = [entry for entry in entries if matches(entry)]
+
+    Compiled filters are cached, so compiling the same filter again is cheap.
+
+    Args:
+        filter_ (Optional[str]): A filter expression. See
+            https://cloud.google.com/logging/docs/view/logging-query-language
+            An empty filter matches all entries.
+
+    Returns:
+        Callable[[Union[~logging_v2.entries.LogEntry, dict]], bool]: The predicate.
+
+    Raises:
+        FilterSyntaxError: If the filter is invalid or uses an unsupported
+            function.
+    """
+    return _compile(_simplify(_Parser(filter_ or "").parse()))
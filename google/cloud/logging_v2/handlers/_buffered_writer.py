@@ -0,0 +1,197 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Buffered writer used by handlers that write formatted lines to a stream.
+
+Lines are appended to an in-memory buffer and written by a background thread
+in batches, so each batch costs a single ``write()``.
+"""
+
+import atexit
+import collections
+import sys
+import threading
+import traceback
+
+try:
+    from select import PIPE_BUF
+except ImportError:  # pragma: NO COVER
+    PIPE_BUF = 512
+
+_DEFAULT_GRACE_PERIOD = 5.0  # Seconds
+_DEFAULT_MAX_LATENCY = 0.1  # Seconds
+_DEFAULT_BATCH_SIZE = 100
+_DEFAULT_MAX_BUFFER_SIZE = 10000
+_WRITER_THREAD_NAME = "google.cloud.logging.BufferedWriter"
+
+
+def _encoded_length(line):
+    """Return the number of bytes ``line`` takes up once UTF-8 encoded."""
+    return len(line) if line.isascii() else len(line.encode("utf-8"))
+
+
+class _BufferedWriter(object):
+    """A background thread that writes batches of formatted log lines."""
+
+    def __init__(
+        self,
+        stream,
+        *,
+        grace_period=_DEFAULT_GRACE_PERIOD,
+        max_latency=_DEFAULT_MAX_LATENCY,
+        batch_size=_DEFAULT_BATCH_SIZE,
+        max_buffer_size=_DEFAULT_MAX_BUFFER_SIZE,
+        max_write_size=PIPE_BUF,
+    ):
+        """
+        Args:
+            stream (IO): The stream to write lines to. Must implement
+                ``write`` and ``flush``.
+            grace_period (Optional[float]): The amount of time to wait for pending
+                lines to be written when the process is shutting down.
+            max_latency (Optional[float]): The longest amount of time a line is held
+                in the buffer before it is written.
+            batch_size (Optional[int]): The number of buffered lines that triggers
+                a write before ``max_latency`` expires.
+            max_buffer_size (Optional[int]): The maximum number of buffered lines.
+                When the buffer is full, the calling thread writes it out itself.
+            max_write_size (Optional[int]): The maximum number of bytes passed to a
+                single ``write()``. Defaults to ``PIPE_BUF``, so each write to a
+                pipe is atomic. Lines are never split: a line larger than this
+                is written on its own.
+        """
+        self._stream = stream
+        self._grace_period = grace_period
+        self._max_latency = max_latency
+        self._batch_size = batch_size
+        self._max_buffer_size = max_buffer_size
+        self._max_write_size = max_write_size
+        self._buffer = collections.deque()
+        self._wakeup = threading.Event()
+        self._write_lock = threading.Lock()
+        self._operational_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def is_alive(self):
+        """Returns True is the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _batches(self):
+        """Pop all buffered lines, grouped into batches of ``max_write_size`` bytes."""
+        batch = []
+        batch_bytes = 0
+        while True:
+            try:
+                line = self._buffer.popleft()
+            except IndexError:
+                break
+            line_bytes = _encoded_length(line)
+            if batch and batch_bytes + line_bytes > self._max_write_size:
+                yield "".join(batch)
+                batch = []
+                batch_bytes = 0
+            batch.append(line)
+            batch_bytes += line_bytes
+        if batch:
+            yield "".join(batch)
+
+    def _drain(self):
+        """Write out all buffered lines."""
+        with self._write_lock:
+            for batch in self._batches():
+                try:
+                    self._stream.write(batch)
+                    self._stream.flush()
+                except Exception:
+                    # can't log the failure without feeding it back into the buffer
+                    traceback.print_exc(file=sys.stderr)
+
+    def _thread_main(self):
+        """The entry point for the writer thread."""
+        while not self._stopping:
+            self._wakeup.wait(self._max_latency)
+            self._wakeup.clear()
+            self._drain()
+        self._drain()
+
+    def start(self):
+        """Starts the background thread.
+
+        Additionally, this registers a handler for process exit to write
+        any pending lines before shutdown.
+        """
+        with self._operational_lock:
+            if self.is_alive:
+                return
+
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._thread_main, name=_WRITER_THREAD_NAME
+            )
+            self._thread.daemon = True
+            self._thread.start()
+            atexit.register(self._main_thread_terminated)
+
+    def stop(self, *, grace_period=None):
+        """Stops the background thread after writing any pending lines.
+
+        Args:
+            grace_period (Optional[float]): If specified, this method will
+                block up to this many seconds to allow the background thread
+                to finish work before returning.
+
+        Returns:
+            bool: True if the thread terminated. False if the thread is still
+            running.
+        """
+        if not self.is_alive:
+            return True
+
+        with self._operational_lock:
+            atexit.unregister(self._main_thread_terminated)
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join(timeout=grace_period)
+
+            success = not self.is_alive
+            self._thread = None
+            return success
+
+    def _main_thread_terminated(self):
+        """Callback that attempts to write pending lines before termination."""
+        if not self.stop(grace_period=self._grace_period):
+            print(
+                "Failed to write %d pending log lines." % (len(self._buffer),),
+                file=sys.stderr,
+            )
+
+    def write(self, line):
+        """Queues a formatted line to be written by the background thread.
+
+        Args:
+            line (str): The line to write, including its terminator.
+        """
+        self._buffer.append(line)
+        buffered = len(self._buffer)
+        if buffered >= self._max_buffer_size or not self.is_alive:
+            # apply back-pressure rather than dropping lines
+            self._drain()
+        elif buffered >= self._batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all pending lines from the calling thread."""
+        self._drain()
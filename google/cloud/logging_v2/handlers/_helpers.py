@@ -17,14 +17,11 @@
 import math
 import json
 import re
+import sys
 import warnings
 
-try:
-    import flask
-except ImportError:  # pragma: NO COVER
-    flask = None
-
 from google.cloud.logging_v2.handlers.middleware.request import _get_django_request
+from google.cloud.logging_v2.handlers.middleware.asgi import _get_asgi_request_data
 
 _DJANGO_CONTENT_LENGTH = "CONTENT_LENGTH"
 _DJANGO_XCLOUD_TRACE_HEADER = "HTTP_X_CLOUD_TRACE_CONTEXT"
@@ -35,6 +32,10 @@ _DJANGO_REFERER_HEADER = "HTTP_REFERER"
 _FLASK_XCLOUD_TRACE_HEADER = "X_CLOUD_TRACE_CONTEXT"
 _FLASK_TRACEPARENT = "TRACEPARENT"
 _PROTOCOL_HEADER = "SERVER_PROTOCOL"
+_ASGI_HOST_HEADER = b"host"
+_ASGI_XCLOUD_TRACE_HEADER = b"x-cloud-trace-context"
+_ASGI_TRACEPARENT = b"traceparent"
+_ASGI_USERAGENT_HEADER = b"user-agent"
 
 
 def format_stackdriver_json(record, message):
@@ -68,7 +69,10 @@ def get_request_data_from_flask():
             Data related to the current http request, trace_id, span_id and trace_sampled
             for the request. All fields will be None if a django request isn't found.
     """
-    if flask is None or not flask.request:
+    # a flask request can only be active once the application imported flask,
+    # so look it up rather than paying for the import in every process
+    flask = sys.modules.get("flask")
+    if flask is None or not getattr(flask, "request", None):
         return None, None, None, False
 
     # build http_request
@@ -131,6 +135,70 @@ def get_request_data_from_django():
     return http_request, trace_id, span_id, trace_sampled
 
 
+def get_request_data_from_asgi_scope(scope):
+    """Get http_request and trace data from an ASGI connection scope.
+
+    Args:
+        scope (dict): the ASGI ``http`` connection scope.
+    Returns:
+        Tuple[Optional[dict], Optional[str], Optional[str], bool]:
+            Data related to the http request, trace_id, span_id, and trace_sampled
+            for the request.
+    """
+    headers = {}
+    for name, value in scope.get("headers") or ():
+        headers.setdefault(name.lower(), value.decode("latin-1"))
+
+    # rebuild the request url from the scope
+    host = headers.get(_ASGI_HOST_HEADER)
+    if host is None and scope.get("server"):
+        server_host, server_port = scope["server"]
+        host = server_host if server_port is None else f"{server_host}:{server_port}"
+    request_url = None
+    if host is not None:
+        path = scope.get("root_path", "") + scope.get("path", "")
+        request_url = f"{scope.get('scheme', 'http')}://{host}{path}"
+        query_string = scope.get("query_string")
+        if query_string:
+            request_url = f"{request_url}?{query_string.decode('latin-1')}"
+
+    http_version = scope.get("http_version")
+    # build http_request
+    http_request = {
+        "requestMethod": scope.get("method"),
+        "requestUrl": request_url,
+        "userAgent": headers.get(_ASGI_USERAGENT_HEADER),
+        "protocol": f"HTTP/{http_version}" if http_version else None,
+    }
+
+    # find trace id and span id
+    # first check for w3c traceparent header
+    header = headers.get(_ASGI_TRACEPARENT)
+    trace_id, span_id, trace_sampled = _parse_trace_parent(header)
+    if trace_id is None:
+        # traceparent not found. look for xcloud_trace_context header
+        header = headers.get(_ASGI_XCLOUD_TRACE_HEADER)
+        trace_id, span_id, trace_sampled = _parse_xcloud_trace(header)
+
+    return http_request, trace_id, span_id, trace_sampled
+
+
+def get_request_data_from_asgi():
+    """Get http_request and trace data captured by the ASGI middleware.
+
+    Returns:
+        Tuple[Optional[dict], Optional[str], Optional[str], bool]:
+            Data related to the current http request, trace_id, span_id, and trace_sampled
+            for the request. All fields will be None if an ASGI request isn't found.
+    """
+    request_data = _get_asgi_request_data()
+
+    if request_data is None:
+        return None, None, None, False
+
+    return request_data
+
+
 def _parse_trace_parent(header):
     """Given a w3 traceparent header, extract the trace and span ids.
     For more information see https://www.w3.org/TR/trace-context/
@@ -193,7 +261,7 @@ def _parse_xcloud_trace(header):
 
 def get_request_data():
     """Helper to get http_request and trace data from supported web
-    frameworks (currently supported: Flask and Django).
+    frameworks (currently supported: ASGI frameworks, Flask and Django).
 
     Returns:
         Tuple[Optional[dict], Optional[str], Optional[str], bool]:
@@ -201,6 +269,7 @@ def get_request_data():
             for the request. All fields will be None if a http request isn't found.
     """
     checkers = (
+        get_request_data_from_asgi,
         get_request_data_from_django,
         get_request_data_from_flask,
     )
@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import json
 import os
+import threading
+import time
 
 from google.cloud.logging_v2.resource import Resource
 from google.cloud.logging_v2._helpers import retrieve_metadata_server
@@ -64,14 +68,170 @@ _GKE_CLUSTER_NAME = "instance/attributes/cluster-name"
 _PROJECT_NAME = "project/project-id"
 """Attribute in metadata server when in GKE environment."""
 
+_METADATA_KEYS = (
+    _GKE_CLUSTER_NAME,
+    _GCE_INSTANCE_ID,
+    _PROJECT_NAME,
+    _ZONE_ID,
+    _REGION_ID,
+)
+"""All metadata server attributes used for resource detection."""
+
+_METADATA_DEADLINE = 3  # Seconds
+"""Overall time allowed for the metadata server lookups."""
+
+_METADATA_CACHE_ENV = "GOOGLE_CLOUD_LOGGING_METADATA_CACHE"
+"""Environment variable naming an optional file to cache metadata values in."""
+
+_METADATA_CACHE_TTL = 3600  # Seconds
+
+_metadata_cache = {}
+_metadata_cache_lock = threading.Lock()
+_metadata_fetch = None
+"""Identifies the current fetch, whose late lookups still update the cache."""
+_metadata_pending = set()
+"""Keys of the current fetch whose lookups missed the deadline."""
+_resource_cache = {}
+"""Detected resources, by project."""
+
+
+def _reset_metadata_cache():
+    """Forget the metadata values and resources detected by the process."""
+    global _metadata_fetch
+    with _metadata_cache_lock:
+        _metadata_cache.clear()
+        _metadata_pending.clear()
+        _resource_cache.clear()
+        _metadata_fetch = None
+
+
+def _read_metadata_file(path):
+    """Load cached metadata values from ``path`` if it is fresh enough.
+
+    Returns:
+        Optional[dict]: The cached values, or None if unavailable.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > _METADATA_CACHE_TTL:
+            return None
+        with open(path) as cache_file:
+            values = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(values, dict) or set(values) != set(_METADATA_KEYS):
+        return None
+    return values
+
+
+def _write_metadata_file(path, values):
+    """Atomically write metadata values to ``path``, ignoring failures."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as cache_file:
+            json.dump(values, cache_file)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _fetch_metadata(keys=_METADATA_KEYS, on_late=None):
+    """Look up detection attributes from the metadata server concurrently.
+
+    Args:
+        keys (Sequence[str]): The attributes to look up.
+        on_late (Optional[Callable[[str, Optional[str]], None]]): Called from
+            the lookup thread with the key and value of each lookup that
+            finishes after the deadline.
+
+    Returns:
+        dict: A mapping of metadata key to value (or None), for the lookups
+        that finished within ``_METADATA_DEADLINE`` seconds.
+    """
+    values = {}
+    lock = threading.Lock()
+    expired = []
+
+    def fetch(key):
+        value = retrieve_metadata_server(key)
+        with lock:
+            if not expired:
+                values[key] = value
+                return
+        if on_late is not None:
+            on_late(key, value)
+
+    threads = [threading.Thread(target=fetch, args=(key,), daemon=True) for key in keys]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + _METADATA_DEADLINE
+    for thread in threads:
+        thread.join(timeout=max(0, deadline - time.monotonic()))
+    with lock:
+        expired.append(True)
+        return dict(values)
+
+
+def _store_late_metadata(fetch, cache_path, key, value):
+    """Record the value of a lookup that finished after the deadline."""
+    with _metadata_cache_lock:
+        if fetch is not _metadata_fetch:
+            # the cache was reset since
+            return
+        _metadata_cache[key] = value
+        _metadata_pending.discard(key)
+        # resources detected without the value are detected again
+        _resource_cache.clear()
+        if cache_path and not _metadata_pending:
+            _write_metadata_file(cache_path, dict(_metadata_cache))
+
+
+def _retrieve_metadata(key):
+    """Return a metadata server attribute used for resource detection.
+
+    All detection attributes are fetched together on first use and cached
+    for the lifetime of the process. Lookups that miss the shared deadline
+    read as None, and keep running in the background: their values replace
+    None once they arrive. If the ``GOOGLE_CLOUD_LOGGING_METADATA_CACHE``
+    environment variable names a file, values are also shared through it,
+    once every lookup has finished, so short-lived processes can skip the
+    lookups entirely.
+
+    Args:
+        key (str): One of the attributes in ``_METADATA_KEYS``.
+    Returns:
+        Optional[str]: The attribute value, or None if not available.
+    """
+    global _metadata_fetch
+    if not _metadata_cache:
+        with _metadata_cache_lock:
+            if not _metadata_cache:
+                cache_path = os.environ.get(_METADATA_CACHE_ENV)
+                values = _read_metadata_file(cache_path) if cache_path else None
+                if values is None:
+                    fetch = _metadata_fetch = object()
+                    values = _fetch_metadata(
+                        on_late=functools.partial(
+                            _store_late_metadata, fetch, cache_path
+                        )
+                    )
+                    _metadata_pending.update(set(_METADATA_KEYS) - set(values))
+                    if cache_path and not _metadata_pending:
+                        _write_metadata_file(cache_path, values)
+                    values = {**dict.fromkeys(_METADATA_KEYS), **values}
+                _metadata_cache.update(values)
+    return _metadata_cache.get(key)
+
 
 def _create_functions_resource():
     """Create a standardized Cloud Functions resource.
     Returns:
         google.cloud.logging.Resource
     """
-    project = retrieve_metadata_server(_PROJECT_NAME)
-    region = retrieve_metadata_server(_REGION_ID)
+    project = _retrieve_metadata(_PROJECT_NAME)
+    region = _retrieve_metadata(_REGION_ID)
     if _FUNCTION_NAME in os.environ:
         function_name = os.environ.get(_FUNCTION_NAME)
     elif _CLOUD_RUN_SERVICE_ID in os.environ:
@@ -94,9 +254,9 @@ def _create_kubernetes_resource():
     Returns:
         google.cloud.logging.Resource
     """
-    zone = retrieve_metadata_server(_ZONE_ID)
-    cluster_name = retrieve_metadata_server(_GKE_CLUSTER_NAME)
-    project = retrieve_metadata_server(_PROJECT_NAME)
+    zone = _retrieve_metadata(_ZONE_ID)
+    cluster_name = _retrieve_metadata(_GKE_CLUSTER_NAME)
+    project = _retrieve_metadata(_PROJECT_NAME)
 
     resource = Resource(
         type="k8s_container",
@@ -114,9 +274,9 @@ def _create_compute_resource():
     Returns:
         google.cloud.logging.Resource
     """
-    instance = retrieve_metadata_server(_GCE_INSTANCE_ID)
-    zone = retrieve_metadata_server(_ZONE_ID)
-    project = retrieve_metadata_server(_PROJECT_NAME)
+    instance = _retrieve_metadata(_GCE_INSTANCE_ID)
+    zone = _retrieve_metadata(_ZONE_ID)
+    project = _retrieve_metadata(_PROJECT_NAME)
     resource = Resource(
         type="gce_instance",
         labels={
@@ -133,8 +293,8 @@ def _create_cloud_run_service_resource():
     Returns:
         google.cloud.logging.Resource
     """
-    region = retrieve_metadata_server(_REGION_ID)
-    project = retrieve_metadata_server(_PROJECT_NAME)
+    region = _retrieve_metadata(_REGION_ID)
+    project = _retrieve_metadata(_PROJECT_NAME)
     resource = Resource(
         type="cloud_run_revision",
         labels={
@@ -153,8 +313,8 @@ def _create_cloud_run_job_resource():
     Returns:
         google.cloud.logging.Resource
     """
-    region = retrieve_metadata_server(_REGION_ID)
-    project = retrieve_metadata_server(_PROJECT_NAME)
+    region = _retrieve_metadata(_REGION_ID)
+    project = _retrieve_metadata(_PROJECT_NAME)
     resource = Resource(
         type="cloud_run_job",
         labels={
@@ -171,8 +331,8 @@ def _create_app_engine_resource():
     Returns:
         google.cloud.logging.Resource
     """
-    zone = retrieve_metadata_server(_ZONE_ID)
-    project = retrieve_metadata_server(_PROJECT_NAME)
+    zone = _retrieve_metadata(_ZONE_ID)
+    project = _retrieve_metadata(_PROJECT_NAME)
     resource = Resource(
         type="gae_app",
         labels={
@@ -199,13 +359,25 @@ def detect_resource(project=""):
     """Return the default monitored resource based on the local environment.
     If GCP resource not found, defaults to `global`.
 
+    The resource is detected once per project and process.
+
     Args:
         project (str): The project ID to pass on to the resource (if needed)
     Returns:
         google.cloud.logging.Resource: The default resource based on the environment
     """
-    gke_cluster_name = retrieve_metadata_server(_GKE_CLUSTER_NAME)
-    gce_instance_name = retrieve_metadata_server(_GCE_INSTANCE_ID)
+    resource = _resource_cache.get(project)
+    if resource is None:
+        resource = _detect_resource(project)
+        _resource_cache[project] = resource
+    # callers may update the labels of the resource they are given
+    return Resource(type=resource.type, labels=dict(resource.labels))
+
+
+def _detect_resource(project):
+    """Detect the resource for :func:`detect_resource`."""
+    gke_cluster_name = _retrieve_metadata(_GKE_CLUSTER_NAME)
+    gce_instance_name = _retrieve_metadata(_GCE_INSTANCE_ID)
 
     if all([env in os.environ for env in _GAE_ENV_VARS]):
         # App Engine Flex or Standard
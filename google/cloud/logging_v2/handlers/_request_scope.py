@@ -0,0 +1,104 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-request state shared by the request middleware and transports.
+
+The middleware opens a scope when a request starts and flushes it before the
+response is sent. Transports attach pending batches to the open scope.
+"""
+
+import contextvars
+import threading
+
+
+_current_scope = contextvars.ContextVar(
+    "google_cloud_logging_request_scope", default=None
+)
+
+
+class _RequestScope(object):
+    """Pending batches of log entries for the current request."""
+
+    def __init__(self):
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def get_batch(self, key, factory):
+        """Return the pending batch for ``key``, creating it if needed.
+
+        Args:
+            key (Hashable): Identifies the owner of the batch, usually a transport.
+            factory (Callable[[], Any]): Creates a new batch. Batches must
+                implement ``commit()``.
+
+        Returns:
+            Any: The pending batch.
+        """
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = factory()
+            return batch
+
+    def pop_batch(self, key):
+        """Remove and return the pending batch for ``key``, if any."""
+        with self._lock:
+            return self._batches.pop(key, None)
+
+    @property
+    def pending(self):
+        """Returns True if any batch is waiting to be committed."""
+        return bool(self._batches)
+
+    def flush(self):
+        """Commit and discard all pending batches."""
+        with self._lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+        for batch in batches:
+            batch.commit()
+
+
+def _get_request_scope():
+    """Get the scope of the request being handled.
+
+    Returns:
+        Optional[_RequestScope]: The open scope, or None outside of a request.
+    """
+    return _current_scope.get()
+
+
+def _enter_request_scope():
+    """Open a scope for a new request.
+
+    Returns:
+        contextvars.Token: Pass to :func:`_exit_request_scope` once the request
+        is complete.
+    """
+    return _current_scope.set(_RequestScope())
+
+
+def _exit_request_scope(token):
+    """Close the scope opened by :func:`_enter_request_scope`.
+
+    Args:
+        token (contextvars.Token): The token returned when the scope was opened.
+
+    Returns:
+        _RequestScope: The closed scope. The caller is responsible for flushing
+        its pending batches.
+    """
+    scope = _current_scope.get()
+    _current_scope.reset(token)
+    return scope
@@ -0,0 +1,211 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Append-only log file with size and time based rotation.
+
+Used by handlers writing structured logs to a file tailed by a logging agent
+(for example the Ops Agent on Compute Engine).
+"""
+
+import contextlib
+import gzip
+import os
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: NO COVER
+    fcntl = None
+
+
+class _RotatingFile(object):
+    """A file sink that appends with ``O_APPEND`` and rotates by size or age.
+
+    Several processes can write to the same file. Each write holds a shared
+    ``flock`` on ``<filename>.lock`` and reopens the file if another process
+    rotated it, while rotation holds the lock exclusively. The modification
+    time of the lock file records the last rotation, so that all processes
+    agree on the age of the file. Rotated files are
+    compressed after the lock is released, so writers are not held up by
+    ``gzip``. Locking is skipped on platforms without :mod:`fcntl`.
+    """
+
+    def __init__(
+        self,
+        filename,
+        *,
+        max_bytes=0,
+        rotation_interval=None,
+        backup_count=0,
+        compress=False,
+        encoding="utf-8",
+    ):
+        """
+        Args:
+            filename (str): The file to write logs to.
+            max_bytes (Optional[int]): Rotate the file once it reaches this size.
+                Disabled when 0.
+            rotation_interval (Optional[float]): Rotate the file this many seconds
+                after it was last rotated, or created. Disabled when None.
+            backup_count (Optional[int]): The number of rotated files to keep, named
+                ``<filename>.1`` (newest) to ``<filename>.<backup_count>``.
+                Rotation is disabled when 0.
+            compress (Optional[bool]): If True, gzip rotated files and add a
+                ``.gz`` suffix to their names.
+            encoding (Optional[str]): The encoding used to write lines.
+        """
+        self.filename = os.path.abspath(filename)
+        self._max_bytes = max_bytes
+        self._rotation_interval = rotation_interval
+        self._backup_count = backup_count
+        self._compress = compress
+        self._encoding = encoding
+        self._fd = None
+        self._lock_path = self.filename + ".lock"
+        self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._open()
+
+    def _open(self):
+        """Open (or reopen) the log file for appending."""
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive=False):
+        """Hold the cross-process lock for the duration of the block."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _is_current(self):
+        """Returns True if our descriptor still points at ``filename``."""
+        try:
+            path_stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return False
+        fd_stat = os.fstat(self._fd)
+        return (path_stat.st_dev, path_stat.st_ino) == (fd_stat.st_dev, fd_stat.st_ino)
+
+    def _should_rotate(self):
+        if not self._backup_count:
+            return False
+        if self._max_bytes and os.fstat(self._fd).st_size >= self._max_bytes:
+            return True
+        return (
+            self._rotation_interval is not None
+            and time.time() - os.fstat(self._lock_fd).st_mtime
+            >= self._rotation_interval
+        )
+
+    def _backup_names(self, index):
+        """Return the names of a backup before and after compression."""
+        name = f"{self.filename}.{index}"
+        return (name, name + ".gz") if self._compress else (name,)
+
+    def _rotate(self):
+        """Move the current file to the first backup and start a new one."""
+        with self._locked(exclusive=True):
+            if not self._is_current():
+                # another process rotated the file already
+                self._open()
+                return
+            for index in range(self._backup_count - 1, 0, -1):
+                # backups that are still being compressed keep their suffix
+                targets = self._backup_names(index + 1)
+                for source, target in zip(self._backup_names(index), targets):
+                    if os.path.exists(source):
+                        for stale in targets:
+                            if stale != target and os.path.exists(stale):
+                                os.remove(stale)
+                        os.replace(source, target)
+            rotated = f"{self.filename}.1"
+            os.replace(self.filename, rotated)
+            self._open()
+            # restart the rotation interval for all processes
+            os.utime(self._lock_path)
+            # opened under the lock, so that it is the file just rotated even
+            # if another process rotates again before it is compressed
+            rotated_file = open(rotated, "rb") if self._compress else None
+        if rotated_file is not None:
+            with rotated_file:
+                self._compress_backup(rotated_file)
+
+    def _compress_backup(self, source):
+        """Gzip a rotated file, then swap it for its compressed copy.
+
+        Other processes can rotate again while the file is compressed, so the
+        swap looks for the backup the file has been moved to since.
+
+        Args:
+            source (BinaryIO): The rotated file, open for reading.
+        """
+        temp_name = f"{self.filename}.1.gz.{os.getpid()}.tmp"
+        try:
+            with gzip.open(temp_name, "wb") as target:
+                shutil.copyfileobj(source, target)
+        except OSError:
+            # the backup is kept uncompressed
+            with contextlib.suppress(OSError):
+                os.remove(temp_name)
+            return
+        rotated_stat = os.fstat(source.fileno())
+        with self._locked(exclusive=True):
+            for index in range(1, self._backup_count + 1):
+                name, compressed_name = self._backup_names(index)
+                try:
+                    backup_stat = os.stat(name)
+                except FileNotFoundError:
+                    continue
+                if (backup_stat.st_dev, backup_stat.st_ino) == (
+                    rotated_stat.st_dev,
+                    rotated_stat.st_ino,
+                ):
+                    os.replace(temp_name, compressed_name)
+                    os.remove(name)
+                    return
+        # the backup was dropped while it was compressed
+        os.remove(temp_name)
+
+    def write(self, data):
+        """Append ``data`` to the file in a single ``write()``, then rotate if needed.
+
+        Args:
+            data (str): One or more complete lines.
+        """
+        encoded = memoryview(data.encode(self._encoding))
+        with self._locked():
+            if not self._is_current():
+                self._open()
+            while encoded:
+                written = os.write(self._fd, encoded)
+                encoded = encoded[written:]
+        if self._should_rotate():
+            self._rotate()
+
+    def flush(self):
+        """Writes are unbuffered, so there is nothing to flush."""
+
+    def close(self):
+        """Close the log file."""
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._lock_fd = None
@@ -15,6 +15,7 @@
 """Python :mod:`logging` handlers for Cloud Logging."""
 
 import collections
+import functools
 import json
 import logging
 
@@ -42,6 +43,9 @@ _GAE_TRACE_ID_LABEL = "appengine.googleapis.com/trace_id"
 """Resource name for App Engine environments"""
 _GAE_RESOURCE_TYPE = "gae_app"
 
+"""Maximum number of call sites to keep prebuilt metadata for"""
+_CALLSITE_CACHE_SIZE = 1024
+
 
 class CloudLoggingFilter(logging.Filter):
     """Python standard ``logging`` Filter class to add Cloud Logging
@@ -52,35 +56,74 @@ class CloudLoggingFilter(logging.Filter):
     overwritten using the `extras` argument when writing logs.
     """
 
-    def __init__(self, project=None, default_labels=None):
-        self.project = project
+    def __init__(self, project=None, default_labels=None, *, structured=True):
+        """
+        Args:
+            project (Optional[Union[str, Callable[[], str]]]): Project Id used
+                to expand detected trace ids, or a function returning it, called
+                the first time it is needed.
+            default_labels (Optional[dict]): Labels to attach to every record.
+            structured (Optional[bool]): If True, also attach the string
+                representations (``_labels_str``, ``_http_request_str``, etc.)
+                used by the structured logging format. Handlers that send
+                records to the API directly can set this to False to skip
+                the extra JSON encoding. Defaults to True.
+        """
+        self._project = project
         self.default_labels = default_labels if default_labels else {}
+        self.structured = structured
+        # the source location only depends on the call site, so it is built
+        # (and encoded) once per call site
+        self._get_source_location = functools.lru_cache(maxsize=_CALLSITE_CACHE_SIZE)(
+            self._build_source_location
+        )
+
+    @property
+    def project(self):
+        """Optional[str]: Project Id used to expand detected trace ids."""
+        if callable(self._project):
+            self._project = self._project()
+        return self._project
+
+    @project.setter
+    def project(self, value):
+        self._project = value
 
     @staticmethod
-    def _infer_source_location(record):
-        """Helper function to infer source location data from a LogRecord.
-        Will default to record.source_location if already set
+    def _build_source_location(pathname, lineno, func_name):
+        """Build the source location of the records from a single call site.
+
+        Results are cached by call site, so the returned dict is shared
+        between records and must be copied before it is handed out.
+
+        Returns:
+            Tuple[Optional[dict], str]: The source location, and its JSON
+                encoding.
         """
-        if hasattr(record, "source_location"):
-            return record.source_location
-        else:
-            name_map = [
-                ("line", "lineno"),
-                ("file", "pathname"),
-                ("function", "funcName"),
-            ]
-            output = {}
-            for gcp_name, std_lib_name in name_map:
-                value = getattr(record, std_lib_name, None)
-                if value is not None:
-                    output[gcp_name] = value
-            return output if output else None
+        source_location = {
+            gcp_name: value
+            for gcp_name, value in (
+                ("line", lineno),
+                ("file", pathname),
+                ("function", func_name),
+            )
+            if value is not None
+        }
+        return (
+            source_location or None,
+            json.dumps(source_location, ensure_ascii=False),
+        )
 
     def filter(self, record):
         """
         Add new Cloud Logging data to each LogRecord as it comes in
         """
         user_labels = getattr(record, "labels", {})
+        source_location, source_location_str = self._get_source_location(
+            getattr(record, "pathname", None),
+            getattr(record, "lineno", None),
+            getattr(record, "funcName", None),
+        )
         # infer request data from the environment
         (
             inferred_http,
@@ -97,10 +140,19 @@ class CloudLoggingFilter(logging.Filter):
         record._span_id = getattr(record, "span_id", inferred_span) or None
         record._trace_sampled = bool(getattr(record, "trace_sampled", inferred_sampled))
         record._http_request = getattr(record, "http_request", inferred_http)
-        record._source_location = CloudLoggingFilter._infer_source_location(record)
+        if hasattr(record, "source_location"):
+            record._source_location = record.source_location
+            source_location_str = None
+        elif source_location is not None:
+            # each record gets its own copy, which handlers may modify
+            record._source_location = dict(source_location)
+        else:
+            record._source_location = None
         # add logger name as a label if possible
         logger_label = {"python_logger": record.name} if record.name else {}
         record._labels = {**logger_label, **self.default_labels, **user_labels} or None
+        if not self.structured:
+            return True
         # create string representations for structured logging
         record._trace_str = record._trace or ""
         record._span_id_str = record._span_id or ""
@@ -108,9 +160,11 @@ class CloudLoggingFilter(logging.Filter):
         record._http_request_str = json.dumps(
             record._http_request or {}, ensure_ascii=False
         )
-        record._source_location_str = json.dumps(
-            record._source_location or {}, ensure_ascii=False
-        )
+        if source_location_str is None:
+            source_location_str = json.dumps(
+                record._source_location or {}, ensure_ascii=False
+            )
+        record._source_location_str = source_location_str
         record._labels_str = json.dumps(record._labels or {}, ensure_ascii=False)
         return True
 
@@ -153,6 +207,8 @@ class CloudLoggingHandler(logging.StreamHandler):
         resource=None,
         labels=None,
         stream=None,
+        warm_up=False,
+        apply_exclusions=False,
     ):
         """
         Args:
@@ -169,23 +225,66 @@ class CloudLoggingHandler(logging.StreamHandler):
                 :class:`.BackgroundThreadTransport`. The other
                 option is :class:`.SyncTransport`.
             resource (~logging_v2.resource.Resource):
-                Resource for this Handler. If not given, will be inferred from the environment.
+                Resource for this Handler. If not given, will be inferred from the
+                environment the first time it is needed.
             labels (Optional[dict]): Additional labels to attach to logs.
             stream (Optional[IO]): Stream to be used by the handler.
+            warm_up (Optional[bool]): If True, connect the client's gRPC channel
+                in the background, so the first batch of logs does not wait for
+                the connection. See :meth:`~logging_v2.client.Client.warm_up`.
+            apply_exclusions (Optional[bool]): If True, records matching the
+                project's active log exclusions are dropped before they are
+                queued or sent. Enables the ``apply_exclusions`` mode of
+                ``client``, whose ``local_exclusions`` counts the records dropped.
         """
         super(CloudLoggingHandler, self).__init__(stream)
-        if not resource:
-            # infer the correct monitored resource from the local environment
-            resource = detect_resource(client.project)
         self.name = name
         self.client = client
-        self.transport = transport(client, name, resource=resource)
-        self.project_id = client.project
+        # the project and resource are only resolved when first needed, so
+        # that creating the handler does not wait on the credentials or the
+        # metadata server
+        self._project_id = None
         self.resource = resource
+        if apply_exclusions:
+            client._enable_local_exclusions()
+        # a logger created without a resource infers it when first written to
+        self.transport = transport(client, name, resource=resource or None)
         self.labels = labels
         # add extra keys to log record
-        log_filter = CloudLoggingFilter(project=self.project_id, default_labels=labels)
+        # string representations are only needed for structured output
+        log_filter = CloudLoggingFilter(
+            project=lambda: self.project_id, default_labels=labels, structured=False
+        )
         self.addFilter(log_filter)
+        if warm_up:
+            client.warm_up(block=False)
+
+    @property
+    def project_id(self):
+        """str: The project of the handler's client."""
+        if self._project_id is None:
+            self._project_id = self.client.project
+        return self._project_id
+
+    @project_id.setter
+    def project_id(self, value):
+        self._project_id = value
+
+    @property
+    def resource(self):
+        """~logging_v2.resource.Resource: The default resource of the records.
+
+        Inferred from the local environment on first access if the handler was
+        created without a resource.
+        """
+        if not self._resource:
+            # infer the correct monitored resource from the local environment
+            self._resource = detect_resource(self.project_id)
+        return self._resource
+
+    @resource.setter
+    def resource(self, resource):
+        self._resource = resource
 
     def emit(self, record):
         """Actually log the specified logging record.
@@ -0,0 +1,102 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""ASGI middleware helper to capture request data.
+
+The http_request and trace data are extracted once per request and stored
+on a :class:`contextvars.ContextVar`, so they stay correct when many requests
+are served concurrently from a single thread (ASGI Django, Starlette, FastAPI).
+"""
+
+import asyncio
+import contextvars
+
+from google.cloud.logging_v2.handlers import _helpers
+from google.cloud.logging_v2.handlers import _request_scope
+
+
+_asgi_request_data = contextvars.ContextVar(
+    "google_cloud_logging_asgi_request_data", default=None
+)
+
+
+def _get_asgi_request_data():
+    """Get the request data captured for the current ASGI request.
+
+    Returns:
+        Optional[Tuple[dict, Optional[str], Optional[str], bool]]:
+            The http_request, trace_id, span_id and trace_sampled for the
+            current request, or None if no ASGI request is in progress.
+    """
+    return _asgi_request_data.get()
+
+
+class ASGIRequestMiddleware(object):
+    """ASGI middleware that saves the current request data in a context variable.
+
+    Example:
+
+    .. code-block:: python
+
+        from starlette.applications import Starlette
+        from google.cloud.logging_v2.handlers.middleware import ASGIRequestMiddleware
+
+        app = ASGIRequestMiddleware(Starlette())
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app (Callable): The ASGI application to wrap.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Called on each ASGI connection.
+
+        Args:
+            scope (dict): ASGI connection scope.
+            receive (Callable): ASGI receive channel.
+            send (Callable): ASGI send channel.
+        """
+        if scope.get("type") != "http":
+            return await self.app(scope, receive, send)
+        token = _asgi_request_data.set(_helpers.get_request_data_from_asgi_scope(scope))
+        scope_token = _request_scope._enter_request_scope()
+        request_scope = _request_scope._get_request_scope()
+
+        async def send_wrapper(message):
+            if (
+                message.get("type") == "http.response.body"
+                and not message.get("more_body", False)
+                and request_scope.pending
+            ):
+                # write batched logs before the response completes, as the CPU
+                # may be throttled once it is sent
+                await _flush_in_executor(request_scope)
+            await send(message)
+
+        try:
+            return await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_scope._exit_request_scope(scope_token)
+            _asgi_request_data.reset(token)
+            if request_scope.pending:
+                await _flush_in_executor(request_scope)
+
+
+async def _flush_in_executor(request_scope):
+    """Commit the pending batches of a request without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, request_scope.flush)
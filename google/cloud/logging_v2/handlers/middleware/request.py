@@ -20,6 +20,8 @@ inspected by other helpers.
 
 import threading
 
+from google.cloud.logging_v2.handlers import _request_scope
+
 
 _thread_locals = threading.local()
 
@@ -45,7 +47,12 @@ def RequestMiddleware(get_response):
         """
         _thread_locals.request = request
         if get_response:
-            return get_response(request)
+            # logs batched during the request are written before responding
+            token = _request_scope._enter_request_scope()
+            try:
+                return get_response(request)
+            finally:
+                _request_scope._exit_request_scope(token).flush()
         else:
             return None
 
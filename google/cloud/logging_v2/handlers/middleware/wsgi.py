@@ -0,0 +1,59 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""WSGI middleware that marks the start and end of each request.
+
+Logs batched by :class:`~logging_v2.handlers.transports.RequestBatchTransport`
+are written when the request ends.
+"""
+
+from google.cloud.logging_v2.handlers import _request_scope
+
+
+class WSGIRequestMiddleware(object):
+    """WSGI middleware that writes the logs of a request before responding.
+
+    Example:
+
+    .. code-block:: python
+
+        import flask
+        from google.cloud.logging_v2.handlers.middleware import WSGIRequestMiddleware
+
+        app = flask.Flask(__name__)
+        app.wsgi_app = WSGIRequestMiddleware(app.wsgi_app)
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app (Callable): The WSGI application to wrap.
+        """
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        """Called on each WSGI request.
+
+        Args:
+            environ (dict): The WSGI environment.
+            start_response (Callable): Starts the HTTP response.
+
+        Returns:
+            Iterable[bytes]: The response body returned by the application.
+        """
+        token = _request_scope._enter_request_scope()
+        try:
+            return self.app(environ, start_response)
+        finally:
+            _request_scope._exit_request_scope(token).flush()
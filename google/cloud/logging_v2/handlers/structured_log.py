@@ -19,6 +19,15 @@ import json
 import logging
 import logging.handlers
 
+from google.cloud.logging_v2.handlers._buffered_writer import _BufferedWriter
+from google.cloud.logging_v2.handlers._buffered_writer import _DEFAULT_BATCH_SIZE
+from google.cloud.logging_v2.handlers._buffered_writer import _DEFAULT_GRACE_PERIOD
+from google.cloud.logging_v2.handlers._buffered_writer import _DEFAULT_MAX_LATENCY
+from google.cloud.logging_v2.handlers._buffered_writer import (
+    _DEFAULT_MAX_BUFFER_SIZE,
+)
+from google.cloud.logging_v2.handlers._buffered_writer import PIPE_BUF
+from google.cloud.logging_v2.handlers._rotating_file import _RotatingFile
 from google.cloud.logging_v2.handlers.handlers import CloudLoggingFilter
 from google.cloud.logging_v2.handlers.handlers import _format_and_parse_message
 import google.cloud.logging_v2
@@ -56,14 +65,44 @@ GCP_STRUCTURED_LOGGING_FIELDS = frozenset(
     }
 )
 
+# batches written to a file are not bound by PIPE_BUF
+_FILE_MAX_WRITE_SIZE = 1 << 16
+
 
 class StructuredLogHandler(logging.StreamHandler):
     """Handler to format logs into the Cloud Logging structured log format,
     and write them to standard output
+
+    When ``buffered`` is True, formatted lines are collected in memory and
+    written by a background thread in batches of up to ``PIPE_BUF`` bytes,
+    so lines from concurrent writers are never interleaved. Pending lines
+    are written when the handler is flushed or closed, and at interpreter
+    exit.
+
+    When ``filename`` is set, lines are appended to that file instead of a
+    stream, for collection by a logging agent such as the Ops Agent. File
+    output is always buffered, and the file can be rotated by size or age.
+    Multiple processes may log to the same file.
     """
 
     def __init__(
-        self, *, labels=None, stream=None, project_id=None, json_encoder_cls=None
+        self,
+        *,
+        labels=None,
+        stream=None,
+        project_id=None,
+        json_encoder_cls=None,
+        buffered=False,
+        filename=None,
+        max_bytes=0,
+        rotation_interval=None,
+        backup_count=0,
+        compress=False,
+        grace_period=_DEFAULT_GRACE_PERIOD,
+        max_latency=_DEFAULT_MAX_LATENCY,
+        batch_size=_DEFAULT_BATCH_SIZE,
+        max_buffer_size=_DEFAULT_MAX_BUFFER_SIZE,
+        max_write_size=None,
     ):
         """
         Args:
@@ -71,28 +110,67 @@ class StructuredLogHandler(logging.StreamHandler):
             stream (Optional[IO]): Stream to be used by the handler.
             project (Optional[str]): Project Id associated with the logs.
             json_encoder_cls (Optional[Type[JSONEncoder]]): Custom JSON encoder. Defaults to json.JSONEncoder
+            buffered (Optional[bool]): If True, write logs in batches from a
+                background thread instead of once per record. Defaults to False.
+            filename (Optional[str]): Write logs to this file instead of ``stream``.
+            max_bytes (Optional[int]): Rotate the file once it reaches this size.
+                Disabled when 0.
+            rotation_interval (Optional[float]): Rotate the file after this many
+                seconds. Disabled when None.
+            backup_count (Optional[int]): The number of rotated files to keep.
+                Rotation is disabled when 0.
+            compress (Optional[bool]): If True, gzip rotated files.
+            grace_period (Optional[float]): When buffered, the amount of time to
+                wait for pending lines to be written when the process is
+                shutting down.
+            max_latency (Optional[float]): When buffered, the longest amount of
+                time a line is held in the buffer before it is written.
+            batch_size (Optional[int]): When buffered, the number of lines that
+                triggers a write before ``max_latency`` expires.
+            max_buffer_size (Optional[int]): When buffered, the maximum number of
+                lines held in the buffer.
+            max_write_size (Optional[int]): When buffered, the maximum number of
+                bytes passed to a single ``write()``. Defaults to ``PIPE_BUF``
+                for streams, and to a larger size for files.
         """
+        self._file = None
+        if filename is not None:
+            self._file = _RotatingFile(
+                filename,
+                max_bytes=max_bytes,
+                rotation_interval=rotation_interval,
+                backup_count=backup_count,
+                compress=compress,
+            )
+            stream = self._file
+            buffered = True
+            if max_write_size is None:
+                max_write_size = _FILE_MAX_WRITE_SIZE
+        if max_write_size is None:
+            max_write_size = PIPE_BUF
         super(StructuredLogHandler, self).__init__(stream=stream)
         self.project_id = project_id
+        self._writer = None
+        if buffered:
+            self._writer = _BufferedWriter(
+                self.stream,
+                grace_period=grace_period,
+                max_latency=max_latency,
+                batch_size=batch_size,
+                max_buffer_size=max_buffer_size,
+                max_write_size=max_write_size,
+            )
+            self._writer.start()
 
         # add extra keys to log record
         log_filter = CloudLoggingFilter(project=project_id, default_labels=labels)
         self.addFilter(log_filter)
 
-        class _Formatter(logging.Formatter):
-            """Formatter to format log message without traceback"""
-
-            def format(self, record):
-                """Ignore exception info to avoid duplicating it
-                https://github.com/googleapis/python-logging/issues/382
-                """
-                record.message = record.getMessage()
-                return self.formatMessage(record)
-
-        # make logs appear in GCP structured logging format
-        self._gcp_formatter = _Formatter(GCP_FORMAT)
-
         self._json_encoder_cls = json_encoder_cls or json.JSONEncoder
+        # build the encoder once instead of on every json.dumps call.
+        # A faster JSON backend can be plugged in by overriding `encode`
+        # on a custom encoder class
+        self._encode = self._json_encoder_cls(ensure_ascii=False).encode
 
     def format(self, record):
         """Format the message into structured log JSON.
@@ -101,38 +179,67 @@ class StructuredLogHandler(logging.StreamHandler):
         Returns:
             str: A JSON string formatted for GCP structured logging.
         """
-        payload = None
+        payload = ""
         message = _format_and_parse_message(record, super(StructuredLogHandler, self))
 
         if isinstance(message, collections.abc.Mapping):
             # remove any special fields
-            for key in list(message.keys()):
-                if key in GCP_STRUCTURED_LOGGING_FIELDS:
-                    del message[key]
+            if not GCP_STRUCTURED_LOGGING_FIELDS.isdisjoint(message):
+                message = {
+                    key: value
+                    for key, value in message.items()
+                    if key not in GCP_STRUCTURED_LOGGING_FIELDS
+                }
             # if input is a dictionary, encode it as a json string
-            encoded_msg = json.dumps(
-                message, ensure_ascii=False, cls=self._json_encoder_cls
-            )
-            # all json.dumps strings should start and end with parentheses
+            encoded_msg = self._encode(message)
+            # all json strings should start and end with parentheses
             # strip them out to embed these fields in the larger JSON payload
             if len(encoded_msg) > 2:
                 payload = encoded_msg[1:-1] + ","
         elif message:
             # properly break any formatting in string to make it json safe
-            encoded_message = json.dumps(
-                message, ensure_ascii=False, cls=self._json_encoder_cls
-            )
-            payload = '"message": {},'.format(encoded_message)
-
-        record._payload_str = payload or ""
-        # convert to GCP structured logging format
-        gcp_payload = self._gcp_formatter.format(record)
-        return gcp_payload
+            payload = '"message": ' + self._encode(message) + ","
+
+        # convert to GCP structured logging format. Output matches GCP_FORMAT,
+        # but is written in a single pass over the pre-encoded record fields
+        return (
+            f"{{{payload}"
+            f'"severity": "{record.levelname}", '
+            f'"logging.googleapis.com/labels": {record._labels_str}, '
+            f'"logging.googleapis.com/trace": "{record._trace_str}", '
+            f'"logging.googleapis.com/spanId": "{record._span_id_str}", '
+            f'"logging.googleapis.com/trace_sampled": {record._trace_sampled_str}, '
+            f'"logging.googleapis.com/sourceLocation": {record._source_location_str}, '
+            f'"httpRequest": {record._http_request_str} '
+            "}"
+        )
 
     def emit(self, record):
         if google.cloud.logging_v2._instrumentation_emitted is False:
             self.emit_instrumentation_info()
-        super().emit(record)
+        if self._writer is None:
+            super().emit(record)
+            return
+        try:
+            self._writer.write(self.format(record) + self.terminator)
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Write any buffered logs, then flush the stream."""
+        if self._writer is not None:
+            self._writer.flush()
+        super().flush()
+
+    def close(self):
+        """Stop the buffered writer, if any, and close the handler."""
+        if self._writer is not None:
+            self._writer.stop()
+        if self._file is not None:
+            self._file.close()
+        super().close()
 
     def emit_instrumentation_info(self):
         google.cloud.logging_v2._instrumentation_emitted = True
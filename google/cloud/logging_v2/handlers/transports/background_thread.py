@@ -29,6 +29,7 @@ import time
 
 from google.cloud.logging_v2 import _helpers
 from google.cloud.logging_v2.handlers.transports.base import Transport
+from google.cloud.logging_v2.logger import _entry_class_for
 from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
 
 _DEFAULT_GRACE_PERIOD = 5.0  # Seconds
@@ -79,6 +80,7 @@ class _Worker(object):
         grace_period=_DEFAULT_GRACE_PERIOD,
         max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
         max_latency=_DEFAULT_MAX_LATENCY,
+        exclusions=None,
     ):
         """
         Args:
@@ -93,8 +95,12 @@ class _Worker(object):
                 than the grace_period. This means this is effectively the longest
                 amount of time the background thread will hold onto log entries
                 before sending them to the server.
+            exclusions (Optional[~logging_v2._exclusions._LocalExclusions]):
+                Exclusions whose matching entries are dropped instead of
+                being queued.
         """
         self._cloud_logger = cloud_logger
+        self._exclusions = exclusions
         self._grace_period = grace_period
         self._max_batch_size = max_batch_size
         self._max_latency = max_latency
@@ -127,7 +133,8 @@ class _Worker(object):
 
         done = False
         while not done:
-            batch = self._cloud_logger.batch()
+            # entries were checked against the exclusions when queued
+            batch = self._cloud_logger.batch(apply_exclusions=False)
             items = _get_many(
                 self._queue,
                 max_items=self._max_batch_size,
@@ -243,6 +250,15 @@ class _Worker(object):
             "timestamp": datetime.datetime.utcfromtimestamp(record.created),
         }
         queue_entry.update(kwargs)
+        if self._exclusions is not None:
+            entry = _entry_class_for(message)(
+                payload=message,
+                severity=queue_entry["severity"],
+                timestamp=queue_entry["timestamp"],
+                **kwargs,
+            )
+            if self._exclusions.excluded(entry, self._cloud_logger):
+                return
         self._queue.put_nowait(queue_entry)
 
     def flush(self):
@@ -288,6 +304,8 @@ class BackgroundThreadTransport(Transport):
             grace_period=grace_period,
             max_batch_size=batch_size,
             max_latency=max_latency,
+            # only :class:`~logging_v2.client.Client` applies exclusions locally
+            exclusions=getattr(client, "local_exclusions", None),
         )
         self.worker.start()
 
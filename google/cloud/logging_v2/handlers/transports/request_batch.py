@@ -0,0 +1,146 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transport for Python logging handler.
+
+Batches the entries logged while handling a request and writes them with a
+single API call before the response is sent.
+"""
+
+import datetime
+import logging
+
+from google.cloud.logging_v2 import _helpers
+from google.cloud.logging_v2.handlers._request_scope import _get_request_scope
+from google.cloud.logging_v2.handlers.transports.base import Transport
+from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+
+_DEFAULT_MAX_BATCH_SIZE = 500
+_DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024
+_LOGGER = logging.getLogger(__name__)
+
+
+def _approximate_size(message):
+    """Cheap estimate of the encoded size of a log payload, in bytes."""
+    if isinstance(message, str):
+        return len(message)
+    return len(str(message))
+
+
+class _RequestBatch(object):
+    """Entries logged by one transport during one request."""
+
+    def __init__(self, cloud_logger):
+        self.batch = cloud_logger.batch()
+        self.approximate_bytes = 0
+
+    def commit(self):
+        total_logs = len(self.batch.entries)
+        try:
+            if total_logs > 0:
+                self.batch.commit()
+                _LOGGER.debug("Submitted %d logs", total_logs)
+        except Exception:
+            _LOGGER.error("Failed to submit %d logs.", total_logs, exc_info=True)
+
+
+class RequestBatchTransport(Transport):
+    """Transport that writes the logs of each request in a single API call.
+
+    Meant for serverless runtimes such as Cloud Run and Cloud Functions, where
+    CPU is throttled once the response is sent, so a background thread can't
+    be relied on. Entries are buffered for the duration of the request and
+    written before the response goes out, or earlier if the buffer grows past
+    ``max_batch_size`` entries or ``max_batch_bytes``.
+
+    Requests are tracked by
+    :class:`~logging_v2.handlers.middleware.RequestMiddleware` (Django),
+    :class:`~logging_v2.handlers.middleware.WSGIRequestMiddleware` (Flask
+    and other WSGI applications) or
+    :class:`~logging_v2.handlers.middleware.ASGIRequestMiddleware`. Entries
+    logged outside of a request are written immediately, as with
+    :class:`~logging_v2.handlers.transports.SyncTransport`.
+    """
+
+    def __init__(
+        self,
+        client,
+        name,
+        *,
+        resource=_GLOBAL_RESOURCE,
+        max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
+        max_batch_bytes=_DEFAULT_MAX_BATCH_BYTES,
+        **kwargs,
+    ):
+        """
+        Args:
+            client (~logging_v2.client.Client):
+                The Logging client.
+            name (str): The name of the logger.
+            resource (Optional[Resource|dict]): The default monitored resource to
+                associate with logs when not specified
+            max_batch_size (Optional[int]): The number of buffered entries that
+                triggers a write before the request ends.
+            max_batch_bytes (Optional[int]): The approximate payload size of the
+                buffered entries that triggers a write before the request ends.
+        """
+        self.client = client
+        self.logger = client.logger(name, resource=resource)
+        self._max_batch_size = max_batch_size
+        self._max_batch_bytes = max_batch_bytes
+
+    def send(self, record, message, **kwargs):
+        """Overrides Transport.send().
+
+        Args:
+            record (logging.LogRecord): Python log record that the handler was called with.
+            message (str or dict): The message from the ``LogRecord`` after being
+                formatted by the associated log formatters.
+            kwargs: Additional optional arguments for the logger
+        """
+        # set python logger name as label if missing
+        labels = kwargs.pop("labels", {})
+        if record.name:
+            labels["python_logger"] = labels.get("python_logger", record.name)
+        severity = _helpers._normalize_severity(record.levelno)
+
+        scope = _get_request_scope()
+        if scope is None:
+            self.logger.log(message, severity=severity, labels=labels, **kwargs)
+            return
+
+        pending = scope.get_batch(self, lambda: _RequestBatch(self.logger))
+        pending.batch.log(
+            message,
+            severity=severity,
+            labels=labels,
+            timestamp=datetime.datetime.utcfromtimestamp(record.created),
+            **kwargs,
+        )
+        pending.approximate_bytes += _approximate_size(message)
+        if (
+            len(pending.batch.entries) >= self._max_batch_size
+            or pending.approximate_bytes >= self._max_batch_bytes
+        ):
+            if scope.pop_batch(self) is pending:
+                pending.commit()
+
+    def flush(self):
+        """Write the entries buffered for the current request."""
+        scope = _get_request_scope()
+        if scope is None:
+            return
+        pending = scope.pop_batch(self)
+        if pending is not None:
+            pending.commit()
@@ -53,6 +53,17 @@ _OUTBOUND_ENTRY_FIELDS = (  # (name, default)
 _STRUCT_EXTRACTABLE_FIELDS = ["severity", "trace", "span_id"]
 
 
+def _entry_class_for(message):
+    """Return the entry class matching the type of ``message``."""
+    if isinstance(message, google.protobuf.message.Message):
+        return ProtobufEntry
+    if isinstance(message, collections.abc.Mapping):
+        return StructEntry
+    if isinstance(message, str):
+        return TextEntry
+    return LogEntry
+
+
 class Logger(object):
     """Loggers represent named targets for log entries.
 
@@ -68,19 +79,34 @@ class Logger(object):
                 for the logger (which requires a project).
             resource (Optional[~logging_v2.Resource]): a monitored resource object
                 representing the resource the code was run on. If not given, will
-                be inferred from the environment.
+                be inferred from the environment the first time it is needed.
             labels (Optional[dict]): Mapping of default labels for entries written
                 via this logger.
 
         """
-        if not resource:
-            # infer the correct monitored resource from the local environment
-            resource = detect_resource(client.project)
         self.name = name
         self._client = client
         self.labels = labels
         self.default_resource = resource
 
+    @property
+    def default_resource(self):
+        """Monitored resource attached to entries written via this logger.
+
+        Inferred from the local environment on first access if the logger was
+        created without a resource, so loggers that are never written to (such
+        as those attached to entries read from the API) never query the
+        metadata server.
+        """
+        if not self._default_resource:
+            # infer the correct monitored resource from the local environment
+            self._default_resource = detect_resource(self._client.project)
+        return self._default_resource
+
+    @default_resource.setter
+    def default_resource(self, resource):
+        self._default_resource = resource
+
     @property
     def client(self):
         """Clent bound to the logger."""
@@ -117,24 +143,45 @@ class Logger(object):
             client = self._client
         return client
 
-    def batch(self, *, client=None):
+    def batch(self, *, client=None, apply_exclusions=True):
         """Return a batch to use as a context manager.
 
         Args:
             client (Union[None, ~logging_v2.client.Client]):
                 The client to use.  If not passed, falls back to the
                 ``client`` stored on the current sink.
+            apply_exclusions (Optional[bool]): If False, entries are not
+                checked against the client's local exclusions, for callers
+                that checked them already. Defaults to True.
 
         Returns:
             Batch: A batch to use as a context manager.
         """
         client = self._require_client(client)
-        return Batch(self, client)
+        return Batch(self, client, apply_exclusions=apply_exclusions)
 
     def _do_log(self, client, _entry_class, payload=None, **kw):
         """Helper for :meth:`log_empty`, :meth:`log_text`, etc."""
         client = self._require_client(client)
+        entries = self._make_entries(
+            _entry_class,
+            payload,
+            _exclusions=getattr(client, "local_exclusions", None),
+            **kw,
+        )
+        if not entries:
+            return
+        # partial_success is true to avoid dropping instrumentation logs
+        client.logging_api.write_entries(entries, partial_success=True)
+
+    def _make_entries(self, _entry_class, payload=None, _exclusions=None, **kw):
+        """Build the API representations of the entries written by :meth:`_do_log`.
 
+        Returns:
+            List[dict]: The entry, preceded by the instrumentation entry the
+            first time an entry is written by the process. Empty if the entry
+            matches one of ``_exclusions``.
+        """
         # Apply defaults
         kw["log_name"] = kw.pop("log_name", self.full_name)
         kw["labels"] = kw.pop("labels", self.labels)
@@ -159,13 +206,15 @@ class Logger(object):
         else:
             entry = _entry_class(**kw)
 
+        if _exclusions is not None and _exclusions.excluded(entry):
+            return []
+
         api_repr = entry.to_api_repr()
         entries = [api_repr]
         if google.cloud.logging_v2._instrumentation_emitted is False:
             entries = _add_instrumentation(entries, **kw)
             google.cloud.logging_v2._instrumentation_emitted = True
-        # partial_success is true to avoid dropping instrumentation logs
-        client.logging_api.write_entries(entries, partial_success=True)
+        return entries
 
     def log_empty(self, *, client=None, **kw):
         """Log an empty message
@@ -249,14 +298,12 @@ class Logger(object):
             kw (Optional[dict]): additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        if isinstance(message, google.protobuf.message.Message):
-            self.log_proto(message, client=client, **kw)
-        elif isinstance(message, collections.abc.Mapping):
+        entry_class = _entry_class_for(message)
+        if entry_class is StructEntry:
+            # also copies the entry fields found in the payload
             self.log_struct(message, client=client, **kw)
-        elif isinstance(message, str):
-            self.log_text(message, client=client, **kw)
         else:
-            self._do_log(client, LogEntry, message, **kw)
+            self._do_log(client, entry_class, message, **kw)
 
     def delete(self, logger_name=None, *, client=None):
         """Delete all entries in a logger via a DELETE request
@@ -296,6 +343,7 @@ class Logger(object):
         max_results=None,
         page_size=None,
         page_token=None,
+        prefetch_pages=0,
     ):
         """Return a generator of log entry resources.
 
@@ -327,6 +375,9 @@ class Logger(object):
                 one at a time. If not passed, defaults to a value set by the API.
             page_token (str): opaque marker for the starting "page" of entries. If not
                 passed, the API will return the first page of entries.
+            prefetch_pages (int): the number of pages fetched ahead in a background
+                thread while the current page is consumed, so that requests
+                overlap with processing. Disabled when 0.
         Returns:
             Generator[~logging_v2.LogEntry]
         """
@@ -334,24 +385,28 @@ class Logger(object):
         if resource_names is None:
             resource_names = [f"projects/{self.project}"]
 
-        log_filter = f"logName={self.full_name}"
-        if filter_ is not None:
-            filter_ = f"{filter_} AND {log_filter}"
-        else:
-            filter_ = log_filter
-        filter_ = _add_defaults_to_filter(filter_)
         return self.client.list_entries(
             resource_names=resource_names,
-            filter_=filter_,
+            filter_=self._entries_filter(filter_),
             order_by=order_by,
             max_results=max_results,
             page_size=page_size,
             page_token=page_token,
+            prefetch_pages=prefetch_pages,
         )
 
+    def _entries_filter(self, filter_):
+        """Restrict ``filter_`` to this logger's entries, with default time bounds."""
+        log_filter = f"logName={self.full_name}"
+        if filter_ is not None:
+            filter_ = f"{filter_} AND {log_filter}"
+        else:
+            filter_ = log_filter
+        return _add_defaults_to_filter(filter_)
+
 
 class Batch(object):
-    def __init__(self, logger, client, *, resource=None):
+    def __init__(self, logger, client, *, resource=None, apply_exclusions=True):
         """Context manager:  collect entries to log via a single API call.
 
         Helper returned by :meth:`Logger.batch`
@@ -369,11 +424,17 @@ class Batch(object):
                 resource type, this parameter is only required
                 if explicitly set to None. If no entries' resource are
                 set to None, this parameter will be ignored on the server.
+            apply_exclusions (Optional[bool]): If False, entries are not
+                checked against the client's local exclusions. Defaults to True.
         """
         self.logger = logger
         self.entries = []
         self.client = client
         self.resource = resource
+        self._exclusions = None
+        if apply_exclusions:
+            # only :class:`~logging_v2.client.Client` applies exclusions locally
+            self._exclusions = getattr(client, "local_exclusions", None)
 
     def __enter__(self):
         return self
@@ -389,7 +450,7 @@ class Batch(object):
             kw (Optional[dict]): Additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        self.entries.append(LogEntry(**kw))
+        self._append(LogEntry(**kw))
 
     def log_text(self, text, **kw):
         """Add a text entry to be logged during :meth:`commit`.
@@ -399,7 +460,7 @@ class Batch(object):
             kw (Optional[dict]): Additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        self.entries.append(TextEntry(payload=text, **kw))
+        self._append(TextEntry(payload=text, **kw))
 
     def log_struct(self, info, **kw):
         """Add a struct entry to be logged during :meth:`commit`.
@@ -409,7 +470,7 @@ class Batch(object):
             kw (Optional[dict]): Additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        self.entries.append(StructEntry(payload=info, **kw))
+        self._append(StructEntry(payload=info, **kw))
 
     def log_proto(self, message, **kw):
         """Add a protobuf entry to be logged during :meth:`commit`.
@@ -419,7 +480,7 @@ class Batch(object):
             kw (Optional[dict]): Additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        self.entries.append(ProtobufEntry(payload=message, **kw))
+        self._append(ProtobufEntry(payload=message, **kw))
 
     def log(self, message=None, **kw):
         """Add an arbitrary message to be logged during :meth:`commit`.
@@ -430,14 +491,15 @@ class Batch(object):
             kw (Optional[dict]): Additional keyword arguments for the entry.
                 See :class:`~logging_v2.entries.LogEntry`.
         """
-        entry_type = LogEntry
-        if isinstance(message, google.protobuf.message.Message):
-            entry_type = ProtobufEntry
-        elif isinstance(message, collections.abc.Mapping):
-            entry_type = StructEntry
-        elif isinstance(message, str):
-            entry_type = TextEntry
-        self.entries.append(entry_type(payload=message, **kw))
+        self._append(_entry_class_for(message)(payload=message, **kw))
+
+    def _append(self, entry):
+        """Add an entry, unless it matches one of the client's exclusions."""
+        if self._exclusions is not None and self._exclusions.excluded(
+            entry, self.logger
+        ):
+            return
+        self.entries.append(entry)
 
     def commit(self, *, client=None, partial_success=True):
         """Send saved log entries as a single API call.
@@ -454,15 +516,7 @@ class Batch(object):
         if client is None:
             client = self.client
 
-        kwargs = {"logger_name": self.logger.full_name}
-
-        if self.resource is not None:
-            kwargs["resource"] = self.resource._to_dict()
-
-        if self.logger.labels is not None:
-            kwargs["labels"] = self.logger.labels
-
-        entries = [entry.to_api_repr() for entry in self.entries]
+        entries, kwargs = self._prepare_write()
         try:
             client.logging_api.write_entries(
                 entries, partial_success=partial_success, **kwargs
@@ -474,6 +528,24 @@ class Batch(object):
             raise e
         del self.entries[:]
 
+    def _prepare_write(self):
+        """Build the entries and default fields sent by :meth:`commit`.
+
+        Returns:
+            Tuple[List[dict], dict]: The entries' API representations and the
+            keyword arguments for ``write_entries``.
+        """
+        kwargs = {"logger_name": self.logger.full_name}
+
+        if self.resource is not None:
+            kwargs["resource"] = self.resource._to_dict()
+
+        if self.logger.labels is not None:
+            kwargs["labels"] = self.logger.labels
+
+        entries = [entry.to_api_repr() for entry in self.entries]
+        return entries, kwargs
+
     def _append_context_to_error(self, err):
         """
         Attempts to Modify `write_entries` exception messages to contain
@@ -45,6 +45,10 @@ dependencies = [
     "proto-plus >= 1.22.2, <2.0.0dev; python_version>='3.11'",
     "protobuf>=3.19.5,<5.0.0dev,!=3.20.0,!=3.20.1,!=4.21.0,!=4.21.1,!=4.21.2,!=4.21.3,!=4.21.4,!=4.21.5",
 ]
+extras = {
+    "pandas": ["numpy >= 1.17.0", "pandas >= 1.0.0"],
+    "pyarrow": ["numpy >= 1.17.0", "pyarrow >= 3.0.0"],
+}
 url = "https://github.com/googleapis/python-logging"
 
 package_root = os.path.abspath(os.path.dirname(__file__))
@@ -91,6 +95,12 @@ setuptools.setup(
     python_requires=">=3.7",
     namespace_packages=namespaces,
     install_requires=dependencies,
+    extras_require=extras,
+    entry_points={
+        "console_scripts": [
+            "google-cloud-logging-export = google.cloud.logging_v2._export:main",
+        ],
+    },
     include_package_data=True,
     zip_safe=False,
 )
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logging
+import subprocess
+import sys
 import unittest
 import mock
 import time
@@ -31,6 +34,7 @@ from google.cloud.logging_v2.services.logging_service_v2.transports import (
 )
 from google.cloud.logging_v2.handlers.transports import BackgroundThreadTransport
 from google.cloud.logging_v2.handlers.transports import SyncTransport
+from google.cloud.logging.handlers import CloudLoggingFilter
 from google.cloud.logging.handlers import CloudLoggingHandler
 from google.cloud.logging.handlers import StructuredLogHandler
 from google.cloud.logging_v2._http import _LoggingAPI
@@ -50,6 +54,29 @@ _payloads = [
     ("small", "json", _small_json_payload),
     ("large", "json", _large_json_payload),
 ]
+# modules that should only be imported once they are needed
+_deferred_modules = [
+    "flask",
+    "google.cloud.audit.audit_log_pb2",
+    "google.cloud.appengine_logging",
+    "google.iam.v1.logging.audit_data_pb2",
+    "google.cloud.logging_v2._gapic",
+    "google.cloud.logging_v2.services.logging_service_v2",
+    "numpy",
+    "pandas",
+    "pyarrow",
+]
+_import_script = f"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import {{module}}
+exec_time = time.perf_counter() - start
+loaded = [name for name in {_deferred_modules!r} if name in sys.modules]
+print(json.dumps({{{{"exec_time": exec_time, "loaded": loaded}}}}))
+"""
 
 
 class MockGRPCTransport(LoggingServiceV2Transport):
@@ -196,6 +223,32 @@ class TestPerformance(unittest.TestCase):
         total_time = self._print_results(pr, results, time_limit, "Client Init")
         self.assertLessEqual(total_time, time_limit)
 
+    def test_import_performance(self, time_limit=2):
+        """
+        Test the time taken to import the library in a fresh interpreter,
+        and that heavy dependencies are not imported until they are used
+
+        tested variations:
+        - top-level package vs handlers package
+        """
+        results = []
+        pr = cProfile.Profile()
+
+        def profiled_code(module):
+            output = subprocess.check_output(
+                [sys.executable, "-c", _import_script.format(module=module)]
+            )
+            return json.loads(output)
+
+        for module in ["google.cloud.logging", "google.cloud.logging.handlers"]:
+            _, output = instrument_function(module, profiler=pr)(profiled_code)
+            self.assertEqual(output["loaded"], [])
+            result_dict = {"module": module, "exec_time": output["exec_time"]}
+            results.append(result_dict)
+        # print results dataframe
+        total_time = self._print_results(pr, results, time_limit, "Import")
+        self.assertLessEqual(total_time, time_limit)
+
     def test_structured_logging_performance(self, time_limit=12):
         """
         Test the performance of StructuredLoggingHandler
@@ -230,6 +283,44 @@ class TestPerformance(unittest.TestCase):
         )
         self.assertLessEqual(total_time, time_limit)
 
+    def test_cloud_logging_filter_performance(self, time_limit=2):
+        """
+        Test the performance of CloudLoggingFilter
+
+        tested variations:
+        - structured vs unstructured output
+        - small vs large http requests
+        """
+        results = []
+        pr = cProfile.Profile()
+
+        def profiled_code(log_filter, http_request, num_logs=5000):
+            for i in range(num_logs):
+                record = logging.LogRecord(
+                    "filter", logging.ERROR, __file__, 1, "hello world", None, None
+                )
+                record.http_request = http_request
+                log_filter.filter(record)
+
+        for structured_str, structured in [("structured", True), ("api", False)]:
+            log_filter = CloudLoggingFilter(project="my-project", structured=structured)
+            for request_size, http_request in [
+                ("small", {"requestMethod": "GET"}),
+                ("large", {f"key_{i}": "abcdefghij" * 10 for i in range(50)}),
+            ]:
+                exec_time, _ = instrument_function(
+                    log_filter, http_request, profiler=pr
+                )(profiled_code)
+                result_dict = {
+                    "output_type": structured_str,
+                    "request_size": request_size,
+                    "exec_time": exec_time,
+                }
+                results.append(result_dict)
+        # print results dataframe
+        total_time = self._print_results(pr, results, time_limit, "CloudLoggingFilter")
+        self.assertLessEqual(total_time, time_limit)
+
     def test_cloud_logging_handler_performance(self, time_limit=30):
         """
         Test the performance of CloudLoggingHandler
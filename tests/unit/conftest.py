@@ -0,0 +1,25 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata_cache():
+    """Resource detection caches metadata per process. Reset it for each test."""
+    from google.cloud.logging_v2.handlers import _monitored_resources
+
+    _monitored_resources._reset_metadata_cache()
+    yield
+    _monitored_resources._reset_metadata_cache()
@@ -0,0 +1,138 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import mock
+
+
+def _make_scope(headers=(), scope_type="http"):
+    return {
+        "type": scope_type,
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": "/",
+        "query_string": b"",
+        "headers": list(headers),
+        "server": ("example.com", 443),
+    }
+
+
+class TestASGIRequestMiddleware(unittest.TestCase):
+    def _get_target_class(self):
+        from google.cloud.logging_v2.handlers.middleware import asgi
+
+        return asgi.ASGIRequestMiddleware
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_process_request(self):
+        from google.cloud.logging_v2.handlers.middleware import asgi
+
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(asgi._get_asgi_request_data())
+
+        middleware = self._make_one(app)
+        header = b"4bf92f3577b34da6a3ce929d0e0e4736/00f067aa0ba902b7;o=1"
+        scope = _make_scope(headers=[(b"x-cloud-trace-context", header)])
+        asyncio.run(middleware(scope, None, None))
+
+        self.assertEqual(len(seen), 1)
+        http_request, trace_id, span_id, sampled = seen[0]
+        self.assertEqual(http_request["requestMethod"], "GET")
+        self.assertEqual(trace_id, "4bf92f3577b34da6a3ce929d0e0e4736")
+        self.assertEqual(span_id, "00f067aa0ba902b7")
+        self.assertTrue(sampled)
+        # request data is cleared once the request completes
+        self.assertIsNone(asgi._get_asgi_request_data())
+
+    def test_concurrent_requests_are_isolated(self):
+        from google.cloud.logging_v2.handlers.middleware import asgi
+
+        seen = {}
+
+        async def app(scope, receive, send):
+            await asyncio.sleep(0)
+            seen[scope["path"]] = asgi._get_asgi_request_data()[0]["requestUrl"]
+
+        middleware = self._make_one(app)
+
+        async def run_all():
+            first = _make_scope()
+            first["path"] = "/first"
+            second = _make_scope()
+            second["path"] = "/second"
+            await asyncio.gather(
+                middleware(first, None, None), middleware(second, None, None)
+            )
+
+        asyncio.run(run_all())
+
+        self.assertEqual(seen["/first"], "https://example.com:443/first")
+        self.assertEqual(seen["/second"], "https://example.com:443/second")
+
+    def test_flushes_before_response_completes(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        events = []
+        batch = mock.Mock(spec=["commit"])
+        batch.commit.side_effect = lambda: events.append("commit")
+
+        async def app(scope, receive, send):
+            _request_scope._get_request_scope().get_batch("key", lambda: batch)
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"a", "more_body": True})
+            await send({"type": "http.response.body", "body": b"b"})
+
+        async def send(message):
+            events.append(message.get("body"))
+
+        middleware = self._make_one(app)
+        asyncio.run(middleware(_make_scope(), None, send))
+
+        self.assertEqual(events, [None, b"a", "commit", b"b"])
+        self.assertIsNone(_request_scope._get_request_scope())
+
+    def test_flushes_logs_after_response(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        batch = mock.Mock(spec=["commit"])
+
+        async def app(scope, receive, send):
+            _request_scope._get_request_scope().get_batch("key", lambda: batch)
+
+        middleware = self._make_one(app)
+        asyncio.run(middleware(_make_scope(), None, None))
+
+        batch.commit.assert_called_once_with()
+
+    def test_non_http_scope_passthrough(self):
+        from google.cloud.logging_v2.handlers.middleware import asgi
+
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(asgi._get_asgi_request_data())
+            return "response"
+
+        middleware = self._make_one(app)
+        result = asyncio.run(middleware({"type": "lifespan"}, None, None))
+
+        self.assertEqual(result, "response")
+        self.assertEqual(seen, [None])
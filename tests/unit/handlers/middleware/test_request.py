@@ -60,6 +60,21 @@ class TestRequestMiddleware(DjangoBase):
         django_request = request._get_django_request()
         self.assertEqual(django_request, mock_request)
 
+    def test_flushes_request_scope(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        batch = mock.Mock(spec=["commit"])
+
+        def get_response(request):
+            _request_scope._get_request_scope().get_batch("key", lambda: batch)
+            return request
+
+        middleware = self._make_one(get_response)
+        self.assertEqual(middleware("test_req"), "test_req")
+
+        batch.commit.assert_called_once_with()
+        self.assertIsNone(_request_scope._get_request_scope())
+
     def test_can_instantiate_middleware_without_kwargs(self):
         middleware = self._make_one(self._mock_get_response)
         mock_request = "test_req"
@@ -0,0 +1,59 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestWSGIRequestMiddleware(unittest.TestCase):
+    def _get_target_class(self):
+        from google.cloud.logging_v2.handlers.middleware import wsgi
+
+        return wsgi.WSGIRequestMiddleware
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_flushes_request_scope(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        batch = mock.Mock(spec=["commit"])
+
+        def app(environ, start_response):
+            scope = _request_scope._get_request_scope()
+            scope.get_batch("key", lambda: batch)
+            return [b"response"]
+
+        middleware = self._make_one(app)
+        result = middleware({}, None)
+
+        self.assertEqual(result, [b"response"])
+        batch.commit.assert_called_once_with()
+        self.assertIsNone(_request_scope._get_request_scope())
+
+    def test_flushes_on_error(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        batch = mock.Mock(spec=["commit"])
+
+        def app(environ, start_response):
+            _request_scope._get_request_scope().get_batch("key", lambda: batch)
+            raise ValueError("boom")
+
+        middleware = self._make_one(app)
+        with self.assertRaises(ValueError):
+            middleware({}, None)
+
+        batch.commit.assert_called_once_with()
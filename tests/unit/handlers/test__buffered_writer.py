@@ -0,0 +1,121 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class Test_BufferedWriter(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging_v2.handlers._buffered_writer import _BufferedWriter
+
+        return _BufferedWriter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_write_without_thread_is_synchronous(self):
+        stream = _Stream()
+        writer = self._make_one(stream)
+
+        writer.write("line\n")
+
+        self.assertEqual(stream.writes, ["line\n"])
+        self.assertEqual(stream.flushes, 1)
+
+    def test_batches_respect_max_write_size(self):
+        stream = _Stream()
+        writer = self._make_one(stream, max_write_size=10)
+        for line in ["aaaa\n", "bbbb\n", "cccc\n", "d" * 20 + "\n"]:
+            writer._buffer.append(line)
+
+        writer.flush()
+
+        self.assertEqual(stream.writes, ["aaaa\nbbbb\n", "cccc\n", "d" * 20 + "\n"])
+
+    def test_batches_count_encoded_bytes(self):
+        stream = _Stream()
+        writer = self._make_one(stream, max_write_size=8)
+        for line in ["嗨\n", "嗨\n", "嗨\n"]:
+            writer._buffer.append(line)
+
+        writer.flush()
+
+        self.assertEqual(stream.writes, ["嗨\n嗨\n", "嗨\n"])
+
+    def test_start_stop(self):
+        stream = _Stream()
+        writer = self._make_one(stream, max_latency=60)
+
+        with mock.patch("atexit.register") as register:
+            writer.start()
+        self.assertTrue(writer.is_alive)
+        register.assert_called_once_with(writer._main_thread_terminated)
+
+        writer.write("first\n")
+        writer.write("second\n")
+        with mock.patch("atexit.unregister") as unregister:
+            self.assertTrue(writer.stop(grace_period=5))
+        unregister.assert_called_once_with(writer._main_thread_terminated)
+
+        self.assertFalse(writer.is_alive)
+        self.assertEqual(stream.writes, ["first\nsecond\n"])
+
+    def test_batch_size_wakes_thread(self):
+        stream = _Stream()
+        writer = self._make_one(stream, max_latency=60, batch_size=2)
+        writer._thread = mock.Mock(spec=["is_alive"])
+        writer._thread.is_alive.return_value = True
+
+        writer.write("first\n")
+        self.assertFalse(writer._wakeup.is_set())
+        writer.write("second\n")
+        self.assertTrue(writer._wakeup.is_set())
+        self.assertEqual(stream.writes, [])
+
+    def test_full_buffer_written_by_caller(self):
+        stream = _Stream()
+        writer = self._make_one(stream, max_latency=60, max_buffer_size=2)
+        writer._thread = mock.Mock(spec=["is_alive"])
+        writer._thread.is_alive.return_value = True
+
+        writer.write("first\n")
+        self.assertEqual(stream.writes, [])
+        writer.write("second\n")
+        self.assertEqual(stream.writes, ["first\nsecond\n"])
+
+    def test_write_error(self):
+        stream = mock.Mock(spec=["write", "flush"])
+        stream.write.side_effect = ValueError("closed")
+        writer = self._make_one(stream)
+
+        with mock.patch("traceback.print_exc") as print_exc:
+            writer.write("line\n")
+
+        print_exc.assert_called_once()
+        self.assertEqual(len(writer._buffer), 0)
+
+
+class _Stream(object):
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def flush(self):
+        self.flushes += 1
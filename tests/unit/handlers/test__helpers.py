@@ -256,6 +256,102 @@ class Test_get_request_data_from_django(unittest.TestCase):
         self.assertEqual(http_request["protocol"], "HTTP/1.1")
 
 
+class Test_get_request_data_from_asgi_scope(unittest.TestCase):
+    @staticmethod
+    def _call_fut(scope):
+        from google.cloud.logging_v2.handlers import _helpers
+
+        http, trace, span, sampled = _helpers.get_request_data_from_asgi_scope(scope)
+        return http, trace, span, sampled
+
+    @staticmethod
+    def _make_scope(headers=()):
+        return {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "https",
+            "root_path": "",
+            "path": "/path",
+            "query_string": b"q=1",
+            "headers": list(headers),
+            "server": ("127.0.0.1", 8000),
+        }
+
+    def test_no_context_header(self):
+        http_request, trace_id, span_id, sampled = self._call_fut(self._make_scope())
+
+        self.assertIsNone(trace_id)
+        self.assertIsNone(span_id)
+        self.assertEqual(sampled, False)
+        self.assertEqual(http_request["requestMethod"], "GET")
+
+    def test_xcloud_header(self):
+        expected_trace_id = "asgi0id"
+        expected_span_id = "span0asgi"
+        header = f"{expected_trace_id}/{expected_span_id};o=1".encode()
+
+        scope = self._make_scope(headers=[(b"x-cloud-trace-context", header)])
+        http_request, trace_id, span_id, sampled = self._call_fut(scope)
+
+        self.assertEqual(trace_id, expected_trace_id)
+        self.assertEqual(span_id, expected_span_id)
+        self.assertEqual(sampled, True)
+
+    def test_traceparent_header(self):
+        expected_trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        expected_span_id = "00f067aa0ba902b7"
+        header = f"00-{expected_trace_id}-{expected_span_id}-01".encode()
+
+        scope = self._make_scope(headers=[(b"traceparent", header)])
+        http_request, trace_id, span_id, sampled = self._call_fut(scope)
+
+        self.assertEqual(trace_id, expected_trace_id)
+        self.assertEqual(span_id, expected_span_id)
+        self.assertEqual(sampled, True)
+
+    def test_http_request_populated(self):
+        expected_agent = "Mozilla/5.0"
+        headers = [(b"host", b"example.com"), (b"user-agent", expected_agent.encode())]
+
+        http_request, *_ = self._call_fut(self._make_scope(headers=headers))
+
+        self.assertEqual(http_request["requestMethod"], "GET")
+        self.assertEqual(http_request["requestUrl"], "https://example.com/path?q=1")
+        self.assertEqual(http_request["userAgent"], expected_agent)
+        self.assertEqual(http_request["protocol"], "HTTP/1.1")
+
+    def test_http_request_sparse(self):
+        http_request, *_ = self._call_fut({"type": "http", "method": "GET"})
+
+        self.assertEqual(http_request["requestMethod"], "GET")
+        self.assertIsNone(http_request["requestUrl"])
+        self.assertIsNone(http_request["userAgent"])
+        self.assertIsNone(http_request["protocol"])
+
+
+class Test_get_request_data_from_asgi(unittest.TestCase):
+    @staticmethod
+    def _call_fut():
+        from google.cloud.logging_v2.handlers import _helpers
+
+        http, trace, span, sampled = _helpers.get_request_data_from_asgi()
+        return http, trace, span, sampled
+
+    def test_without_request(self):
+        self.assertEqual(self._call_fut(), (None, None, None, False))
+
+    def test_with_request(self):
+        from google.cloud.logging_v2.handlers.middleware import asgi
+
+        expected = (_FLASK_HTTP_REQUEST, _FLASK_TRACE_ID, _FLASK_SPAN_ID, True)
+        token = asgi._asgi_request_data.set(expected)
+        try:
+            self.assertEqual(self._call_fut(), expected)
+        finally:
+            asgi._asgi_request_data.reset(token)
+
+
 class Test_get_request_data(unittest.TestCase):
     @staticmethod
     def _call_fut():
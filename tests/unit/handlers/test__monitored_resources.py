@@ -352,3 +352,179 @@ class Test_Resource_Detection(unittest.TestCase):
             # project id not returned from metadata serve
             # should be empty string
             self.assertEqual(resource.labels["project_id"], "")
+
+
+class Test_Metadata_Cache(unittest.TestCase):
+    PROJECT = "test-project"
+
+    def setUp(self):
+        os.environ.clear()
+
+    def test_lookups_cached_per_process(self):
+        patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources.retrieve_metadata_server",
+            return_value=None,
+        )
+        with patch as retrieve_mock:
+            detect_resource(self.PROJECT)
+            detect_resource(self.PROJECT)
+
+        self.assertEqual(
+            sorted(call.args[0] for call in retrieve_mock.call_args_list),
+            sorted(_monitored_resources._METADATA_KEYS),
+        )
+
+    def test_lookups_deadline(self):
+        import threading
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_metadata(endpoint):
+            if endpoint == _monitored_resources._PROJECT_NAME:
+                release.wait()
+                return self.PROJECT
+            return "value"
+
+        retrieve_patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources.retrieve_metadata_server",
+            wraps=slow_metadata,
+        )
+        deadline_patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources._METADATA_DEADLINE",
+            new=0.1,
+        )
+        with retrieve_patch, deadline_patch:
+            values = _monitored_resources._fetch_metadata()
+
+        self.assertNotIn(_monitored_resources._PROJECT_NAME, values)
+        self.assertEqual(values[_monitored_resources._ZONE_ID], "value")
+
+    def test_timed_out_lookups_finish_in_background(self):
+        import tempfile
+        import threading
+        import time
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_path = os.path.join(directory.name, "metadata.json")
+        os.environ[_monitored_resources._METADATA_CACHE_ENV] = cache_path
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_metadata(endpoint):
+            if endpoint == _monitored_resources._GKE_CLUSTER_NAME:
+                release.wait()
+                return "cluster"
+            return None
+
+        retrieve_patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources.retrieve_metadata_server",
+            wraps=slow_metadata,
+        )
+        deadline_patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources._METADATA_DEADLINE",
+            new=0.1,
+        )
+        with retrieve_patch as retrieve_mock, deadline_patch:
+            started = time.monotonic()
+            first = detect_resource(self.PROJECT)
+            second = detect_resource(self.PROJECT)
+            elapsed = time.monotonic() - started
+
+            # a single deadline, and the lookups are not started again
+            self.assertEqual(first.type, "global")
+            self.assertEqual(second, first)
+            self.assertLess(elapsed, 1)
+            self.assertEqual(
+                retrieve_mock.call_count, len(_monitored_resources._METADATA_KEYS)
+            )
+            self.assertFalse(os.path.exists(cache_path))
+
+            # the late value replaces None when it arrives
+            release.set()
+            for _ in range(100):
+                if not _monitored_resources._metadata_pending:
+                    break
+                time.sleep(0.01)
+            resource = detect_resource(self.PROJECT)
+
+        self.assertEqual(resource.type, "k8s_container")
+        self.assertEqual(
+            retrieve_mock.call_count, len(_monitored_resources._METADATA_KEYS)
+        )
+        self.assertEqual(
+            _monitored_resources._read_metadata_file(cache_path),
+            {
+                **dict.fromkeys(_monitored_resources._METADATA_KEYS),
+                _monitored_resources._GKE_CLUSTER_NAME: "cluster",
+            },
+        )
+
+    def test_detected_resource_memoized(self):
+        from google.cloud.logging_v2.resource import Resource
+
+        patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources._detect_resource",
+            return_value=Resource(type="global", labels={"project_id": "p"}),
+        )
+        with patch as detect_mock:
+            first = detect_resource(self.PROJECT)
+            first.labels["changed"] = "yes"
+            second = detect_resource(self.PROJECT)
+
+        detect_mock.assert_called_once_with(self.PROJECT)
+        self.assertEqual(second.labels, {"project_id": "p"})
+
+    def test_disk_cache(self):
+        import tempfile
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_path = os.path.join(directory.name, "metadata.json")
+        os.environ[_monitored_resources._METADATA_CACHE_ENV] = cache_path
+
+        patch = mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources.retrieve_metadata_server",
+            return_value="TRUE",
+        )
+        with patch as retrieve_mock:
+            resource = detect_resource(self.PROJECT)
+            self.assertEqual(resource.type, "k8s_container")
+            self.assertTrue(os.path.exists(cache_path))
+
+            # a new process reads the values back from disk
+            _monitored_resources._reset_metadata_cache()
+            retrieve_mock.reset_mock()
+            resource = detect_resource(self.PROJECT)
+
+        self.assertEqual(resource.type, "k8s_container")
+        retrieve_mock.assert_not_called()
+
+    def test_disk_cache_expired(self):
+        import tempfile
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_path = os.path.join(directory.name, "metadata.json")
+        _monitored_resources._write_metadata_file(
+            cache_path, dict.fromkeys(_monitored_resources._METADATA_KEYS, "TRUE")
+        )
+        os.utime(cache_path, (0, 0))
+
+        self.assertIsNone(_monitored_resources._read_metadata_file(cache_path))
+
+    def test_failed_write_removes_temp_file(self):
+        import tempfile
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # the cache file cannot replace a directory
+        cache_path = os.path.join(directory.name, "metadata")
+        os.mkdir(cache_path)
+
+        _monitored_resources._write_metadata_file(
+            cache_path, dict.fromkeys(_monitored_resources._METADATA_KEYS)
+        )
+
+        self.assertEqual(os.listdir(directory.name), ["metadata"])
@@ -0,0 +1,72 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class Test_RequestScope(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging_v2.handlers._request_scope import _RequestScope
+
+        return _RequestScope
+
+    def _make_one(self):
+        return self._get_target_class()()
+
+    def test_get_batch(self):
+        scope = self._make_one()
+        factory = mock.Mock(return_value=mock.sentinel.batch)
+
+        self.assertFalse(scope.pending)
+        self.assertIs(scope.get_batch("key", factory), mock.sentinel.batch)
+        self.assertIs(scope.get_batch("key", factory), mock.sentinel.batch)
+
+        factory.assert_called_once_with()
+        self.assertTrue(scope.pending)
+
+    def test_pop_batch(self):
+        scope = self._make_one()
+        scope.get_batch("key", lambda: mock.sentinel.batch)
+
+        self.assertIs(scope.pop_batch("key"), mock.sentinel.batch)
+        self.assertIsNone(scope.pop_batch("key"))
+        self.assertFalse(scope.pending)
+
+    def test_flush(self):
+        scope = self._make_one()
+        first = scope.get_batch("first", mock.Mock)
+        second = scope.get_batch("second", mock.Mock)
+
+        scope.flush()
+        scope.flush()
+
+        first.commit.assert_called_once_with()
+        second.commit.assert_called_once_with()
+        self.assertFalse(scope.pending)
+
+
+class Test_request_scope(unittest.TestCase):
+    def test_enter_exit(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        self.assertIsNone(_request_scope._get_request_scope())
+        token = _request_scope._enter_request_scope()
+        scope = _request_scope._get_request_scope()
+        self.assertIsInstance(scope, _request_scope._RequestScope)
+
+        self.assertIs(_request_scope._exit_request_scope(token), scope)
+        self.assertIsNone(_request_scope._get_request_scope())
@@ -0,0 +1,176 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+
+class Test_RotatingFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "app.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging_v2.handlers._rotating_file import _RotatingFile
+
+        return _RotatingFile
+
+    def _make_one(self, *args, **kw):
+        file_ = self._get_target_class()(*args, **kw)
+        self.addCleanup(file_.close)
+        return file_
+
+    def _read(self, filename):
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "rt", encoding="utf-8") as file_:
+            return file_.read()
+
+    def test_write_appends(self):
+        with open(self.filename, "w") as existing:
+            existing.write("existing\n")
+        file_ = self._make_one(self.filename)
+
+        file_.write("first\n")
+        file_.write("嗨\n")
+
+        self.assertEqual(self._read(self.filename), "existing\nfirst\n嗨\n")
+
+    def test_no_rotation_without_backups(self):
+        file_ = self._make_one(self.filename, max_bytes=1)
+
+        file_.write("first\n")
+        file_.write("second\n")
+
+        self.assertEqual(self._read(self.filename), "first\nsecond\n")
+        self.assertFalse(os.path.exists(self.filename + ".1"))
+
+    def test_rotate_by_size(self):
+        file_ = self._make_one(self.filename, max_bytes=10, backup_count=2)
+
+        for line in ["aaaaaaaaaa\n", "bbbbbbbbbb\n", "cccccccccc\n", "d\n"]:
+            file_.write(line)
+
+        self.assertEqual(self._read(self.filename), "d\n")
+        self.assertEqual(self._read(self.filename + ".1"), "cccccccccc\n")
+        self.assertEqual(self._read(self.filename + ".2"), "bbbbbbbbbb\n")
+        self.assertFalse(os.path.exists(self.filename + ".3"))
+
+    def test_rotate_by_time(self):
+        file_ = self._make_one(self.filename, rotation_interval=60, backup_count=1)
+
+        rotated_at = os.stat(self.filename + ".lock").st_mtime
+
+        file_.write("first\n")
+        with mock.patch("time.time", return_value=rotated_at + 61):
+            file_.write("second\n")
+        file_.write("third\n")
+
+        self.assertEqual(self._read(self.filename), "third\n")
+        self.assertEqual(self._read(self.filename + ".1"), "first\nsecond\n")
+
+    def test_rotate_by_time_shared_by_writers(self):
+        file_ = self._make_one(self.filename, rotation_interval=60, backup_count=1)
+        file_.write("first\n")
+        # the file was last rotated long ago, by an earlier process
+        os.utime(self.filename + ".lock", (0, 0))
+
+        other = self._make_one(self.filename, rotation_interval=60, backup_count=1)
+        other.write("second\n")
+        file_.write("third\n")
+
+        self.assertEqual(self._read(self.filename), "third\n")
+        self.assertEqual(self._read(self.filename + ".1"), "first\nsecond\n")
+
+    def test_rotate_compressed(self):
+        file_ = self._make_one(
+            self.filename, max_bytes=1, backup_count=2, compress=True
+        )
+
+        file_.write("first\n")
+        file_.write("second\n")
+
+        self.assertEqual(self._read(self.filename + ".1.gz"), "second\n")
+        self.assertEqual(self._read(self.filename + ".2.gz"), "first\n")
+        self.assertFalse(os.path.exists(self.filename + ".1"))
+
+    @unittest.skipIf(os.name != "posix", "requires fcntl")
+    def test_compress_outside_lock(self):
+        import fcntl
+
+        file_ = self._make_one(
+            self.filename, max_bytes=1, backup_count=1, compress=True
+        )
+        gzip_open = gzip.open
+        lock_states = []
+
+        def check_lock(*args, **kw):
+            with open(self.filename + ".lock") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock_states.append("held")
+                else:
+                    lock_states.append("free")
+            return gzip_open(*args, **kw)
+
+        with mock.patch("gzip.open", new=check_lock):
+            file_.write("first\n")
+
+        self.assertEqual(lock_states, ["free"])
+        self.assertEqual(self._read(self.filename + ".1.gz"), "first\n")
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ["app.log", "app.log.1.gz", "app.log.lock"],
+        )
+
+    def test_compress_after_rotation_by_other_writer(self):
+        file_ = self._make_one(
+            self.filename, max_bytes=1, backup_count=2, compress=True
+        )
+        other = self._make_one(
+            self.filename, max_bytes=1, backup_count=2, compress=True
+        )
+        compress_backup = file_._compress_backup
+
+        def rotate_first(source):
+            # another writer rotates while the first backup is compressed
+            other.write("second\n")
+            compress_backup(source)
+
+        with mock.patch.object(file_, "_compress_backup", new=rotate_first):
+            file_.write("first\n")
+
+        self.assertEqual(self._read(self.filename + ".1.gz"), "second\n")
+        self.assertEqual(self._read(self.filename + ".2.gz"), "first\n")
+        self.assertFalse(os.path.exists(self.filename + ".1"))
+        self.assertFalse(os.path.exists(self.filename + ".2"))
+
+    def test_reopen_after_rotation_by_other_writer(self):
+        file_ = self._make_one(self.filename, max_bytes=10, backup_count=1)
+        other = self._make_one(self.filename, max_bytes=10, backup_count=1)
+
+        file_.write("aaaaaaaaaa\n")
+        other.write("second\n")
+
+        self.assertEqual(self._read(self.filename), "second\n")
+        self.assertEqual(self._read(self.filename + ".1"), "aaaaaaaaaa\n")
@@ -128,6 +128,94 @@ class TestCloudLoggingFilter(unittest.TestCase):
         self.assertIsNone(record._labels)
         self.assertEqual(record._labels_str, "{}")
 
+    def test_filter_record_unstructured(self):
+        """
+        test structured=False skips the string representations
+        """
+        import logging
+
+        filter_obj = self._make_one(structured=False)
+        logname = "loggername"
+        record = logging.LogRecord(
+            logname, logging.INFO, "testpath", 1, "hello", None, None
+        )
+
+        success = filter_obj.filter(record)
+        self.assertTrue(success)
+
+        self.assertEqual(record._labels, {"python_logger": logname})
+        self.assertEqual(record._source_location["line"], 1)
+        self.assertFalse(hasattr(record, "_labels_str"))
+        self.assertFalse(hasattr(record, "_source_location_str"))
+        self.assertFalse(hasattr(record, "_http_request_str"))
+        self.assertFalse(hasattr(record, "_trace_str"))
+
+    def test_callsite_metadata_cached(self):
+        """
+        test records from the same call site reuse prebuilt metadata
+        """
+        import logging
+
+        filter_obj = self._make_one(default_labels={"default": "label"})
+
+        def make_record():
+            return logging.LogRecord(
+                "loggername", logging.INFO, "testpath", 1, "hello", None, None
+            )
+
+        first, second = make_record(), make_record()
+        second.labels = {"user": "label"}
+        filter_obj.filter(first)
+        filter_obj.filter(second)
+
+        self.assertEqual(filter_obj._get_source_location.cache_info().hits, 1)
+        self.assertEqual(first._source_location, second._source_location)
+        self.assertEqual(first._source_location_str, second._source_location_str)
+        self.assertEqual(
+            first._labels, {"python_logger": "loggername", "default": "label"}
+        )
+        self.assertEqual(
+            second._labels,
+            {"python_logger": "loggername", "default": "label", "user": "label"},
+        )
+        self.assertEqual(second._labels_str, json.dumps(second._labels))
+
+    def test_default_labels_updated(self):
+        import logging
+
+        filter_obj = self._make_one(default_labels={"a": "1"})
+
+        def make_record():
+            return logging.LogRecord("n", logging.INFO, "testpath", 1, "hi", None, None)
+
+        filter_obj.filter(make_record())
+        filter_obj.default_labels["b"] = "2"
+        record = make_record()
+        filter_obj.filter(record)
+
+        expected = {"python_logger": "n", "a": "1", "b": "2"}
+        self.assertEqual(record._labels, expected)
+        self.assertEqual(record._labels_str, json.dumps(expected))
+
+    def test_records_do_not_share_metadata(self):
+        import logging
+
+        filter_obj = self._make_one(default_labels={"a": "1"})
+
+        def make_record():
+            return logging.LogRecord("n", logging.INFO, "testpath", 1, "hi", None, None)
+
+        first = make_record()
+        filter_obj.filter(first)
+        first._labels["mut"] = 1
+        first._source_location["mut"] = 1
+        second = make_record()
+        filter_obj.filter(second)
+
+        self.assertEqual(second._labels, {"python_logger": "n", "a": "1"})
+        self.assertNotIn("mut", second._source_location)
+        self.assertEqual(filter_obj.default_labels, {"a": "1"})
+
     def test_record_with_request(self):
         """
         test filter adds http request data when available
@@ -324,6 +412,7 @@ class TestCloudLoggingHandler(unittest.TestCase):
             self.assertEqual(handler.resource, global_resource)
             self.assertIsNone(handler.labels)
             self.assertIs(handler.stream, sys.stderr)
+            self.assertFalse(handler.filters[0].structured)
 
     def test_ctor_explicit(self):
         import io
@@ -351,6 +440,50 @@ class TestCloudLoggingHandler(unittest.TestCase):
         self.assertEqual(handler.labels, labels)
         self.assertIs(handler.stream, stream)
 
+    def test_ctor_does_not_resolve_credentials(self):
+        import google.auth.credentials
+        from google.cloud.logging import Client
+        from google.cloud.logging_v2.handlers.transports import SyncTransport
+
+        credentials = mock.Mock(spec=google.auth.credentials.Credentials)
+        default = mock.Mock(return_value=(credentials, self.PROJECT))
+        retrieve = mock.Mock(return_value=None)
+        with mock.patch("google.auth.default", new=default), mock.patch(
+            "google.cloud.logging_v2.handlers._monitored_resources.retrieve_metadata_server",
+            new=retrieve,
+        ):
+            client = Client(defer_credentials=True)
+            handler = self._make_one(client, transport=SyncTransport)
+
+            default.assert_not_called()
+            retrieve.assert_not_called()
+            self.assertEqual(handler.project_id, self.PROJECT)
+            self.assertEqual(handler.resource.type, "global")
+            default.assert_called_once()
+
+    def test_ctor_w_warm_up(self):
+        from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+
+        client = mock.Mock(project=self.PROJECT, spec=["project", "warm_up"])
+        self._make_one(
+            client, transport=_Transport, resource=_GLOBAL_RESOURCE, warm_up=True
+        )
+        client.warm_up.assert_called_once_with(block=False)
+
+    def test_ctor_w_apply_exclusions(self):
+        from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+
+        client = mock.Mock(
+            project=self.PROJECT, spec=["project", "_enable_local_exclusions"]
+        )
+        self._make_one(
+            client,
+            transport=_Transport,
+            resource=_GLOBAL_RESOURCE,
+            apply_exclusions=True,
+        )
+        client._enable_local_exclusions.assert_called_once_with()
+
     def test_emit(self):
         from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
 
@@ -94,6 +94,99 @@ class TestStructuredLogHandler(unittest.TestCase):
             f"result dictionary has unexpected keys: {result.keys()}",
         )
 
+    def test_format_matches_gcp_format(self):
+        import logging
+        from google.cloud.logging_v2.handlers.structured_log import GCP_FORMAT
+
+        handler = self._make_one(labels={"default_key": "default-value"})
+        record = logging.LogRecord(
+            "loggername",
+            logging.INFO,
+            "testpath",
+            1,
+            'hello "world"',
+            None,
+            None,
+            func="test-function",
+        )
+        handler.filter(record)
+        result = handler.format(record)
+
+        record._payload_str = '"message": "hello \\"world\\"",'
+        expected = logging.Formatter(GCP_FORMAT).formatMessage(record)
+        self.assertEqual(result, expected)
+
+    def test_format_dict_input_unmodified(self):
+        import logging
+
+        handler = self._make_one()
+        message = {"severity": "error", "extra": "still here"}
+        record = logging.LogRecord(None, logging.INFO, None, None, message, None, None)
+        handler.filter(record)
+        result = handler.format(record)
+
+        self.assertIn('"extra": "still here"', result)
+        self.assertEqual(message, {"severity": "error", "extra": "still here"})
+
+    def test_buffered_emit(self):
+        import io
+        import logging
+
+        stream = io.StringIO()
+        handler = self._make_one(stream=stream, buffered=True, max_latency=60)
+        self.assertTrue(handler._writer.is_alive)
+        record = logging.LogRecord(
+            "loggername", logging.INFO, None, None, "hello", None, None
+        )
+        handler.filter(record)
+
+        handler.emit(record)
+        self.assertEqual(stream.getvalue(), "")
+
+        handler.flush()
+        self.assertTrue(stream.getvalue().endswith(handler.format(record) + "\n"))
+
+        handler.close()
+        self.assertFalse(handler._writer.is_alive)
+
+    def test_buffered_options(self):
+        import io
+
+        handler = self._make_one(
+            stream=io.StringIO(), buffered=True, batch_size=7, max_write_size=1024
+        )
+        self.addCleanup(handler.close)
+
+        self.assertEqual(handler._writer._batch_size, 7)
+        self.assertEqual(handler._writer._max_write_size, 1024)
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            self._make_one(projet_id="PROJECT")
+
+    def test_file_output(self):
+        import logging
+        import os
+        import tempfile
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        filename = os.path.join(directory.name, "app.log")
+        handler = self._make_one(filename=filename, max_latency=60)
+        self.assertTrue(handler._writer.is_alive)
+        record = logging.LogRecord(
+            "loggername", logging.INFO, None, None, "hello", None, None
+        )
+        handler.filter(record)
+
+        handler.emit(record)
+        handler.close()
+
+        with open(filename, encoding="utf-8") as log_file:
+            lines = log_file.read().splitlines()
+        self.assertEqual(lines[-1], handler.format(record))
+        self.assertFalse(handler._writer.is_alive)
+
     def test_format_minimal(self):
         import logging
         import json
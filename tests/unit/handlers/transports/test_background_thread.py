@@ -46,6 +46,14 @@ class TestBackgroundThreadHandler(unittest.TestCase):
         (logger,) = worker.call_args[0]  # call_args[0] is *args.
         self.assertEqual(logger.name, name)
 
+    def test_constructor_w_exclusions(self):
+        client = _Client(self.PROJECT)
+        client.local_exclusions = mock.sentinel.exclusions
+
+        transport, worker = self._make_one(client, "python_logger")
+
+        self.assertIs(worker.call_args[1]["exclusions"], mock.sentinel.exclusions)
+
     def test_send(self):
         from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
 
@@ -319,6 +327,31 @@ class Test_Worker(unittest.TestCase):
         self.assertNotIn("http_request", entry.keys())
         self.assertEqual(entry["labels"], {"python_logger": "testing"})
 
+    def test_enqueue_excluded(self):
+        from google.cloud.logging import StructEntry
+        from google.cloud.logging import TextEntry
+
+        exclusions = mock.Mock(spec=["excluded"])
+        exclusions.excluded.side_effect = lambda entry, logger: isinstance(
+            entry, TextEntry
+        )
+        logger = _Logger(self.NAME)
+        worker = self._make_one(logger, exclusions=exclusions)
+
+        self._enqueue_record(worker, "dropped", trace="TRACE")
+        self._enqueue_record(worker, {"kept": True})
+
+        entry = worker._queue.get_nowait()
+        self.assertEqual(entry["message"], {"kept": True})
+        self.assertTrue(worker._queue.empty())
+        ((dropped, dropped_logger), _) = exclusions.excluded.call_args_list[0]
+        self.assertEqual(dropped.payload, "dropped")
+        self.assertEqual(dropped.trace, "TRACE")
+        self.assertEqual(dropped.labels, {"python_logger": "testing"})
+        self.assertIs(dropped_logger, logger)
+        ((kept, _), _) = exclusions.excluded.call_args_list[1]
+        self.assertIsInstance(kept, StructEntry)
+
     def test_enqueue_explicit(self):
         import datetime
         from google.cloud.logging_v2._helpers import LogSeverity
@@ -367,6 +400,18 @@ class Test_Worker(unittest.TestCase):
         self.assertEqual(worker._cloud_logger._batch.commit_count, 2)
         self.assertEqual(worker._queue.qsize(), 0)
 
+    def test__thread_main_skips_batch_exclusions(self):
+        from google.cloud.logging_v2.handlers.transports import background_thread
+
+        worker = self._make_one(_Logger(self.NAME))
+        self._enqueue_record(worker, "1")
+        worker._queue.put_nowait(background_thread._WORKER_TERMINATOR)
+
+        worker._thread_main()
+
+        # entries are checked once, when queued
+        self.assertFalse(worker._cloud_logger._batch.apply_exclusions)
+
     def test__thread_main_error(self):
         from google.cloud.logging_v2.handlers.transports import background_thread
 
@@ -547,8 +592,9 @@ class _Logger(object):
         self._num_batches = 0
         self.resource = resource
 
-    def batch(self):
+    def batch(self, apply_exclusions=True):
         self._batch = self._batch_cls()
+        self._batch.apply_exclusions = apply_exclusions
         self._num_batches += 1
         return self._batch
 
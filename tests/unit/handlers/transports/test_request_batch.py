@@ -0,0 +1,167 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import unittest
+
+import mock
+
+
+class TestRequestBatchTransport(unittest.TestCase):
+    PROJECT = "PROJECT"
+
+    def setUp(self):
+        import google.cloud.logging_v2
+
+        # instrumentation is covered by the logger tests
+        google.cloud.logging_v2._instrumentation_emitted = True
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging.handlers.transports import RequestBatchTransport
+
+        return RequestBatchTransport
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_record(self, message, name="mylogger"):
+        return logging.LogRecord(name, logging.INFO, None, None, message, None, None)
+
+    def _enter_request(self):
+        from google.cloud.logging_v2.handlers import _request_scope
+
+        token = _request_scope._enter_request_scope()
+        self.addCleanup(_request_scope._current_scope.reset, token)
+        return _request_scope._get_request_scope()
+
+    def test_ctor(self):
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python_logger")
+        self.assertEqual(transport.logger.name, "python_logger")
+        self.assertIs(transport.client, client)
+
+    def test_send_outside_request(self):
+        from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+        from google.cloud.logging_v2._helpers import LogSeverity
+
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python")
+
+        transport.send(self._make_record("hello"), "hello", resource=_GLOBAL_RESOURCE)
+
+        self.assertEqual(len(client.logging_api.calls), 1)
+        (entry,) = client.logging_api.calls[0][0]
+        self.assertEqual(entry["textPayload"], "hello")
+        self.assertEqual(entry["severity"], LogSeverity.INFO)
+
+    def test_send_batched_until_request_ends(self):
+        from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python")
+        scope = self._enter_request()
+
+        for message in ["first", {"message": "second"}]:
+            transport.send(
+                self._make_record(message), message, resource=_GLOBAL_RESOURCE
+            )
+        self.assertEqual(client.logging_api.calls, [])
+        self.assertTrue(scope.pending)
+
+        scope.flush()
+
+        self.assertEqual(len(client.logging_api.calls), 1)
+        entries, kwargs = client.logging_api.calls[0]
+        self.assertEqual(entries[0]["textPayload"], "first")
+        self.assertEqual(entries[1]["jsonPayload"], {"message": "second"})
+        self.assertEqual(entries[0]["labels"], {"python_logger": "mylogger"})
+        self.assertIn("timestamp", entries[0])
+        self.assertEqual(kwargs["logger_name"], f"projects/{self.PROJECT}/logs/python")
+        self.assertFalse(scope.pending)
+
+    def test_send_flushes_on_batch_size(self):
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python", max_batch_size=2)
+        scope = self._enter_request()
+
+        for message in ["first", "second", "third"]:
+            transport.send(self._make_record(message), message)
+
+        self.assertEqual(len(client.logging_api.calls), 1)
+        self.assertEqual(len(client.logging_api.calls[0][0]), 2)
+        scope.flush()
+        self.assertEqual(len(client.logging_api.calls), 2)
+        self.assertEqual(client.logging_api.calls[1][0][0]["textPayload"], "third")
+
+    def test_send_flushes_on_batch_bytes(self):
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python", max_batch_bytes=10)
+        self._enter_request()
+
+        transport.send(self._make_record("short"), "short")
+        self.assertEqual(client.logging_api.calls, [])
+        transport.send(self._make_record("longer"), "longer")
+
+        self.assertEqual(len(client.logging_api.calls), 1)
+        self.assertEqual(len(client.logging_api.calls[0][0]), 2)
+
+    def test_flush(self):
+        client = _Client(self.PROJECT)
+        transport = self._make_one(client, "python")
+        transport.flush()
+
+        self._enter_request()
+        transport.send(self._make_record("hello"), "hello")
+        transport.flush()
+
+        self.assertEqual(len(client.logging_api.calls), 1)
+
+    def test_commit_error_is_logged(self):
+        client = _Client(self.PROJECT)
+        client.logging_api.error = ValueError("boom")
+        transport = self._make_one(client, "python")
+        scope = self._enter_request()
+        transport.send(self._make_record("hello"), "hello")
+
+        with mock.patch(
+            "google.cloud.logging_v2.handlers.transports.request_batch._LOGGER"
+        ) as logger:
+            scope.flush()
+
+        logger.error.assert_called_once_with(
+            "Failed to submit %d logs.", 1, exc_info=True
+        )
+
+
+class _LoggingAPI(object):
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    def write_entries(self, entries, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.calls.append((entries, kwargs))
+
+
+class _Client(object):
+    def __init__(self, project):
+        self.project = project
+        self.logging_api = _LoggingAPI()
+
+    def logger(self, name, resource=None):
+        from google.cloud.logging_v2.logger import Logger
+
+        return Logger(name, self, resource=resource)
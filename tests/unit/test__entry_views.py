@@ -0,0 +1,185 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+import unittest
+
+import mock
+
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.json_format import ParseDict
+
+PROJECT = "PROJECT"
+LOG_NAME = f"projects/{PROJECT}/logs/syslog"
+
+
+def _make_entry_pb(**kw):
+    from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+
+    mapping = {"logName": LOG_NAME}
+    mapping.update(kw)
+    return ParseDict(mapping, LogEntryPB.pb(LogEntryPB()))
+
+
+def _make_client():
+    client = mock.Mock(project=PROJECT, spec=["project", "logger"])
+    client.logger.side_effect = lambda name: mock.Mock(name=name)
+    return client
+
+
+class Test_entry_view_from_pb(unittest.TestCase):
+    FULL = {
+        "insertId": "IID",
+        "labels": {"foo": "bar"},
+        "severity": "WARNING",
+        "httpRequest": {"requestMethod": "GET", "status": 200},
+        "timestamp": "2016-12-31T00:01:02.999999999Z",
+        "receiveTimestamp": "2016-12-31T00:01:03Z",
+        "resource": {"type": "gae_app", "labels": {"module_id": "default"}},
+        "trace": "projects/PROJECT/traces/123",
+        "spanId": "456",
+        "traceSampled": True,
+        "sourceLocation": {"file": "main.py", "line": "12", "function": "f"},
+        "operation": {"id": "OP", "producer": "test", "first": True},
+    }
+
+    @staticmethod
+    def _call_fut(entry_pb, client, loggers=None):
+        from google.cloud.logging_v2._entry_views import entry_view_from_pb
+
+        return entry_view_from_pb(entry_pb, client, {} if loggers is None else loggers)
+
+    def _eager(self, entry_pb, client, loggers):
+        from google.cloud.logging_v2._gapic import _parse_log_entry
+        from google.cloud.logging_v2._helpers import entry_from_resource
+
+        entry_pb = copy.deepcopy(entry_pb)
+        return entry_from_resource(_parse_log_entry(entry_pb), client, loggers)
+
+    def test_matches_eager_entries(self):
+        from google.cloud.logging_v2.entries import LogEntry
+        from google.cloud.logging_v2.entries import ProtobufEntry
+        from google.cloud.logging_v2.entries import StructEntry
+        from google.cloud.logging_v2.entries import TextEntry
+        from google.cloud.logging_v2.entries import _register_proto_types
+
+        _register_proto_types()
+        payloads = [
+            ({"textPayload": "hello"}, TextEntry),
+            ({"jsonPayload": {"message": "hi", "n": 1}}, StructEntry),
+            (
+                {
+                    "protoPayload": {
+                        "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
+                        "methodName": "method",
+                    }
+                },
+                ProtobufEntry,
+            ),
+            ({}, LogEntry),
+        ]
+        for fields in (self.FULL, {}):
+            for payload, klass in payloads:
+                loggers = {}
+                client = _make_client()
+                entry_pb = _make_entry_pb(**fields, **payload)
+
+                view = self._call_fut(entry_pb, client, loggers)
+                eager = self._eager(entry_pb, client, loggers)
+
+                self.assertIsInstance(view, klass)
+                for field in view._fields:
+                    self.assertEqual(getattr(view, field), getattr(eager, field))
+                self.assertEqual(view.received_timestamp, eager.received_timestamp)
+                self.assertEqual(view, eager)
+                self.assertEqual(eager, view)
+                self.assertEqual(view.to_api_repr(), eager.to_api_repr())
+
+    def test_fields_decoded_on_access(self):
+        entry_pb = _make_entry_pb(
+            textPayload="hello", sourceLocation={"file": "main.py"}
+        )
+        view = self._call_fut(entry_pb, _make_client())
+
+        self.assertEqual(view._decoded, {})
+        self.assertEqual(view.payload, "hello")
+        self.assertEqual(view.source_location, {"file": "main.py", "line": None})
+        self.assertEqual(set(view._decoded), {"payload", "source_location"})
+        self.assertIs(view.source_location, view.source_location)
+
+    def test_logger_shared_through_cache(self):
+        client = _make_client()
+        loggers = {}
+        first = self._call_fut(_make_entry_pb(textPayload="a"), client, loggers)
+        second = self._call_fut(_make_entry_pb(textPayload="b"), client, loggers)
+
+        self.assertIs(first.logger, second.logger)
+        client.logger.assert_called_once_with("syslog")
+
+    def test_logger_unscoped_log_name(self):
+        entry_pb = _make_entry_pb(logName="organizations/123/logs/syslog")
+        view = self._call_fut(entry_pb, _make_client())
+
+        self.assertIsNone(view.logger)
+
+    def test_unknown_proto_payload(self):
+        from google.protobuf.any_pb2 import Any
+
+        entry_pb = _make_entry_pb()
+        entry_pb.proto_payload.type_url = "type.googleapis.com/unknown.Message"
+        entry_pb.proto_payload.value = b"\x08\x01"
+
+        view = self._call_fut(entry_pb, _make_client())
+
+        self.assertIsInstance(view.payload, Any)
+        self.assertIs(view.payload_pb, view.payload)
+
+    def test_tuple_protocol(self):
+        from google.cloud.logging_v2.entries import TextEntry
+
+        entry_pb = _make_entry_pb(textPayload="hello", insertId="IID")
+        view = self._call_fut(entry_pb, _make_client())
+
+        self.assertEqual(view[0], LOG_NAME)
+        self.assertEqual(view[-1], "hello")
+        self.assertIn("IID", view)
+        self.assertEqual(view._asdict()["insert_id"], "IID")
+        self.assertEqual(view._replace(insert_id="OTHER").insert_id, "OTHER")
+        self.assertTrue(repr(view).startswith("TextEntry(log_name="))
+
+        copied = copy.copy(view)
+        self.assertIs(type(copied), TextEntry)
+        self.assertEqual(copied, view)
+
+    def test_pickle(self):
+        from google.cloud.logging_v2.entries import TextEntry
+
+        entry_pb = _make_entry_pb(
+            textPayload="hello", receiveTimestamp="2016-12-31T00:01:03Z"
+        )
+        view = self._call_fut(entry_pb, None)
+        view._decoded["logger"] = None
+
+        restored = pickle.loads(pickle.dumps(view))
+
+        self.assertIs(type(restored), TextEntry)
+        self.assertEqual(restored, view)
+        self.assertEqual(restored.received_timestamp, view.received_timestamp)
+
+    def test_struct_payload(self):
+        entry_pb = _make_entry_pb(jsonPayload={"nested": {"list": [1, "two"]}})
+        view = self._call_fut(entry_pb, _make_client())
+
+        self.assertEqual(view.payload, MessageToDict(entry_pb.json_payload))
@@ -0,0 +1,114 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+PROJECT = "PROJECT"
+
+EXCLUSIONS = [
+    {"name": "debug", "filter": "severity<=DEBUG"},
+    {"name": "health", "filter": 'labels.path="/healthz"'},
+    {"name": "off", "filter": "severity<=INFO", "disabled": True},
+    {"name": "sampled", "filter": "sample(insertId, 0.5)"},
+]
+
+
+class Test_LocalExclusions(unittest.TestCase):
+    def _make_one(self, exclusions=EXCLUSIONS, **kw):
+        from google.cloud.logging_v2._exclusions import _LocalExclusions
+
+        self.client = mock.Mock(project=PROJECT, spec=["project", "sinks_api"])
+        self.client.sinks_api.list_exclusions.return_value = iter(exclusions)
+        return _LocalExclusions(self.client, **kw)
+
+    def _logger(self, labels=None):
+        from google.cloud.logging import Logger
+
+        return Logger("log", mock.Mock(project=PROJECT), labels=labels)
+
+    def test_refresh(self):
+        exclusions = self._make_one()
+
+        exclusions.refresh()
+
+        self.client.sinks_api.list_exclusions.assert_called_once_with(
+            f"projects/{PROJECT}"
+        )
+        # disabled exclusions and those the server must sample are skipped
+        self.assertEqual(exclusions.exclusions, ["debug", "health"])
+
+    def test_excluded(self):
+        from google.cloud.logging import TextEntry
+
+        exclusions = self._make_one()
+        entry = TextEntry(payload="text", severity="DEBUG")
+        self.assertFalse(exclusions.excluded(entry))
+
+        exclusions.refresh()
+
+        self.assertTrue(exclusions.excluded(entry))
+        self.assertTrue(exclusions.excluded(entry))
+        self.assertFalse(exclusions.excluded(entry._replace(severity="INFO")))
+        self.assertEqual(exclusions.dropped_counts, {"debug": 2})
+        self.assertEqual(exclusions.dropped, 2)
+
+    def test_excluded_w_logger_defaults(self):
+        from google.cloud.logging import TextEntry
+
+        exclusions = self._make_one(
+            [{"name": "log", "filter": 'log_id("log") AND labels.env=dev'}]
+        )
+        exclusions.refresh()
+        entry = TextEntry(payload="text", labels={"env": "dev"})
+
+        self.assertFalse(exclusions.excluded(entry))
+        self.assertTrue(exclusions.excluded(entry, self._logger()))
+        self.assertTrue(
+            exclusions.excluded(
+                entry._replace(labels=None), self._logger(labels={"env": "dev"})
+            )
+        )
+        # the entry's own labels take precedence
+        self.assertTrue(
+            exclusions.excluded(entry, self._logger(labels={"env": "prod"}))
+        )
+        self.assertFalse(
+            exclusions.excluded(
+                entry._replace(labels={"x": "y"}), self._logger(labels={"env": "prod"})
+            )
+        )
+
+    def test_thread(self):
+        exclusions = self._make_one(refresh_interval=60)
+
+        exclusions.start()
+        exclusions.start()
+        self.assertTrue(exclusions.stop(timeout=5))
+
+        self.assertFalse(exclusions.is_alive)
+        self.assertTrue(exclusions.stop())
+
+    def test_thread_main_error(self):
+        exclusions = self._make_one()
+        self.client.sinks_api.list_exclusions.side_effect = RuntimeError("down")
+
+        with mock.patch.object(exclusions._stopping, "wait") as wait:
+            wait.side_effect = lambda timeout: exclusions._stopping.set()
+            with self.assertLogs("google.cloud.logging_v2._exclusions", "WARNING"):
+                exclusions._thread_main()
+
+        wait.assert_called_once_with(300)
+        self.assertEqual(exclusions.exclusions, [])
@@ -0,0 +1,287 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+try:
+    import pyarrow
+except ImportError:  # pragma: NO COVER
+    pyarrow = None
+
+RESOURCE_NAMES = ["projects/PROJECT"]
+FILTER = 'severity>=ERROR AND timestamp>="2023-01-01T00:00:00Z"'
+
+
+def _resource(index):
+    return {
+        "logName": "projects/PROJECT/logs/log",
+        "insertId": f"id-{index}",
+        # two entries per second, to exercise insert ID tracking
+        "timestamp": f"2023-01-01T00:00:{index // 2:02d}.000000001Z",
+        "resource": {"type": "global", "labels": {"project_id": "PROJECT"}},
+        "textPayload": f"entry {index}",
+    }
+
+
+class _API(object):
+    """Serves ``entries`` in pages of ``page_size``, failing on request."""
+
+    def __init__(self, entries, page_size=2):
+        self.entries = entries
+        self.page_size = page_size
+        self.calls = []
+        self.fail_at_page = None
+        self.expired_tokens = set()
+
+    def _list_entry_pages(
+        self, resource_names, *, filter_, order_by, page_size, page_token=None
+    ):
+        from google.api_core.exceptions import InvalidArgument
+
+        self.calls.append((filter_, page_token))
+        if page_token in self.expired_tokens:
+            raise InvalidArgument("page token expired")
+        entries = self.entries
+        if "timestamp>=" in filter_ and filter_.startswith("("):
+            since = filter_.rsplit('timestamp>="', 1)[1].rstrip('"')
+            entries = [entry for entry in entries if entry["timestamp"] >= since]
+        start = int(page_token or 0)
+        while True:
+            if self.fail_at_page == start:
+                raise RuntimeError("connection lost")
+            end = start + self.page_size
+            next_page_token = str(end) if end < len(entries) else None
+            yield entries[start:end], next_page_token
+            if next_page_token is None:
+                return
+            start = end
+
+
+class Test__export_entries(unittest.TestCase):
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.destination)
+
+    def _call_fut(self, api, **kw):
+        from google.cloud.logging_v2._export import _export_entries
+
+        kw.setdefault("resource_names", RESOURCE_NAMES)
+        kw.setdefault("filter_", FILTER)
+        kw.setdefault("order_by", "timestamp asc")
+        kw.setdefault("page_size", 2)
+        return _export_entries(api, self.destination, **kw)
+
+    def _read_ndjson(self):
+        entries = []
+        for name in sorted(os.listdir(self.destination)):
+            if name.endswith(".ndjson.gz"):
+                with gzip.open(os.path.join(self.destination, name), "rt") as part:
+                    entries.extend(json.loads(line) for line in part)
+        return entries
+
+    def _checkpoint(self):
+        with open(os.path.join(self.destination, "_checkpoint.json")) as checkpoint:
+            return json.load(checkpoint)
+
+    def test_ndjson_parts(self):
+        resources = [_resource(index) for index in range(7)]
+        api = _API(resources)
+
+        count = self._call_fut(api, max_entries_per_file=3)
+
+        self.assertEqual(count, 7)
+        self.assertEqual(
+            sorted(os.listdir(self.destination)),
+            [
+                "_checkpoint.json",
+                "part-00000.ndjson.gz",
+                "part-00001.ndjson.gz",
+            ],
+        )
+        self.assertEqual(self._read_ndjson(), resources)
+        checkpoint = self._checkpoint()
+        self.assertTrue(checkpoint["done"])
+        self.assertEqual(checkpoint["files"], 2)
+        self.assertEqual(checkpoint["filter"], FILTER)
+
+    def test_resume_after_failure(self):
+        resources = [_resource(index) for index in range(7)]
+        api = _API(resources)
+        api.fail_at_page = 6
+
+        with self.assertRaises(RuntimeError):
+            self._call_fut(api, max_entries_per_file=3)
+
+        # the part being written when the export failed is discarded
+        self.assertEqual(
+            sorted(os.listdir(self.destination)),
+            ["_checkpoint.json", "part-00000.ndjson.gz"],
+        )
+        checkpoint = self._checkpoint()
+        self.assertFalse(checkpoint["done"])
+        self.assertEqual(checkpoint["page_token"], "4")
+        self.assertEqual(checkpoint["last_timestamp"], resources[3]["timestamp"])
+        self.assertEqual(checkpoint["last_insert_ids"], ["id-3", "id-2"])
+
+        api.fail_at_page = None
+        api.calls = []
+        count = self._call_fut(api, max_entries_per_file=3)
+
+        self.assertEqual(count, 7)
+        self.assertEqual(api.calls, [(FILTER, "4")])
+        self.assertEqual(self._read_ndjson(), resources)
+
+    def test_resume_with_expired_page_token(self):
+        resources = [_resource(index) for index in range(7)]
+        api = _API(resources)
+        api.fail_at_page = 4
+
+        with self.assertRaises(RuntimeError):
+            self._call_fut(api, max_entries_per_file=1)
+        self.assertEqual(self._checkpoint()["page_token"], "4")
+
+        api.fail_at_page = None
+        api.expired_tokens.add("4")
+        count = self._call_fut(api, max_entries_per_file=1)
+
+        self.assertEqual(count, 7)
+        self.assertEqual(
+            api.calls[-1][0], f'({FILTER}) AND timestamp>="{resources[3]["timestamp"]}"'
+        )
+        self.assertEqual(self._read_ndjson(), resources)
+
+    def test_finished_export(self):
+        api = _API([_resource(0)])
+        self.assertEqual(self._call_fut(api), 1)
+
+        api.calls = []
+        self.assertEqual(self._call_fut(api), 1)
+        self.assertEqual(api.calls, [])
+
+    def test_empty(self):
+        count = self._call_fut(_API([]))
+
+        self.assertEqual(count, 0)
+        self.assertEqual(os.listdir(self.destination), ["_checkpoint.json"])
+
+    def test_default_filter_is_kept(self):
+        api = _API([_resource(0)])
+
+        self._call_fut(api, filter_="severity>=ERROR")
+
+        ((filter_, _),) = api.calls
+        self.assertTrue(filter_.startswith("severity>=ERROR AND timestamp>="))
+        self.assertEqual(self._checkpoint()["filter"], filter_)
+
+    def test_checkpoint_of_other_export(self):
+        api = _API([_resource(0)])
+        self._call_fut(api)
+
+        with self.assertRaises(ValueError):
+            self._call_fut(api, filter_="severity>=WARNING")
+
+    def test_invalid_arguments(self):
+        for kw in ({"format_": "csv"}, {"max_entries_per_file": 0}):
+            with self.assertRaises(ValueError):
+                self._call_fut(_API([]), **kw)
+
+    def test_unknown_proto_payload(self):
+        from google.protobuf import any_pb2
+
+        resource = _resource(0)
+        resource["protoPayload"] = any_pb2.Any(type_url="example.com/Type", value=b"x")
+
+        self._call_fut(_API([resource]))
+
+        (exported,) = self._read_ndjson()
+        self.assertEqual(
+            exported["protoPayload"], {"@type": "example.com/Type", "value": "eA=="}
+        )
+
+    @unittest.skipIf(pyarrow is None, "requires pyarrow")
+    def test_parquet(self):  # pragma: NO COVER
+        import pyarrow.parquet
+
+        resources = [_resource(index) for index in range(5)]
+        resources[1].pop("timestamp")
+
+        self._call_fut(_API(resources), format_="parquet")
+
+        table = pyarrow.parquet.read_table(
+            os.path.join(self.destination, "part-00000.parquet")
+        )
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.column("insert_id").to_pylist()[0], "id-0")
+        self.assertIsNone(table.column("timestamp").to_pylist()[1])
+        self.assertEqual(
+            json.loads(table.column("resource_labels").to_pylist()[0]),
+            {"project_id": "PROJECT"},
+        )
+
+    @unittest.skipIf(pyarrow is None, "requires pyarrow")
+    def test_arrow(self):  # pragma: NO COVER
+        import pyarrow.ipc
+
+        self._call_fut(_API([_resource(index) for index in range(3)]), format_="arrow")
+
+        with pyarrow.ipc.open_file(
+            os.path.join(self.destination, "part-00000.arrow")
+        ) as reader:
+            self.assertEqual(reader.num_record_batches, 2)
+            table = reader.read_all()
+        self.assertEqual(table.column("text_payload").to_pylist()[2], "entry 2")
+
+
+class Test_main(unittest.TestCase):
+    def test_main(self):
+        from google.cloud.logging_v2._export import main
+
+        with mock.patch("google.cloud.logging_v2.client.Client") as client_class:
+            client = client_class.return_value
+            client.export_entries.return_value = 3
+            with mock.patch("builtins.print") as print_:
+                status = main(
+                    [
+                        "out",
+                        "--project",
+                        "PROJECT",
+                        "--filter",
+                        FILTER,
+                        "--format",
+                        "parquet",
+                        "--max-entries-per-file",
+                        "10",
+                    ]
+                )
+
+        self.assertEqual(status, 0)
+        client_class.assert_called_once_with(project="PROJECT")
+        client.export_entries.assert_called_once_with(
+            "out",
+            resource_names=None,
+            filter_=FILTER,
+            order_by="timestamp asc",
+            format_="parquet",
+            checkpoint_path=None,
+            page_size=1000,
+            max_entries_per_file=10,
+        )
+        print_.assert_called_once_with("exported 3 entries to out")
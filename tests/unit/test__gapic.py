@@ -183,6 +183,179 @@ class Test_LoggingAPI(unittest.TestCase):
         call.assert_called_once()
         assert call.call_args.args[0].log_name == self.LOG_PATH
 
+    def test_warm_up(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        with mock.patch("grpc.channel_ready_future") as ready:
+            self.assertTrue(client.warm_up(5))
+
+        ready.assert_called_once_with(client._gapic_api.transport.grpc_channel)
+        ready.return_value.result.assert_called_once_with(timeout=5)
+
+    def test_warm_up_timeout(self):
+        import grpc
+
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        with mock.patch("grpc.channel_ready_future") as ready:
+            ready.return_value.result.side_effect = grpc.FutureTimeoutError()
+            self.assertFalse(client.warm_up(5))
+
+        ready.return_value.cancel.assert_called_once_with()
+
+    def test_list_entries_lazy_views(self):
+        from google.cloud.logging_v2._entry_views import _TextEntryView
+
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        client._client._entry_loggers = {}
+        log_entry_msg = LogEntryPB(log_name=self.LOG_PATH, text_payload="text")
+        client._gapic_api.list_log_entries.return_value = [log_entry_msg]
+
+        (entry,) = list(client.list_entries([PROJECT_PATH]))
+
+        self.assertIsInstance(entry, _TextEntryView)
+        self.assertEqual(entry._decoded, {})
+        self.assertEqual(entry.payload, "text")
+        self.assertEqual(entry.log_name, self.LOG_PATH)
+
+    def test_list_entries_prefetch_pages(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        client._client._entry_loggers = {}
+        pages = [
+            logging_v2.types.ListLogEntriesResponse(
+                entries=[LogEntryPB(log_name=self.LOG_PATH, text_payload=text)]
+            )
+            for text in ("first", "second")
+        ]
+        client._gapic_api.list_log_entries.return_value.pages = iter(pages)
+
+        entries = list(client.list_entries([PROJECT_PATH], prefetch_pages=2))
+
+        self.assertEqual([entry.payload for entry in entries], ["first", "second"])
+
+    def test_list_entry_pages(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        pages = [
+            logging_v2.types.ListLogEntriesResponse(
+                entries=[LogEntryPB(log_name=self.LOG_PATH, text_payload="first")],
+                next_page_token="TOKEN",
+            ),
+            logging_v2.types.ListLogEntriesResponse(
+                entries=[LogEntryPB(log_name=self.LOG_PATH, text_payload="second")]
+            ),
+        ]
+        client._gapic_api.list_log_entries.return_value.pages = iter(pages)
+
+        result = list(
+            client._list_entry_pages(
+                [PROJECT_PATH], filter_="severity>=ERROR", page_token="START"
+            )
+        )
+
+        self.assertEqual(
+            result,
+            [
+                ([{"logName": self.LOG_PATH, "textPayload": "first"}], "TOKEN"),
+                ([{"logName": self.LOG_PATH, "textPayload": "second"}], None),
+            ],
+        )
+        request = client._gapic_api.list_log_entries.call_args.kwargs["request"]
+        self.assertEqual(request.filter, "severity>=ERROR")
+        self.assertEqual(request.page_token, "START")
+
+    def test_list_entries_negative_prefetch_pages(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+
+        with self.assertRaises(ValueError):
+            client.list_entries([PROJECT_PATH], prefetch_pages=-1)
+
+    def test_list_entries_raw(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        log_entry_msg = LogEntryPB(log_name=self.LOG_PATH, text_payload="text")
+        client._gapic_api.list_log_entries.return_value = [
+            log_entry_msg,
+            log_entry_msg,
+        ]
+
+        entries = list(client.list_entries([PROJECT_PATH], max_results=1, raw=True))
+
+        self.assertEqual(entries, [LogEntryPB.pb(log_entry_msg)])
+        client._client.logger.assert_not_called()
+
+    def test_tail_entries(self):
+        import datetime
+
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        client._client._entry_loggers = {}
+        response = logging_v2.types.TailLogEntriesResponse(
+            entries=[LogEntryPB(log_name=self.LOG_PATH, text_payload="text")]
+        )
+        client._gapic_api.tail_log_entries.return_value = iter([response])
+
+        tail = client.tail_entries(
+            [PROJECT_PATH], filter_="severity>=ERROR", buffer_window=5
+        )
+        entry = next(tail)
+
+        self.assertEqual(entry.payload, "text")
+        requests = client._gapic_api.tail_log_entries.call_args.kwargs["requests"]
+        (request,) = list(requests)
+        self.assertEqual(request.resource_names, [PROJECT_PATH])
+        self.assertEqual(request.filter, "severity>=ERROR")
+        self.assertEqual(request.buffer_window, datetime.timedelta(seconds=5))
+
+    def test_tail_entries_raw(self):
+        client = _gapic._LoggingAPI(mock.Mock(), mock.Mock())
+        entry_msg = LogEntryPB(log_name=self.LOG_PATH, text_payload="text")
+        client._gapic_api.tail_log_entries.return_value = iter(
+            [logging_v2.types.TailLogEntriesResponse(entries=[entry_msg])]
+        )
+
+        entry = next(client.tail_entries([PROJECT_PATH], raw=True))
+
+        self.assertEqual(entry, LogEntryPB.pb(entry_msg))
+        client._client.logger.assert_not_called()
+
+
+class Test_AsyncLoggingAPI(unittest.TestCase):
+    LOG_PATH = f"projects/{PROJECT}/logs/log_name"
+
+    def test_write_entries(self):
+        import asyncio
+
+        gapic_api = mock.Mock(spec=["write_log_entries"])
+        gapic_api.write_log_entries = mock.AsyncMock()
+        api = _gapic._AsyncLoggingAPI(gapic_api, mock.Mock())
+        entry = {
+            "logName": self.LOG_PATH,
+            "resource": {"type": "global"},
+            "textPayload": "text",
+        }
+
+        asyncio.run(api.write_entries([entry], partial_success=False))
+
+        request = gapic_api.write_log_entries.call_args.kwargs["request"]
+        assert request.partial_success is False
+        assert request.entries[0].text_payload == "text"
+
+    def test_list_entries_raw(self):
+        import asyncio
+
+        entry_pb = LogEntryPB(log_name=self.LOG_PATH, text_payload="text")
+
+        async def list_log_entries(request):
+            async def pager():
+                yield entry_pb
+
+            return pager()
+
+        gapic_api = mock.Mock(spec=["list_log_entries"])
+        gapic_api.list_log_entries.side_effect = list_log_entries
+        api = _gapic._AsyncLoggingAPI(gapic_api, mock.Mock())
+
+        async def collect():
+            return [entry async for entry in api.list_entries([PROJECT_PATH], raw=True)]
+
+        assert asyncio.run(collect()) == [LogEntryPB.pb(entry_pb)]
+
 
 class Test_SinksAPI(unittest.TestCase):
     SINK_NAME = "sink_name"
@@ -234,6 +407,23 @@ class Test_SinksAPI(unittest.TestCase):
         request = call.call_args.args[0]
         assert request.parent == self.PARENT_PATH
 
+    def test_list_exclusions(self):
+        from google.cloud.logging_v2.types import LogExclusion
+
+        api = _gapic._SinksAPI(mock.Mock(), mock.Mock())
+        api._gapic_api.list_exclusions.return_value = [
+            LogExclusion(name="debug", filter="severity<=DEBUG", disabled=True)
+        ]
+
+        (exclusion,) = list(api.list_exclusions(self.PARENT_PATH, page_size=10))
+
+        self.assertEqual(exclusion["name"], "debug")
+        self.assertEqual(exclusion["filter"], "severity<=DEBUG")
+        self.assertTrue(exclusion["disabled"])
+        request = api._gapic_api.list_exclusions.call_args.args[0]
+        self.assertEqual(request.parent, self.PARENT_PATH)
+        self.assertEqual(request.page_size, 10)
+
     def test_list_sinks_with_options(self):
         client = self.make_sinks_api()
 
@@ -598,6 +788,23 @@ class Test__parse_log_entry(unittest.TestCase):
             including_default_value_fields=False,
         )
 
+    @mock.patch("google.cloud.logging_v2._gapic.MessageToDict")
+    def test_registers_proto_types_on_failure(self, msg_to_dict_mock):
+        expected = {"protoPayload": {"@type": "type.googleapis.com/Example"}}
+        msg_to_dict_mock.side_effect = [TypeError, expected]
+        entry_pb = mock.Mock(spec=["HasField"])
+        entry_pb.HasField.return_value = True
+
+        with mock.patch(
+            "google.cloud.logging_v2._gapic._register_proto_types",
+            return_value=True,
+        ) as register:
+            result = self._call_fut(entry_pb)
+
+        self.assertIs(result, expected)
+        register.assert_called_once_with()
+        self.assertEqual(msg_to_dict_mock.call_count, 2)
+
     def test_unregistered_type(self):
         from google.protobuf import any_pb2
         from google.protobuf import descriptor_pool
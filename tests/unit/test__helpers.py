@@ -59,13 +59,123 @@ class Test_entry_from_resource(unittest.TestCase):
         self._payload_helper("protoPayload", "ProtobufEntry")
 
 
+class Test_entries_from_resources(unittest.TestCase):
+    @staticmethod
+    def _call_fut(resources, client, loggers):
+        from google.cloud.logging_v2._helpers import entries_from_resources
+
+        return entries_from_resources(resources, client, loggers)
+
+    def _resources(self, count):
+        resources = []
+        for index in range(count):
+            resource = {
+                "logName": "projects/PROJECT/logs/LOG",
+                "timestamp": f"2023-01-01T00:00:{index:02d}.123456789Z",
+                "receiveTimestamp": f"2023-01-01T00:01:{index:02d}Z",
+            }
+            if index % 2:
+                resource["textPayload"] = f"text {index}"
+            else:
+                resource["jsonPayload"] = {"index": index}
+            resources.append(resource)
+        resources[-1].pop("timestamp")
+        return resources
+
+    def _check(self, count):
+        from google.cloud.logging_v2._helpers import entry_from_resource
+
+        client = mock.Mock(project="PROJECT", spec=["project", "logger"])
+        loggers = {}
+
+        entries = self._call_fut(self._resources(count), client, loggers)
+        expected = [
+            entry_from_resource(resource, client, loggers)
+            for resource in self._resources(count)
+        ]
+
+        self.assertEqual(entries, expected)
+        self.assertEqual(
+            [entry.received_timestamp for entry in entries],
+            [entry.received_timestamp for entry in expected],
+        )
+        self.assertEqual(
+            entries[0].timestamp,
+            datetime(2023, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(entries[-1].timestamp)
+
+    def test_small_page(self):
+        self._check(3)
+
+    def test_bulk_page(self):
+        self._check(20)
+
+
+class Test_LoggerCache(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging_v2._helpers import _LoggerCache
+
+        return _LoggerCache
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_get_missing(self):
+        cache = self._make_one()
+        self.assertIsNone(cache.get("missing"))
+        self.assertIs(
+            cache.get("missing", mock.sentinel.default), mock.sentinel.default
+        )
+
+    def test_evicts_least_recently_used(self):
+        cache = self._make_one(maxsize=2)
+        cache["first"] = mock.sentinel.first
+        cache["second"] = mock.sentinel.second
+        # mark "first" as recently used
+        self.assertIs(cache.get("first"), mock.sentinel.first)
+
+        cache["third"] = mock.sentinel.third
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn("first", cache)
+        self.assertNotIn("second", cache)
+        self.assertIs(cache.get("third"), mock.sentinel.third)
+
+
 class Test_retrieve_metadata_server(unittest.TestCase):
+    def setUp(self):
+        # each test gets a session created with its own patches
+        patch = mock.patch(
+            "google.cloud.logging_v2._helpers._metadata_session", new=None
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
     @staticmethod
     def _call_fut(metadata_key):
         from google.cloud.logging_v2._helpers import retrieve_metadata_server
 
         return retrieve_metadata_server(metadata_key)
 
+    def test_session_shared(self):
+        from google.cloud.logging_v2._helpers import _get_metadata_session
+
+        requests_mock = mock.Mock()
+        requests_mock.Session.return_value.get.return_value = ResponseMock(
+            status_code=404
+        )
+        patch = mock.patch("google.cloud.logging_v2._helpers.requests", requests_mock)
+
+        with patch:
+            self._call_fut("first")
+            self._call_fut("second")
+            session = _get_metadata_session()
+
+        requests_mock.Session.assert_called_once_with()
+        self.assertEqual(session.get.call_count, 2)
+
     def test_metadata_exists(self):
         status_code_ok = 200
         response_text = "my-gke-cluster"
@@ -75,7 +185,7 @@ class Test_retrieve_metadata_server(unittest.TestCase):
         response_mock.text = response_text
 
         requests_mock = mock.Mock()
-        requests_mock.get.return_value = response_mock
+        requests_mock.Session.return_value.get.return_value = response_mock
         requests_mock.codes.ok = status_code_ok
 
         patch = mock.patch("google.cloud.logging_v2._helpers.requests", requests_mock)
@@ -93,7 +203,7 @@ class Test_retrieve_metadata_server(unittest.TestCase):
         response_mock = ResponseMock(status_code=status_code_not_found)
 
         requests_mock = mock.Mock()
-        requests_mock.get.return_value = response_mock
+        requests_mock.Session.return_value.get.return_value = response_mock
         requests_mock.codes.ok = status_code_ok
 
         patch = mock.patch("google.cloud.logging_v2._helpers.requests", requests_mock)
@@ -112,7 +222,7 @@ class Test_retrieve_metadata_server(unittest.TestCase):
         requests_get_mock = mock.Mock(spec=["__call__"])
         requests_get_mock.side_effect = requests.exceptions.RequestException
 
-        requests_get_patch = mock.patch("requests.get", requests_get_mock)
+        requests_get_patch = mock.patch("requests.Session.get", requests_get_mock)
 
         url_patch = mock.patch(
             "google.cloud.logging_v2._helpers.METADATA_URL", new=metadata_url
@@ -292,6 +292,123 @@ class Test_LoggingAPI(unittest.TestCase):
             called_with, {"method": "POST", "path": expected_path, "data": SENT}
         )
 
+    def test_list_entries_reuses_client_loggers(self):
+        from google.cloud.logging import Client
+
+        RETURNED = {
+            "entries": [
+                {
+                    "textPayload": "TEXT",
+                    "resource": {"type": "global"},
+                    "logName": f"projects/{self.PROJECT}/logs/{self.LOGGER_NAME}",
+                }
+            ]
+        }
+        client = Client(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=False
+        )
+        api = self._make_one(client)
+
+        with mock.patch(
+            "google.cloud.logging_v2.logger.detect_resource"
+        ) as detect_resource:
+            client._connection = _Connection(RETURNED)
+            (first,) = list(api.list_entries([self.PROJECT_PATH]))
+            client._connection = _Connection(RETURNED)
+            (second,) = list(api.list_entries([self.PROJECT_PATH]))
+
+        self.assertIs(first.logger, second.logger)
+        self.assertEqual(first.logger.name, self.LOGGER_NAME)
+        # reading entries does not query the environment
+        detect_resource.assert_not_called()
+
+    def test_list_entries_prefetch_pages(self):
+        from google.cloud.logging import Client
+        from google.cloud.logging import TextEntry
+
+        def _page(text, token=None):
+            page = {
+                "entries": [
+                    {
+                        "textPayload": text,
+                        "resource": {"type": "global"},
+                        "logName": f"projects/{self.PROJECT}/logs/{self.LOGGER_NAME}",
+                    }
+                ]
+            }
+            if token is not None:
+                page["nextPageToken"] = token
+            return page
+
+        client = Client(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=False
+        )
+        client._connection = _Connection(
+            _page("first", "TOKEN1"), _page("second", "TOKEN2"), _page("third")
+        )
+        api = self._make_one(client)
+
+        entries = list(
+            api.list_entries([self.PROJECT_PATH], prefetch_pages=1, max_results=2)
+        )
+
+        self.assertEqual([entry.payload for entry in entries], ["first", "second"])
+        self.assertIsInstance(entries[0], TextEntry)
+
+    def test_list_entry_pages(self):
+        from google.cloud.logging import Client
+
+        def _page(text, token=None):
+            page = {"entries": [{"textPayload": text}]}
+            if token is not None:
+                page["nextPageToken"] = token
+            return page
+
+        client = Client(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=False
+        )
+        client._connection = _Connection(_page("first", "TOKEN"), _page("second"))
+        api = self._make_one(client)
+
+        pages = list(api._list_entry_pages([self.PROJECT_PATH], page_size=1))
+
+        self.assertEqual(
+            pages,
+            [
+                ([{"textPayload": "first"}], "TOKEN"),
+                ([{"textPayload": "second"}], None),
+            ],
+        )
+        self.assertEqual(client._connection._called_with["data"]["pageToken"], "TOKEN")
+
+    def test_tail_entries(self):
+        from google.cloud.logging_v2._tail import _PolledTail
+
+        api = self._make_one(mock.Mock(_entry_loggers={}))
+        resources = [{"logName": "projects/p/logs/log", "textPayload": "text"}]
+
+        with mock.patch.object(api, "_list_entry_pages") as list_pages:
+            tail = api.tail_entries([self.PROJECT_PATH], filter_="severity>=ERROR")
+            tail._list_pages('timestamp>="2023-01-01T00:00:00Z"')
+            (entry,) = tail._make_entries(resources)
+
+        self.assertIsInstance(tail, _PolledTail)
+        list_pages.assert_called_once_with(
+            [self.PROJECT_PATH],
+            filter_='timestamp>="2023-01-01T00:00:00Z"',
+            order_by="timestamp asc",
+            page_size=1000,
+        )
+        self.assertEqual(entry.payload, "text")
+        with self.assertRaises(ValueError):
+            api.tail_entries([self.PROJECT_PATH], raw=True)
+
+    def test_list_entries_raw(self):
+        api = self._make_one(mock.Mock())
+
+        with self.assertRaises(ValueError):
+            api.list_entries([self.PROJECT_PATH], raw=True)
+
     def test_write_entries_single(self):
         TEXT = "TEXT"
         ENTRY = {
@@ -465,6 +582,29 @@ class Test_SinksAPI(unittest.TestCase):
             },
         )
 
+    def test_list_exclusions(self):
+        RETURNED = {
+            "exclusions": [
+                {"name": "debug", "filter": "severity<=DEBUG"},
+                {"name": "off", "filter": "severity<=INFO", "disabled": True},
+            ]
+        }
+        conn = _Connection(RETURNED)
+        client = _Client(conn)
+        api = self._make_one(client)
+
+        exclusions = list(api.list_exclusions(self.PROJECT_PATH, page_size=10))
+
+        self.assertEqual(exclusions, RETURNED["exclusions"])
+        self.assertEqual(
+            conn._called_with,
+            {
+                "method": "GET",
+                "path": f"/{self.PROJECT_PATH}/exclusions",
+                "query_params": {"pageSize": 10},
+            },
+        )
+
     def test_sink_create_conflict(self):
         from google.cloud.exceptions import Conflict
 
@@ -0,0 +1,227 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import datetime
+import re
+import threading
+import time
+import unittest
+
+START = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+END = START + datetime.timedelta(hours=4)
+
+_Entry = collections.namedtuple("_Entry", "log_name insert_id timestamp")
+
+
+class _Client(object):
+    """Serves the entries in ``entries[resource_name]`` matching the time filter."""
+
+    def __init__(self, entries, delay=0):
+        self._entries = entries
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    def list_entries(self, *, resource_names, filter_, order_by, page_size):
+        (resource_name,) = resource_names
+        with self._lock:
+            self.calls.append((resource_name, filter_))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self._delay)
+        with self._lock:
+            self.running -= 1
+
+        start, end = [
+            datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+            for value in re.findall(r'timestamp[<>=]+"([^"]+)"', filter_)
+        ]
+        entries = sorted(
+            (
+                entry
+                for entry in self._entries.get(resource_name, ())
+                if start <= entry.timestamp < end
+            ),
+            key=lambda entry: entry.timestamp,
+            reverse=order_by == "timestamp desc",
+        )
+        return iter(entries)
+
+
+def _entry(minutes, insert_id, log_name="projects/p/logs/log"):
+    return _Entry(log_name, insert_id, START + datetime.timedelta(minutes=minutes))
+
+
+class Test__list_entries_parallel(unittest.TestCase):
+    @staticmethod
+    def _call_fut(client, **kw):
+        from google.cloud.logging_v2._parallel_list import _list_entries_parallel
+
+        kw.setdefault("start_time", START)
+        kw.setdefault("end_time", END)
+        return _list_entries_parallel(client, **kw)
+
+    def test_merges_in_timestamp_order(self):
+        client = _Client(
+            {
+                "projects/a": [_entry(10, "a1"), _entry(130, "a2"), _entry(200, "a3")],
+                "projects/b": [_entry(5, "b1"), _entry(60, "b2"), _entry(230, "b3")],
+            }
+        )
+
+        entries = list(
+            self._call_fut(
+                client, resource_names=["projects/a", "projects/b"], time_shards=2
+            )
+        )
+
+        self.assertEqual(
+            [entry.insert_id for entry in entries],
+            ["b1", "a1", "b2", "a2", "a3", "b3"],
+        )
+        self.assertEqual(len(client.calls), 4)
+
+    def test_descending(self):
+        client = _Client(
+            {
+                "projects/a": [_entry(10, "a1"), _entry(130, "a2")],
+                "projects/b": [_entry(5, "b1"), _entry(230, "b2")],
+            }
+        )
+
+        entries = list(
+            self._call_fut(
+                client,
+                resource_names=["projects/a", "projects/b"],
+                order_by="timestamp desc",
+                time_shards=3,
+            )
+        )
+
+        self.assertEqual(
+            [entry.insert_id for entry in entries], ["b2", "a2", "a1", "b1"]
+        )
+
+    def test_dedupes_by_insert_id(self):
+        shared = _entry(10, "same")
+        client = _Client(
+            {
+                "folders/1": [shared, _entry(10, "other")],
+                "projects/a": [shared],
+                "projects/b": [_entry(10, "same", log_name="projects/b/logs/log")],
+            }
+        )
+
+        entries = list(
+            self._call_fut(
+                client, resource_names=["folders/1", "projects/a", "projects/b"]
+            )
+        )
+
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(
+            sorted((entry.log_name, entry.insert_id) for entry in entries),
+            [
+                ("projects/b/logs/log", "same"),
+                ("projects/p/logs/log", "other"),
+                ("projects/p/logs/log", "same"),
+            ],
+        )
+
+    def test_window_filters(self):
+        client = _Client({})
+
+        list(
+            self._call_fut(
+                client,
+                resource_names=["projects/a"],
+                filter_="severity>=ERROR",
+                time_shards=2,
+            )
+        )
+
+        self.assertEqual(
+            sorted(filter_ for _, filter_ in client.calls),
+            [
+                '(severity>=ERROR) AND timestamp>="2023-01-01T00:00:00.000000+0000" '
+                'AND timestamp<"2023-01-01T02:00:00.000000+0000"',
+                '(severity>=ERROR) AND timestamp>="2023-01-01T02:00:00.000000+0000" '
+                'AND timestamp<"2023-01-01T04:00:00.000000+0000"',
+            ],
+        )
+
+    def test_max_results(self):
+        client = _Client(
+            {"projects/a": [_entry(minute, str(minute)) for minute in range(50)]}
+        )
+
+        entries = list(
+            self._call_fut(client, resource_names=["projects/a"], max_results=3)
+        )
+
+        self.assertEqual([entry.insert_id for entry in entries], ["0", "1", "2"])
+
+    def test_bounded_concurrency(self):
+        client = _Client({}, delay=0.05)
+        resource_names = [f"projects/{index}" for index in range(6)]
+
+        list(
+            self._call_fut(
+                client, resource_names=resource_names, time_shards=2, max_workers=2
+            )
+        )
+
+        self.assertEqual(len(client.calls), 12)
+        self.assertLessEqual(client.max_running, 2)
+
+    def test_bounded_threads(self):
+        from google.cloud.logging_v2._parallel_list import _WORKER_THREAD_NAME
+
+        client = _Client({}, delay=0.01)
+        resource_names = [f"projects/{index}" for index in range(20)]
+        threads = set()
+        list_entries = client.list_entries
+
+        def record_thread(**kw):
+            threads.add(threading.current_thread())
+            return list_entries(**kw)
+
+        client.list_entries = record_thread
+
+        list(
+            self._call_fut(
+                client, resource_names=resource_names, time_shards=3, max_workers=4
+            )
+        )
+
+        self.assertEqual(len(client.calls), 60)
+        self.assertLessEqual(len(threads), 4)
+        self.assertTrue(
+            all(thread.name.startswith(_WORKER_THREAD_NAME) for thread in threads)
+        )
+
+    def test_invalid_arguments(self):
+        client = _Client({})
+
+        for kw in (
+            {"time_shards": 0},
+            {"max_workers": 0},
+            {"max_results": -1},
+            {"start_time": END, "end_time": START},
+        ):
+            with self.assertRaises(ValueError):
+                self._call_fut(client, resource_names=["projects/a"], **kw)
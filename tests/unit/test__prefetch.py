@@ -0,0 +1,154 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+
+class Test__prefetch(unittest.TestCase):
+    @staticmethod
+    def _call_fut(pages, depth):
+        from google.cloud.logging_v2._prefetch import _prefetch
+
+        return _prefetch(pages, depth)
+
+    def test_invalid_depth(self):
+        with self.assertRaises(ValueError):
+            self._call_fut([], 0)
+
+    def test_yields_in_order(self):
+        self.assertEqual(list(self._call_fut(range(10), 2)), list(range(10)))
+
+    def test_fetches_in_background_thread(self):
+        from google.cloud.logging_v2._prefetch import _PREFETCH_THREAD_NAME
+
+        threads = []
+
+        def pages():
+            threads.append(threading.current_thread().name)
+            yield "page"
+
+        self.assertEqual(list(self._call_fut(pages(), 1)), ["page"])
+        self.assertEqual(threads, [_PREFETCH_THREAD_NAME])
+
+    def test_bounded_read_ahead(self):
+        fetched = []
+        blocked = threading.Event()
+
+        def pages():
+            for index in range(100):
+                fetched.append(index)
+                if len(fetched) == 4:
+                    blocked.set()
+                yield index
+
+        iterator = self._call_fut(pages(), 2)
+        self.assertEqual(next(iterator), 0)
+        self.assertTrue(blocked.wait(5))
+        time.sleep(0.05)
+        # one page consumed, two queued and one waiting for room
+        self.assertEqual(len(fetched), 4)
+        iterator.close()
+
+    def test_error_raised_after_pages(self):
+        def pages():
+            yield 1
+            raise RuntimeError("boom")
+
+        iterator = self._call_fut(pages(), 2)
+        self.assertEqual(next(iterator), 1)
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+    def test_close_stops_thread(self):
+        stopped = threading.Event()
+
+        def pages():
+            try:
+                for index in range(100):
+                    yield index
+            finally:
+                stopped.set()
+
+        iterator = self._call_fut(pages(), 1)
+        self.assertEqual(next(iterator), 0)
+        iterator.close()
+
+        self.assertTrue(stopped.wait(5))
+
+
+class Test__prefetch_w_executor(unittest.TestCase):
+    def setUp(self):
+        import concurrent.futures
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.addCleanup(self.executor.shutdown)
+
+    def _call_fut(self, pages, depth):
+        from google.cloud.logging_v2._prefetch import _prefetch
+
+        return _prefetch(pages, depth, executor=self.executor)
+
+    def test_yields_in_order(self):
+        self.assertEqual(list(self._call_fut(range(10), 2)), list(range(10)))
+
+    def test_iterators_share_workers(self):
+        # more iterators than workers, each of them read ahead to its depth
+        iterators = [self._call_fut(range(index, 30, 3), 2) for index in range(3)]
+
+        merged = [page for pages in zip(*iterators) for page in pages]
+
+        self.assertEqual(merged, list(range(30)))
+
+    def test_bounded_read_ahead(self):
+        fetched = []
+
+        def pages():
+            for index in range(100):
+                fetched.append(index)
+                yield index
+
+        iterator = self._call_fut(pages(), 2)
+        self.assertEqual(next(iterator), 0)
+        time.sleep(0.05)
+        # one page consumed, two waiting
+        self.assertEqual(len(fetched), 3)
+        iterator.close()
+
+    def test_error_raised_after_pages(self):
+        def pages():
+            yield 1
+            raise RuntimeError("boom")
+
+        iterator = self._call_fut(pages(), 2)
+        self.assertEqual(next(iterator), 1)
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+    def test_close_stops_fetching(self):
+        stopped = threading.Event()
+
+        def pages():
+            try:
+                for index in range(100):
+                    yield index
+            finally:
+                stopped.set()
+
+        iterator = self._call_fut(pages(), 1)
+        self.assertEqual(next(iterator), 0)
+        iterator.close()
+
+        self.assertTrue(stopped.wait(5))
@@ -0,0 +1,377 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import datetime
+import threading
+import unittest
+
+import mock
+
+LOG_NAME = "projects/PROJECT/logs/log"
+
+
+def _response(*insert_ids, suppressed=()):
+    from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+    from google.cloud.logging_v2.types import TailLogEntriesResponse
+
+    SuppressionInfo = TailLogEntriesResponse.SuppressionInfo
+    return TailLogEntriesResponse(
+        entries=[
+            LogEntryPB(log_name=LOG_NAME, insert_id=insert_id, text_payload=insert_id)
+            for insert_id in insert_ids
+        ],
+        suppression_info=[
+            SuppressionInfo(reason=reason, suppressed_count=count)
+            for reason, count in suppressed
+        ],
+    )
+
+
+class _Stream(object):
+    """Stands in for a streaming call, raising ``error`` once exhausted."""
+
+    def __init__(self, responses, error=None):
+        self._responses = iter(responses)
+        self._error = error
+        self.cancel = mock.Mock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._responses)
+        except StopIteration:
+            if self._error is not None:
+                raise self._error
+            raise
+
+
+class Test__buffer_window(unittest.TestCase):
+    def _call_fut(self, value):
+        from google.cloud.logging_v2._tail import _buffer_window
+
+        return _buffer_window(value)
+
+    def test_values(self):
+        window = datetime.timedelta(seconds=3)
+        self.assertIsNone(self._call_fut(None))
+        self.assertIs(self._call_fut(window), window)
+        self.assertEqual(self._call_fut(1.5), datetime.timedelta(seconds=1.5))
+
+
+class Test__RecentKeys(unittest.TestCase):
+    def test_add(self):
+        from google.cloud.logging_v2._tail import _RecentKeys
+
+        keys = _RecentKeys(maxsize=2)
+
+        self.assertTrue(keys.add("a"))
+        self.assertFalse(keys.add("a"))
+        self.assertTrue(keys.add("b"))
+        self.assertTrue(keys.add("c"))
+        # the oldest key was forgotten
+        self.assertTrue(keys.add("a"))
+
+
+class Test_EntryTail(unittest.TestCase):
+    START = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+
+    def _make_one(self, streams, **kw):
+        from google.cloud.logging_v2._tail import _EntryTail
+
+        self.sleep = mock.Mock()
+        self.open_stream = mock.Mock(side_effect=streams)
+        return _EntryTail(
+            self.open_stream,
+            lambda entry_pb: entry_pb.insert_id,
+            sleep=self.sleep,
+            clock=lambda: self.START,
+            **kw,
+        )
+
+    def test_reconnect_and_dedupe(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one(
+            [
+                _Stream([_response("a", "b")], exceptions.DeadlineExceeded("session")),
+                # the new session delivers entries around the break again
+                _Stream([_response("b", "c", suppressed=[(1, 4)])]),
+                _Stream([_response("c", "d", suppressed=[(1, 2), (2, 1)])]),
+            ]
+        )
+
+        entries = [next(tail) for _ in range(4)]
+
+        self.assertEqual(entries, ["a", "b", "c", "d"])
+        self.assertEqual(tail.duplicates, 2)
+        self.assertEqual(tail.reconnects, 2)
+        self.assertEqual(tail.suppressed_counts, {"RATE_LIMIT": 6, "NOT_CONSUMED": 1})
+        # sessions which returned responses are replaced without delay
+        self.assertEqual(self.sleep.call_args_list, [mock.call(0), mock.call(0)])
+
+    def test_reconnect_resumes_from_newest_entry(self):
+        from google.api_core import exceptions
+        from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+        from google.cloud.logging_v2.types import TailLogEntriesResponse
+
+        response = TailLogEntriesResponse(
+            entries=[
+                LogEntryPB(
+                    log_name=LOG_NAME,
+                    insert_id="a",
+                    timestamp=datetime.datetime(
+                        2023, 1, 1, 0, 0, 10, tzinfo=datetime.timezone.utc
+                    ),
+                )
+            ]
+        )
+        tail = self._make_one(
+            [
+                _Stream([], exceptions.ServiceUnavailable("down")),
+                _Stream([response], exceptions.DeadlineExceeded("session")),
+                _Stream([_response("b")]),
+            ],
+            filter_="severity>=ERROR",
+            buffer_window=5,
+        )
+
+        self.assertEqual([next(tail), next(tail)], ["a", "b"])
+        self.assertEqual(
+            [call.args[0] for call in self.open_stream.call_args_list],
+            [
+                "severity>=ERROR",
+                # from the start of the tail, before any entry was seen
+                '(severity>=ERROR) AND timestamp>="2022-12-31T23:59:55.000000000Z"',
+                '(severity>=ERROR) AND timestamp>="2023-01-01T00:00:05.000000000Z"',
+            ],
+        )
+
+    def test_backoff_after_failures(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one(
+            [
+                _Stream([], exceptions.ServiceUnavailable("down")),
+                _Stream([], exceptions.ServiceUnavailable("down")),
+                _Stream([_response("a")]),
+            ]
+        )
+
+        self.assertEqual(next(tail), "a")
+        self.assertEqual(self.sleep.call_args_list, [mock.call(1.0), mock.call(2.0)])
+
+    def test_other_errors_raise(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one([_Stream([], exceptions.PermissionDenied("no"))])
+
+        with self.assertRaises(exceptions.PermissionDenied):
+            next(tail)
+
+    def test_entries_without_insert_id(self):
+        tail = self._make_one([_Stream([_response("", "")])])
+
+        self.assertEqual([next(tail), next(tail)], ["", ""])
+        self.assertEqual(tail.duplicates, 0)
+
+    def test_close(self):
+        from google.api_core import exceptions
+
+        stream = _Stream([_response("a")], exceptions.Cancelled("cancelled"))
+
+        with self._make_one([stream]) as tail:
+            self.assertEqual(next(tail), "a")
+            tail.close()
+            stream.cancel.assert_called_once_with()
+            with self.assertRaises(StopIteration):
+                next(tail)
+
+        self.sleep.assert_not_called()
+
+    def test_cancelled_while_open(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one([_Stream([], exceptions.Cancelled("cancelled"))])
+
+        with self.assertRaises(exceptions.Cancelled):
+            next(tail)
+
+
+class Test_AsyncEntryTail(unittest.TestCase):
+    def test_reconnect_and_dedupe(self):
+        from google.api_core import exceptions
+        from google.cloud.logging_v2._tail import _AsyncEntryTail
+
+        sessions = iter(
+            [
+                ([_response("a", "b")], exceptions.DeadlineExceeded("session")),
+                ([_response("b", "c", suppressed=[(2, 3)])], None),
+            ]
+        )
+
+        class _AsyncStream(object):
+            def __init__(self, responses, error):
+                self._stream = _Stream(responses, error)
+                self.cancel = self._stream.cancel
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(self._stream)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        filters = []
+
+        async def open_stream(session_filter):
+            filters.append(session_filter)
+            return _AsyncStream(*next(sessions))
+
+        async def collect():
+            async with _AsyncEntryTail(
+                open_stream, lambda entry_pb: entry_pb.insert_id
+            ) as tail:
+                entries = [await tail.__anext__() for _ in range(3)]
+            return tail, entries
+
+        with mock.patch("asyncio.sleep", new=mock.AsyncMock()) as sleep:
+            tail, entries = asyncio.run(collect())
+
+        self.assertEqual(entries, ["a", "b", "c"])
+        self.assertEqual(tail.duplicates, 1)
+        self.assertEqual(tail.reconnects, 1)
+        self.assertEqual(tail.suppressed_counts, {"NOT_CONSUMED": 3})
+        sleep.assert_awaited_once_with(0)
+        self.assertIsNone(filters[0])
+        self.assertTrue(filters[1].startswith('timestamp>="'))
+
+
+def _resource(insert_id, second, nanos=0):
+    return {
+        "logName": LOG_NAME,
+        "insertId": insert_id,
+        "timestamp": f"2023-01-01T00:00:{second:02d}.{nanos:09d}Z",
+    }
+
+
+class Test_PolledTail(unittest.TestCase):
+    START = 1672531200.0  # 2023-01-01T00:00:00Z
+
+    def _make_one(self, polls, **kw):
+        from google.cloud.logging_v2._tail import _PolledTail
+
+        self.filters = []
+        polls = iter(polls)
+
+        def list_pages(filter_):
+            self.filters.append(filter_)
+            poll = next(polls, None)
+            if poll is None:
+                tail.close()
+                return []
+            if isinstance(poll, Exception):
+                raise poll
+            return [(page, None) for page in poll]
+
+        self.sleep = mock.Mock()
+        tail = _PolledTail(
+            list_pages,
+            lambda resources: [resource["insertId"] for resource in resources],
+            sleep=self.sleep,
+            clock=lambda: self.START,
+            **kw,
+        )
+        return tail
+
+    def test_high_water_mark_and_dedupe(self):
+        tail = self._make_one(
+            [
+                [[_resource("a", 1)], [_resource("b", 3, 5)]],
+                # entries around the previous high-water mark are listed again
+                [[_resource("b", 3, 5), _resource("c", 3, 5), _resource("d", 2)]],
+                [[_resource("d", 2)]],
+            ],
+            filter_="severity>=ERROR",
+        )
+
+        entries = [next(tail) for _ in range(4)]
+
+        self.assertEqual(entries, ["a", "b", "c", "d"])
+        self.assertEqual(tail.duplicates, 1)
+        self.assertEqual(
+            self.filters,
+            [
+                '(severity>=ERROR) AND timestamp>="2022-12-31T23:59:58.000000000Z"',
+                '(severity>=ERROR) AND timestamp>="2023-01-01T00:00:01.000000005Z"',
+            ],
+        )
+
+    def test_adaptive_interval(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one(
+            [
+                [],
+                [],
+                exceptions.ServiceUnavailable("down"),
+                exceptions.TooManyRequests("slow down"),
+                [[_resource("a", 1)]],
+                [],
+            ],
+            buffer_window=0,
+        )
+
+        self.assertEqual(next(tail), "a")
+        with self.assertRaises(StopIteration):
+            next(tail)
+
+        self.assertEqual(
+            self.sleep.call_args_list,
+            [mock.call(delay) for delay in (2.0, 4.0, 1.0, 2.0, 2.0, 4.0)],
+        )
+        self.assertEqual(tail.polls, 5)
+        self.assertEqual(tail.reconnects, 2)
+        self.assertEqual(self.filters[0], 'timestamp>="2023-01-01T00:00:00.000000000Z"')
+
+    def test_other_errors_raise(self):
+        from google.api_core import exceptions
+
+        tail = self._make_one([exceptions.Forbidden("no")])
+
+        with self.assertRaises(exceptions.Forbidden):
+            next(tail)
+
+    def test_close(self):
+        from google.cloud.logging_v2._tail import _PolledTail
+
+        with self._make_one([[[_resource("a", 1), _resource("b", 2)]]]) as tail:
+            self.assertEqual(next(tail), "a")
+            tail.close()
+            with self.assertRaises(StopIteration):
+                next(tail)
+
+        self.sleep.assert_not_called()
+
+        # closing interrupts the wait between polls
+        tail = _PolledTail(mock.Mock(return_value=[]), list)
+        timer = threading.Timer(0.1, tail.close)
+        timer.start()
+        with self.assertRaises(StopIteration):
+            next(tail)
+        timer.join()
@@ -0,0 +1,82 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+try:
+    import numpy
+except ImportError:  # pragma: NO COVER
+    numpy = None
+
+START_NS = 1672531200 * 10**9
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class Test__rfc3339_to_nanos(unittest.TestCase):
+    @staticmethod
+    def _call_fut(values):
+        from google.cloud.logging_v2._timestamps import _rfc3339_to_nanos
+
+        return _rfc3339_to_nanos(values)
+
+    def test_values(self):
+        nanos = self._call_fut(
+            [
+                "2023-01-01T00:00:00Z",
+                "2023-01-01T00:00:00.5Z",
+                "2023-01-01T00:00:00.123456789Z",
+                None,
+            ]
+        )
+
+        self.assertEqual(nanos.dtype, numpy.int64)
+        self.assertEqual(
+            nanos[:3].tolist(), [START_NS, START_NS + 500000000, START_NS + 123456789]
+        )
+        self.assertTrue(numpy.isnat(nanos.view("datetime64[ns]")[3]))
+
+    def test_empty(self):
+        self.assertEqual(len(self._call_fut([])), 0)
+
+    def test_invalid(self):
+        for value in ("2023-01-01T00:00:00+01:00", "not a timestamp Z"):
+            with self.assertRaises(ValueError):
+                self._call_fut([value])
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class Test__nanos_to_datetimes(unittest.TestCase):
+    @staticmethod
+    def _call_fut(nanos):
+        from google.cloud.logging_v2._timestamps import _nanos_to_datetimes
+
+        return _nanos_to_datetimes(nanos)
+
+    def test_values(self):
+        from google.cloud.logging_v2._timestamps import _NAT
+
+        datetimes = self._call_fut(
+            numpy.array([START_NS + 123456789, _NAT], dtype=numpy.int64)
+        )
+
+        self.assertEqual(
+            datetimes,
+            [
+                datetime.datetime(
+                    2023, 1, 1, 0, 0, 0, 123456, tzinfo=datetime.timezone.utc
+                ),
+                None,
+            ],
+        )
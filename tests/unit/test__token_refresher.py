@@ -0,0 +1,143 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+import mock
+
+
+def _utcnow():
+    from google.cloud.logging_v2._token_refresher import _utcnow
+
+    return _utcnow()
+
+
+class Test_BackgroundTokenRefresher(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging_v2._token_refresher import (
+            _BackgroundTokenRefresher,
+        )
+
+        return _BackgroundTokenRefresher
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_refresh_missing_token(self):
+        credentials = _Credentials()
+        refresher = self._make_one(
+            _Client(credentials), refresh_margin=300, retry_interval=30
+        )
+
+        delay = refresher._refresh_if_needed()
+
+        self.assertEqual(credentials.refreshes, 1)
+        # the new token is valid for an hour
+        self.assertAlmostEqual(delay, 3300, delta=5)
+
+    def test_refresh_before_expiry(self):
+        credentials = _Credentials(expires_in=200)
+        refresher = self._make_one(_Client(credentials), refresh_margin=300)
+
+        refresher._refresh_if_needed()
+
+        self.assertEqual(credentials.refreshes, 1)
+
+    def test_no_refresh_while_fresh(self):
+        credentials = _Credentials(expires_in=1000)
+        refresher = self._make_one(
+            _Client(credentials), refresh_margin=300, retry_interval=30
+        )
+
+        delay = refresher._refresh_if_needed()
+
+        self.assertEqual(credentials.refreshes, 0)
+        self.assertAlmostEqual(delay, 700, delta=5)
+
+    def test_short_lived_token_waits_retry_interval(self):
+        credentials = _Credentials(lifetime=60)
+        refresher = self._make_one(
+            _Client(credentials), refresh_margin=300, retry_interval=30
+        )
+
+        self.assertEqual(refresher._refresh_if_needed(), 30)
+
+    def test_no_refresh_without_expiry(self):
+        credentials = _Credentials(expires_in=None)
+        refresher = self._make_one(_Client(credentials))
+
+        self.assertIsNone(refresher._refresh_if_needed())
+        self.assertEqual(credentials.refreshes, 0)
+
+    def test_no_credentials(self):
+        refresher = self._make_one(_Client(None))
+
+        self.assertIsNone(refresher._refresh_if_needed())
+
+    def test_thread_retries_after_failure(self):
+        refresher = self._make_one(_Client(None), retry_interval=30)
+        refresher._stopping = mock.Mock(spec=["is_set", "wait"])
+        refresher._stopping.is_set.side_effect = [False, False, True]
+        side_effect = [ValueError("boom"), 60]
+
+        with mock.patch.object(
+            refresher, "_refresh_if_needed", side_effect=side_effect
+        ):
+            refresher._thread_main()
+
+        self.assertEqual(
+            refresher._stopping.wait.call_args_list, [mock.call(30), mock.call(60)]
+        )
+
+    def test_start_stop(self):
+        credentials = _Credentials()
+        refresher = self._make_one(_Client(credentials), retry_interval=30)
+
+        with mock.patch.object(refresher, "_refresh_if_needed", return_value=60):
+            refresher.start()
+            self.assertTrue(refresher.is_alive)
+            self.assertTrue(refresher.stop(timeout=5))
+
+        self.assertFalse(refresher.is_alive)
+
+
+class _Client(object):
+    def __init__(self, credentials):
+        self._credentials = credentials
+
+
+class _Credentials(object):
+    def __init__(self, expires_in=0, lifetime=3600):
+        self.refreshes = 0
+        self.lifetime = lifetime
+        self.token = None
+        self.expiry = None
+        if expires_in is None:
+            self.token = "token"
+        elif expires_in > 0:
+            self.token = "token"
+            self.expiry = _utcnow() + datetime.timedelta(seconds=expires_in)
+
+    @property
+    def valid(self):
+        return self.token is not None and (
+            self.expiry is None or self.expiry > _utcnow()
+        )
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = "token"
+        self.expiry = _utcnow() + datetime.timedelta(seconds=self.lifetime)
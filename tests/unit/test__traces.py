@@ -0,0 +1,245 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import datetime
+import re
+import threading
+import unittest
+
+PROJECT = "PROJECT"
+START = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+END = START + datetime.timedelta(hours=4)
+MINUTE = datetime.timedelta(minutes=1)
+
+_Entry = collections.namedtuple("_Entry", "trace timestamp")
+
+
+def _name(trace_id):
+    return f"projects/{PROJECT}/traces/{trace_id}"
+
+
+class _Client(object):
+    """Serves the entries matching the trace and time restrictions of a filter."""
+
+    project = PROJECT
+
+    def __init__(self, entries):
+        self._entries = entries
+        self._lock = threading.Lock()
+        self.filters = []
+
+    def list_entries(self, *, resource_names, filter_, order_by, page_size):
+        with self._lock:
+            self.filters.append(filter_)
+        traces = set(re.findall(r'"(projects/[^"]+)"', filter_))
+        start, end = [
+            datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+            for value in re.findall(r'timestamp[<>=]+"([^"]+)"', filter_)
+        ]
+        return iter(
+            sorted(
+                (
+                    entry
+                    for entry in self._entries
+                    if entry.trace in traces and start <= entry.timestamp < end
+                ),
+                key=lambda entry: entry.timestamp,
+            )
+        )
+
+
+class Test__split(unittest.TestCase):
+    def test_split(self):
+        from google.cloud.logging_v2._traces import _split
+
+        names = ["a" * 4, "b" * 4, "c" * 4, "d" * 4, "e" * 4]
+
+        self.assertEqual(
+            _split(names, 2, 100), [["aaaa", "bbbb"], ["cccc", "dddd"], ["eeee"]]
+        )
+        # each name costs its length, two quotes and " OR "
+        self.assertEqual(
+            _split(names, 5, 30), [["aaaa", "bbbb", "cccc"], ["dddd", "eeee"]]
+        )
+        self.assertEqual(_split(names[:1], 2, 1), [["aaaa"]])
+
+
+class Test__trace_time(unittest.TestCase):
+    def test_trace_time(self):
+        from google.cloud.logging_v2._traces import _trace_time
+
+        self.assertIsNone(_trace_time(_name("4bf92f3577b34da6a3ce929d0e0e4736"), None))
+        self.assertEqual(
+            _trace_time(_name("1-63b0cd00-bd862e3fe1be46a994272793"), None),
+            datetime.datetime(2023, 1, 1, 0, 0, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(
+            _trace_time(_name("abc"), datetime.datetime(2023, 1, 1)), START
+        )
+
+
+class Test__entries_for_traces(unittest.TestCase):
+    @staticmethod
+    def _call_fut(client, trace_ids, **kw):
+        from google.cloud.logging_v2._traces import _entries_for_traces
+
+        kw.setdefault("end_time", END)
+        return _entries_for_traces(
+            client, trace_ids, resource_names=[f"projects/{PROJECT}"], **kw
+        )
+
+    def test_groups_by_trace(self):
+        entries = [
+            _Entry(_name("a"), START + MINUTE),
+            _Entry(_name("b"), START + 2 * MINUTE),
+            _Entry(_name("a"), START + 3 * MINUTE),
+            _Entry(_name("other"), START + 4 * MINUTE),
+        ]
+        client = _Client(entries)
+
+        results = self._call_fut(
+            client, ["a", _name("b"), "c"], filter_="severity>=ERROR", max_workers=2
+        )
+
+        self.assertEqual(
+            results,
+            {"a": [entries[0], entries[2]], _name("b"): [entries[1]], "c": []},
+        )
+        self.assertEqual(
+            sorted(client.filters),
+            [
+                f'((severity>=ERROR) AND trace=("{_name("a")}" OR "{_name("b")}")) '
+                'AND timestamp>="2022-12-31T04:00:00.000000+0000" '
+                'AND timestamp<"2023-01-01T04:00:00.000000+0000"',
+                f'((severity>=ERROR) AND trace=("{_name("c")}")) '
+                'AND timestamp>="2022-12-31T04:00:00.000000+0000" '
+                'AND timestamp<"2023-01-01T04:00:00.000000+0000"',
+            ],
+        )
+
+    def test_one_shot_iterable(self):
+        entries = [_Entry(_name("a"), START + MINUTE)]
+        client = _Client(entries)
+
+        results = self._call_fut(client, (trace_id for trace_id in ["a", "b"]))
+
+        self.assertEqual(results, {"a": entries, "b": []})
+
+    def test_time_hints(self):
+        entries = [
+            _Entry(_name("a"), START + MINUTE),
+            # outside the margin around the hint
+            _Entry(_name("a"), START + 30 * MINUTE),
+            _Entry(_name("b"), START + 2 * MINUTE),
+            _Entry(_name("c"), START + 3 * 60 * MINUTE),
+        ]
+        client = _Client(entries)
+
+        results = self._call_fut(
+            client,
+            {"c": START + 3 * 60 * MINUTE, "a": START, "b": START + 5 * MINUTE},
+            time_margin=5 * MINUTE,
+            max_workers=2,
+        )
+
+        self.assertEqual(
+            results, {"a": [entries[0]], "b": [entries[2]], "c": [entries[3]]}
+        )
+        # traces close in time are queried together, over a narrow range
+        self.assertEqual(
+            sorted(
+                re.findall(r'timestamp[<>=]+"([^"]+)"', filter_)
+                for filter_ in client.filters
+            ),
+            [
+                ["2022-12-31T23:55:00.000000+0000", "2023-01-01T00:10:00.000000+0000"],
+                ["2023-01-01T02:55:00.000000+0000", "2023-01-01T03:05:00.000000+0000"],
+            ],
+        )
+
+    def test_sparse_traces_are_queried_apart(self):
+        client = _Client([])
+        # X-Ray trace IDs, two of them a minute apart and one a day later
+        trace_ids = [
+            f"1-{int((START + offset).timestamp()):08x}-{index:024x}"
+            for index, offset in enumerate(
+                [datetime.timedelta(0), MINUTE, datetime.timedelta(days=1)]
+            )
+        ]
+
+        self._call_fut(
+            client,
+            trace_ids,
+            start_time=START - datetime.timedelta(days=1),
+            end_time=START + datetime.timedelta(days=2),
+            time_margin=5 * MINUTE,
+            max_workers=1,
+        )
+
+        self.assertEqual(
+            sorted(
+                re.findall(r'timestamp[<>=]+"([^"]+)"', filter_)
+                for filter_ in client.filters
+            ),
+            [
+                ["2022-12-31T23:55:00.000000+0000", "2023-01-01T00:06:00.000000+0000"],
+                ["2023-01-01T23:55:00.000000+0000", "2023-01-02T00:05:00.000000+0000"],
+            ],
+        )
+
+    def test_time_hints_within_bounds(self):
+        client = _Client([])
+
+        results = self._call_fut(
+            client,
+            {"a": START, "b": END + 60 * MINUTE},
+            start_time=START + MINUTE,
+            time_margin=5 * MINUTE,
+        )
+
+        self.assertEqual(results, {"a": [], "b": []})
+        # the range of "b" is entirely after the end time
+        (filter_,) = client.filters
+        self.assertEqual(
+            re.findall(r'timestamp[<>=]+"([^"]+)"', filter_),
+            ["2023-01-01T00:01:00.000000+0000", "2023-01-01T00:05:00.000000+0000"],
+        )
+
+    def test_filter_length_limit(self):
+        trace_ids = [f"{index:032x}" for index in range(1000)]
+        client = _Client([])
+
+        self._call_fut(client, trace_ids, max_workers=1)
+
+        self.assertGreater(len(client.filters), 1)
+        self.assertTrue(all(len(filter_) <= 20000 for filter_ in client.filters))
+        self.assertEqual(
+            sum(len(re.findall("traces/", filter_)) for filter_ in client.filters),
+            1000,
+        )
+
+    def test_empty(self):
+        client = _Client([])
+
+        self.assertEqual(self._call_fut(client, []), {})
+        self.assertEqual(client.filters, [])
+
+    def test_errors(self):
+        client = _Client([])
+
+        with self.assertRaises(ValueError):
+            self._call_fut(client, ["a"], max_workers=0)
+        with self.assertRaises(ValueError):
+            self._call_fut(client, ["a"], start_time=END)
@@ -0,0 +1,184 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import mock
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+class TestAsyncClient(unittest.TestCase):
+    PROJECT = "PROJECT"
+    LOG_PATH = f"projects/{PROJECT}/logs/syslog"
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging import AsyncClient
+
+        return AsyncClient
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor(self):
+        from google.cloud.logging_v2 import __version__
+
+        client = self._make_one(
+            project=self.PROJECT,
+            credentials=_make_credentials(),
+            client_options={"api_endpoint": "foo.googleapis.com"},
+        )
+
+        self.assertEqual(client.project, self.PROJECT)
+        self.assertEqual(client._client_options.api_endpoint, "foo.googleapis.com")
+        self.assertEqual(client._client_info.client_library_version, __version__)
+
+    def test_logging_api(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+
+        with mock.patch(
+            "google.cloud.logging_v2._gapic.make_async_logging_api"
+        ) as make_api:
+            api = client.logging_api
+            self.assertIs(client.logging_api, api)
+
+        make_api.assert_called_once_with(client)
+        self.assertIs(api, make_api.return_value)
+
+    def test_logger(self):
+        from google.cloud.logging import AsyncLogger
+
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        logger = client.logger("syslog", labels={"foo": "bar"})
+
+        self.assertIsInstance(logger, AsyncLogger)
+        self.assertIs(logger.client, client)
+        self.assertEqual(logger.full_name, self.LOG_PATH)
+        self.assertEqual(logger.labels, {"foo": "bar"})
+
+    def test_list_entries(self):
+        from google.cloud.logging_v2 import _gapic
+        from google.cloud.logging_v2.entries import TextEntry
+        from google.cloud.logging_v2.types import ListLogEntriesRequest
+        from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        gapic_api = mock.Mock(spec=["list_log_entries"])
+        client._logging_api = _gapic._AsyncLoggingAPI(gapic_api, client)
+        entries_pb = [
+            LogEntryPB(log_name=self.LOG_PATH, text_payload=text)
+            for text in ("first", "second", "third")
+        ]
+
+        async def list_log_entries(request):
+            async def pager():
+                for entry in entries_pb:
+                    yield entry
+
+            return pager()
+
+        gapic_api.list_log_entries.side_effect = list_log_entries
+
+        async def collect():
+            return [
+                entry
+                async for entry in client.list_entries(
+                    filter_="severity>=ERROR", max_results=2
+                )
+            ]
+
+        entries = asyncio.run(collect())
+
+        self.assertEqual([entry.payload for entry in entries], ["first", "second"])
+        self.assertIsInstance(entries[0], TextEntry)
+        self.assertEqual(entries[0].logger.name, "syslog")
+        self.assertIs(entries[0].logger, entries[1].logger)
+        request = gapic_api.list_log_entries.call_args.kwargs["request"]
+        self.assertIsInstance(request, ListLogEntriesRequest)
+        self.assertEqual(request.resource_names, [f"projects/{self.PROJECT}"])
+        # a default time restriction is added
+        self.assertTrue(request.filter.startswith("severity>=ERROR AND timestamp>="))
+
+    def test_tail_entries(self):
+        from google.cloud.logging_v2 import _gapic
+        from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+        from google.cloud.logging_v2.types import TailLogEntriesResponse
+
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        gapic_api = mock.Mock(spec=["tail_log_entries"])
+        client._logging_api = _gapic._AsyncLoggingAPI(gapic_api, client)
+        received = []
+
+        async def tail_log_entries(requests):
+            async for request in requests:
+                received.append(request)
+
+            return _TailStream(
+                [
+                    TailLogEntriesResponse(
+                        entries=[LogEntryPB(log_name=self.LOG_PATH, text_payload="hi")]
+                    )
+                ]
+            )
+
+        gapic_api.tail_log_entries.side_effect = tail_log_entries
+
+        async def first():
+            async with client.tail_entries(filter_="severity>=ERROR") as tail:
+                return await tail.__anext__()
+
+        entry = asyncio.run(first())
+
+        self.assertEqual(entry.payload, "hi")
+        self.assertEqual(entry.logger.name, "syslog")
+        (request,) = received
+        self.assertEqual(request.resource_names, [f"projects/{self.PROJECT}"])
+        self.assertEqual(request.filter, "severity>=ERROR")
+
+    def test_close(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        client._logging_api = api = mock.Mock(spec=["close"])
+        api.close = mock.AsyncMock()
+
+        async def use():
+            async with client:
+                pass
+
+        asyncio.run(use())
+
+        api.close.assert_awaited_once_with()
+        self.assertIsNone(client._logging_api)
+
+
+class _TailStream(object):
+    """Stands in for a streaming call returned by ``tail_log_entries``."""
+
+    def __init__(self, responses):
+        self._responses = iter(responses)
+        self.cancel = mock.Mock()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._responses)
+        except StopIteration:
+            raise StopAsyncIteration
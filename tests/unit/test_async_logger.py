@@ -0,0 +1,181 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import mock
+
+import google.cloud.logging_v2
+from google.cloud.logging_v2.resource import Resource
+
+PROJECT = "PROJECT"
+LOGGER_NAME = "syslog"
+LOG_PATH = f"projects/{PROJECT}/logs/{LOGGER_NAME}"
+RESOURCE = Resource(type="global", labels={})
+
+
+def _make_client():
+    client = mock.Mock(project=PROJECT, spec=["project", "logging_api"])
+    client.logging_api = mock.Mock(spec=["write_entries", "logger_delete"])
+    client.logging_api.write_entries = mock.AsyncMock()
+    client.logging_api.logger_delete = mock.AsyncMock()
+    return client
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def setUp(self):
+        # avoid emitting the instrumentation entry
+        google.cloud.logging_v2._instrumentation_emitted = True
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging import AsyncLogger
+
+        return AsyncLogger
+
+    def _make_one(self, client, **kw):
+        kw.setdefault("resource", RESOURCE)
+        return self._get_target_class()(LOGGER_NAME, client, **kw)
+
+    def test_log_text(self):
+        client = _make_client()
+        logger = self._make_one(client, labels={"foo": "bar"})
+
+        asyncio.run(logger.log_text("hello", severity="warning"))
+
+        client.logging_api.write_entries.assert_awaited_once_with(
+            [
+                {
+                    "logName": LOG_PATH,
+                    "textPayload": "hello",
+                    "resource": {"type": "global", "labels": {}},
+                    "labels": {"foo": "bar"},
+                    "severity": "WARNING",
+                }
+            ],
+            partial_success=True,
+        )
+
+    def test_log_struct(self):
+        client = _make_client()
+        logger = self._make_one(client)
+
+        asyncio.run(logger.log_struct({"message": "hi", "severity": "ERROR"}))
+
+        (entries,), _ = client.logging_api.write_entries.call_args
+        self.assertEqual(
+            entries[0]["jsonPayload"], {"message": "hi", "severity": "ERROR"}
+        )
+        self.assertEqual(entries[0]["severity"], "ERROR")
+
+    def test_log_infers_type(self):
+        client = _make_client()
+        logger = self._make_one(client)
+
+        asyncio.run(logger.log("hello"))
+        asyncio.run(logger.log({"message": "hi"}))
+
+        payloads = [
+            call.args[0][0] for call in client.logging_api.write_entries.call_args_list
+        ]
+        self.assertEqual(payloads[0]["textPayload"], "hello")
+        self.assertEqual(payloads[1]["jsonPayload"], {"message": "hi"})
+
+    def test_delete(self):
+        client = _make_client()
+        logger = self._make_one(client)
+
+        asyncio.run(logger.delete())
+
+        client.logging_api.logger_delete.assert_awaited_once_with(LOG_PATH)
+
+    def test_list_entries(self):
+        client = _make_client()
+        client.list_entries = mock.Mock(spec=[])
+        logger = self._make_one(client)
+
+        iterator = logger.list_entries(filter_="severity>=ERROR", page_size=10)
+
+        self.assertIs(iterator, client.list_entries.return_value)
+        kwargs = client.list_entries.call_args.kwargs
+        self.assertEqual(kwargs["resource_names"], [f"projects/{PROJECT}"])
+        self.assertTrue(
+            kwargs["filter_"].startswith(f"severity>=ERROR AND logName={LOG_PATH}")
+        )
+        self.assertEqual(kwargs["page_size"], 10)
+
+
+class TestAsyncBatch(unittest.TestCase):
+    @staticmethod
+    def _make_logger(client):
+        from google.cloud.logging import AsyncLogger
+
+        return AsyncLogger(LOGGER_NAME, client, resource=RESOURCE)
+
+    def test_async_with_commits(self):
+        client = _make_client()
+        logger = self._make_logger(client)
+
+        async def use():
+            async with logger.batch() as batch:
+                batch.log_text("first")
+                batch.log_struct({"message": "second"})
+            return batch
+
+        batch = asyncio.run(use())
+
+        client.logging_api.write_entries.assert_awaited_once_with(
+            [
+                {"textPayload": "first", "resource": RESOURCE._to_dict()},
+                {"jsonPayload": {"message": "second"}, "resource": RESOURCE._to_dict()},
+            ],
+            partial_success=True,
+            logger_name=LOG_PATH,
+        )
+        self.assertEqual(batch.entries, [])
+
+    def test_async_with_error_does_not_commit(self):
+        client = _make_client()
+        logger = self._make_logger(client)
+
+        async def use():
+            async with logger.batch() as batch:
+                batch.log_text("first")
+                raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(use())
+
+        client.logging_api.write_entries.assert_not_called()
+
+    def test_sync_with_rejected(self):
+        logger = self._make_logger(_make_client())
+
+        with self.assertRaises(TypeError):
+            with logger.batch():
+                pass
+
+    def test_commit_invalid_argument(self):
+        from google.api_core.exceptions import InvalidArgument
+
+        client = _make_client()
+        client.logging_api.write_entries.side_effect = InvalidArgument("bad")
+        batch = self._make_logger(client).batch()
+        batch.log_text("first")
+
+        with self.assertRaises(InvalidArgument):
+            asyncio.run(batch.commit())
+
+        self.assertEqual(len(batch.entries), 1)
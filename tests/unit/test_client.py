@@ -114,6 +114,127 @@ class TestClient(unittest.TestCase):
             client._connection.API_BASE_URL, "https://foo-logging.googleapis.com"
         )
 
+    def test_ctor_defer_credentials(self):
+        creds = _make_credentials()
+        default = mock.patch("google.auth.default", return_value=(creds, self.PROJECT))
+        with mock.patch.dict("os.environ", clear=True), default as default_mock:
+            client = self._make_one(defer_credentials=True)
+            default_mock.assert_not_called()
+
+            self.assertEqual(client.project, self.PROJECT)
+            self.assertIs(client._credentials, creds)
+            self.assertIs(client._credentials, creds)
+
+        default_mock.assert_called_once_with(scopes=client.SCOPE)
+
+    def test_ctor_defer_credentials_w_project(self):
+        creds = _make_credentials()
+        default = mock.patch("google.auth.default", return_value=(creds, "other"))
+        with default as default_mock:
+            client = self._make_one(project=self.PROJECT, defer_credentials=True)
+            self.assertEqual(client.project, self.PROJECT)
+            default_mock.assert_not_called()
+
+            self.assertIs(client._credentials, creds)
+
+        self.assertEqual(client.project, self.PROJECT)
+
+    def test_ctor_defer_credentials_wo_project(self):
+        default = mock.patch(
+            "google.auth.default", return_value=(_make_credentials(), None)
+        )
+        with mock.patch.dict("os.environ", clear=True), default:
+            client = self._make_one(defer_credentials=True)
+            with self.assertRaises(EnvironmentError):
+                client.project
+
+    def test_ctor_defer_credentials_ignored_w_credentials(self):
+        creds = _make_credentials()
+        with mock.patch("google.auth.default") as default_mock:
+            client = self._make_one(
+                project=self.PROJECT, credentials=creds, defer_credentials=True
+            )
+        default_mock.assert_not_called()
+        self.assertIsNone(client._deferred_options)
+        self.assertIs(client._credentials, creds)
+
+    def test_refresh_token_in_background(self):
+        patch = mock.patch(
+            "google.cloud.logging_v2.client._BackgroundTokenRefresher", autospec=True
+        )
+        with patch as refresher_class:
+            client = self._make_one(
+                project=self.PROJECT,
+                credentials=_make_credentials(),
+                refresh_token_in_background=True,
+            )
+            refresher_class.assert_called_once_with(client)
+            refresher = client._token_refresher
+            refresher.start.assert_called_once_with()
+
+            client.close()
+
+        refresher.stop.assert_called_once_with()
+
+    def test_apply_exclusions(self):
+        patch = mock.patch(
+            "google.cloud.logging_v2.client._LocalExclusions", autospec=True
+        )
+        with patch as exclusions_class:
+            client = self._make_one(
+                project=self.PROJECT,
+                credentials=_make_credentials(),
+                apply_exclusions=True,
+            )
+            exclusions_class.assert_called_once_with(client)
+            exclusions = client.local_exclusions
+            exclusions.start.assert_called_once_with()
+
+            # enabling them again keeps the running instance
+            client._enable_local_exclusions()
+            self.assertIs(client.local_exclusions, exclusions)
+
+            client.close()
+
+        exclusions.stop.assert_called_once_with()
+
+    def test_apply_exclusions_default(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        self.assertIsNone(client.local_exclusions)
+
+    def test_warm_up_wo_gapic(self):
+        client = self._make_one(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=False
+        )
+        self.assertTrue(client.warm_up())
+        self.assertIsNone(client._logging_api)
+
+    def test_warm_up_w_gapic(self):
+        client = self._make_one(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=True
+        )
+        api = client._logging_api = mock.Mock(spec=["warm_up"])
+        api.warm_up.return_value = False
+
+        self.assertFalse(client.warm_up(timeout=3))
+        api.warm_up.assert_called_once_with(3)
+
+    def test_warm_up_nonblocking(self):
+        client = self._make_one(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=True
+        )
+        api = client._logging_api = mock.Mock(spec=["warm_up"])
+        with mock.patch("threading.Thread") as thread_class:
+            self.assertIsNone(client.warm_up(timeout=3, block=False))
+
+        thread_class.assert_called_once_with(
+            target=client.warm_up,
+            kwargs={"timeout": 3},
+            name="google.cloud.logging.WarmUp",
+        )
+        thread_class.return_value.start.assert_called_once_with()
+        api.warm_up.assert_not_called()
+
     def test_logging_api_wo_gapic(self):
         from google.cloud.logging_v2._http import _LoggingAPI
 
@@ -205,6 +326,14 @@ class TestClient(unittest.TestCase):
         )
         self.assertTrue(VENEER_HEADER_REGEX.match(connection_user_agent_sorted))
 
+    def test_gapic_imported_on_first_use(self):
+        from google.cloud.logging_v2 import _gapic
+        from google.cloud.logging_v2 import client as client_module
+
+        with mock.patch.object(client_module, "_gapic", new=None):
+            self.assertIs(client_module._get_gapic(), _gapic)
+            self.assertIs(client_module._gapic, _gapic)
+
     def test_no_gapic_ctor(self):
         from google.cloud.logging_v2._http import _LoggingAPI
 
@@ -546,6 +675,120 @@ class TestClient(unittest.TestCase):
             },
         )
 
+    def test_list_entries_raw(self):
+        FILTER = 'timestamp>="2020-10-13T21:00:00Z"'
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        client._logging_api = api = mock.Mock()
+
+        iterator = client.list_entries(filter_=FILTER, raw=True)
+
+        self.assertIs(iterator, api.list_entries.return_value)
+        api.list_entries.assert_called_once_with(
+            resource_names=[f"projects/{self.PROJECT}"],
+            filter_=FILTER,
+            order_by=None,
+            max_results=None,
+            page_size=None,
+            page_token=None,
+            raw=True,
+            prefetch_pages=0,
+        )
+
+    def test_list_entries_parallel_defaults(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+
+        with mock.patch(
+            "google.cloud.logging_v2.client._list_entries_parallel"
+        ) as list_parallel:
+            iterator = client.list_entries_parallel(time_shards=4)
+
+        self.assertIs(iterator, list_parallel.return_value)
+        list_parallel.assert_called_once_with(
+            client,
+            resource_names=[f"projects/{self.PROJECT}"],
+            filter_=None,
+            order_by=None,
+            start_time=None,
+            end_time=None,
+            time_shards=4,
+            max_workers=8,
+            max_results=None,
+            page_size=None,
+        )
+
+    def test_tail_entries_defaults(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        client._logging_api = api = mock.Mock()
+
+        tail = client.tail_entries(filter_="severity>=ERROR", buffer_window=5)
+
+        self.assertIs(tail, api.tail_entries.return_value)
+        # no default time restriction is added to a tail
+        api.tail_entries.assert_called_once_with(
+            [f"projects/{self.PROJECT}"],
+            filter_="severity>=ERROR",
+            buffer_window=5,
+            raw=False,
+        )
+
+    def test_tail_entries_http(self):
+        from google.cloud.logging_v2._tail import _PolledTail
+
+        client = self._make_one(
+            project=self.PROJECT, credentials=_make_credentials(), _use_grpc=False
+        )
+
+        with client.tail_entries(filter_="severity>=ERROR") as tail:
+            self.assertIsInstance(tail, _PolledTail)
+            self.assertEqual(tail._filter, "severity>=ERROR")
+        with self.assertRaises(ValueError):
+            client.tail_entries(raw=True)
+
+    def test_entries_for_traces_defaults(self):
+        import datetime
+
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+
+        with mock.patch(
+            "google.cloud.logging_v2.client._entries_for_traces"
+        ) as entries_for_traces:
+            results = client.entries_for_traces(["a", "b"], max_workers=4)
+
+        self.assertIs(results, entries_for_traces.return_value)
+        entries_for_traces.assert_called_once_with(
+            client,
+            ["a", "b"],
+            resource_names=[f"projects/{self.PROJECT}"],
+            filter_=None,
+            start_time=None,
+            end_time=None,
+            time_margin=datetime.timedelta(minutes=10),
+            max_workers=4,
+            page_size=None,
+        )
+
+    def test_export_entries_defaults(self):
+        client = self._make_one(project=self.PROJECT, credentials=_make_credentials())
+        client._logging_api = api = mock.Mock()
+
+        with mock.patch(
+            "google.cloud.logging_v2.client._export_entries"
+        ) as export_entries:
+            count = client.export_entries("out", format_="parquet")
+
+        self.assertIs(count, export_entries.return_value)
+        export_entries.assert_called_once_with(
+            api,
+            "out",
+            resource_names=[f"projects/{self.PROJECT}"],
+            filter_=None,
+            order_by="timestamp asc",
+            format_="parquet",
+            checkpoint_path=None,
+            page_size=1000,
+            max_entries_per_file=100000,
+        )
+
     def test_sink_defaults(self):
         from google.cloud.logging import Sink
 
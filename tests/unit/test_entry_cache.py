@@ -0,0 +1,267 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import os
+import tempfile
+import unittest
+
+import mock
+
+PROJECT = "PROJECT"
+LOG_NAME = f"projects/{PROJECT}/logs/log"
+START = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+HOUR = datetime.timedelta(hours=1)
+SEVERITIES = ("INFO", "WARNING", "ERROR")
+
+
+def _resources(count=12):
+    """One entry every 30 minutes from ``START``."""
+    return [
+        {
+            "logName": LOG_NAME,
+            "insertId": f"id-{index:02d}",
+            "timestamp": (START + index * HOUR / 2).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "severity": SEVERITIES[index % 3],
+            "trace": f"projects/{PROJECT}/traces/{index % 2}",
+            "textPayload": f"message {index}",
+        }
+        for index in range(count)
+    ]
+
+
+class _Server(object):
+    """Serves ``_list_entry_pages`` from a list of entry resources."""
+
+    def __init__(self, resources):
+        self.resources = resources
+        self.filters = []
+
+    def _list_entry_pages(self, resource_names, *, filter_, order_by, page_size):
+        from google.cloud.logging_v2.filters import compile_filter
+
+        self.filters.append(filter_)
+        matches = compile_filter(filter_)
+        resources = [resource for resource in self.resources if matches(resource)]
+        for offset in range(0, len(resources), page_size):
+            yield resources[offset : offset + page_size], None
+
+
+class Test__merge(unittest.TestCase):
+    def test_merge(self):
+        from google.cloud.logging_v2.entry_cache import _merge
+
+        self.assertEqual(_merge([]), [])
+        self.assertEqual(
+            _merge([(5, 8), (0, 2), (2, 3), (6, 7), (10, 12)]),
+            [(0, 3), (5, 8), (10, 12)],
+        )
+
+
+class Test__missing(unittest.TestCase):
+    def test_missing(self):
+        from google.cloud.logging_v2.entry_cache import _missing
+
+        covered = [(0, 3), (5, 8), (10, 12)]
+        self.assertEqual(_missing(0, 3, covered), [])
+        self.assertEqual(_missing(1, 11, covered), [(3, 5), (8, 10)])
+        self.assertEqual(
+            _missing(-2, 14, covered), [(-2, 0), (3, 5), (8, 10), (12, 14)]
+        )
+        self.assertEqual(_missing(20, 30, covered), [(20, 30)])
+
+
+class Test__sql_restrictions(unittest.TestCase):
+    def _call_fut(self, filter_):
+        from google.cloud.logging_v2.entry_cache import _sql_restrictions
+
+        return _sql_restrictions(filter_)
+
+    def test_indexed_fields(self):
+        self.assertEqual(
+            self._call_fut(
+                f'severity>=WARNING AND logName="{LOG_NAME}" AND trace=(a OR b) '
+                "AND textPayload:x"
+            ),
+            (
+                ["severity >= ?", "log_name = ?", "trace IN (?, ?)"],
+                [4, LOG_NAME, "a", "b"],
+            ),
+        )
+        self.assertEqual(
+            self._call_fut("severity=(ERROR OR CRITICAL)"),
+            (["severity IN (?, ?)"], [5, 6]),
+        )
+
+    def test_unindexed(self):
+        self.assertEqual(self._call_fut(""), ([], []))
+        self.assertEqual(self._call_fut("severity>=ERROR OR trace=a"), ([], []))
+        self.assertEqual(self._call_fut("trace!=a"), ([], []))
+
+
+class TestEntryCache(unittest.TestCase):
+    def _make_one(self, resources=None, **kw):
+        from google.cloud.logging_v2.entry_cache import EntryCache
+
+        self.server = _Server(_resources() if resources is None else resources)
+        self.client = mock.Mock(
+            project=PROJECT, logging_api=self.server, _entry_loggers={}
+        )
+        return EntryCache(self.client, **kw)
+
+    def _insert_ids(self, entries):
+        return [entry.insert_id for entry in entries]
+
+    def test_repeated_query(self):
+        from google.cloud.logging import TextEntry
+
+        cache = self._make_one()
+        query = {
+            "filter_": "severity>=WARNING",
+            "start_time": START,
+            "end_time": START + 3 * HOUR,
+        }
+
+        first = list(cache.list_entries(**query))
+        second = list(cache.list_entries(**query))
+
+        self.assertEqual(self._insert_ids(first), ["id-01", "id-02", "id-04", "id-05"])
+        self.assertEqual(self._insert_ids(second), self._insert_ids(first))
+        self.assertIsInstance(second[0], TextEntry)
+        self.assertEqual(second[0].timestamp, START + HOUR / 2)
+        self.assertEqual(cache.queries, 1)
+        self.assertEqual(cache.fetched, 4)
+        self.assertEqual(
+            self.server.filters,
+            [
+                '(severity>=WARNING) AND timestamp>="2023-01-01T00:00:00.000000+0000" '
+                'AND timestamp<"2023-01-01T03:00:00.000000+0000"'
+            ],
+        )
+
+    def test_fetches_missing_ranges_only(self):
+        cache = self._make_one()
+        cache.list_entries(start_time=START + HOUR, end_time=START + 2 * HOUR)
+
+        entries = cache.list_entries(start_time=START, end_time=START + 3 * HOUR)
+
+        self.assertEqual(self._insert_ids(entries), [f"id-{i:02d}" for i in range(6)])
+        self.assertEqual(cache.queries, 3)
+        self.assertEqual(cache.fetched, 6)
+        self.assertEqual(cache.covered_ranges(), [(START, START + 3 * HOUR)])
+
+    def test_unfiltered_ranges_answer_all_filters(self):
+        cache = self._make_one()
+        cache.list_entries(start_time=START, end_time=START + 6 * HOUR)
+
+        entries = cache.list_entries(
+            filter_="severity=ERROR AND trace:traces/0",
+            start_time=START,
+            end_time=START + 6 * HOUR,
+            order_by="timestamp desc",
+        )
+
+        self.assertEqual(self._insert_ids(entries), ["id-08", "id-02"])
+        self.assertEqual(cache.queries, 1)
+
+    def test_filtered_ranges_are_kept_apart(self):
+        cache = self._make_one()
+        query = {"start_time": START, "end_time": START + HOUR}
+        list(cache.list_entries(filter_="severity=ERROR", **query))
+
+        entries = cache.list_entries(filter_="severity=INFO", **query)
+
+        self.assertEqual(self._insert_ids(entries), ["id-00"])
+        self.assertEqual(cache.queries, 2)
+        self.assertEqual(cache.covered_ranges(filter_="trace:x"), [])
+
+    def test_resource_names_are_kept_apart(self):
+        cache = self._make_one()
+        query = {"start_time": START, "end_time": START + HOUR}
+        list(cache.list_entries(**query))
+
+        entries = cache.list_entries(resource_names=["folders/1"], **query)
+
+        self.assertEqual(self._insert_ids(entries), ["id-00", "id-01"])
+        self.assertEqual(cache.queries, 2)
+
+    def test_max_results(self):
+        cache = self._make_one()
+
+        entries = cache.list_entries(
+            filter_="severity=INFO",
+            start_time=START,
+            end_time=START + 6 * HOUR,
+            max_results=3,
+            page_size=2,
+        )
+
+        self.assertEqual(self._insert_ids(entries), ["id-00", "id-03", "id-06"])
+
+    def test_recent_ranges_are_fetched_again(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cache = self._make_one([], settle_time=datetime.timedelta(minutes=5))
+
+        list(cache.list_entries(start_time=now - HOUR))
+        list(cache.list_entries(start_time=now - HOUR))
+
+        self.assertEqual(cache.queries, 2)
+        (covered,) = cache.covered_ranges()
+        self.assertEqual(covered[0], now - HOUR)
+        self.assertLess(covered[1], now - datetime.timedelta(minutes=4))
+
+    def test_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "entries.db")
+            query = {"start_time": START, "end_time": START + HOUR}
+            with self._make_one(path=path) as cache:
+                list(cache.list_entries(**query))
+
+            with self._make_one(path=path) as cache:
+                entries = cache.list_entries(**query)
+
+                self.assertEqual(self._insert_ids(entries), ["id-00", "id-01"])
+                self.assertEqual(cache.queries, 0)
+
+                cache.clear()
+                self.assertEqual(cache.covered_ranges(), [])
+
+    def test_entries_without_insert_id(self):
+        resources = _resources(2)
+        for resource in resources:
+            del resource["insertId"]
+            resource["timestamp"] = resources[0]["timestamp"]
+        cache = self._make_one(resources)
+        query = {"start_time": START, "end_time": START + HOUR}
+
+        first = cache.list_entries(**query)
+        # the same range fetched again stores the same entries once
+        cache._connection.execute("DELETE FROM coverage")
+        second = cache.list_entries(**query)
+
+        self.assertEqual(
+            sorted(entry.payload for entry in first), ["message 0", "message 1"]
+        )
+        self.assertEqual(
+            sorted(entry.payload for entry in second), ["message 0", "message 1"]
+        )
+
+    def test_unsupported_filter(self):
+        from google.cloud.logging_v2.filters import FilterSyntaxError
+
+        cache = self._make_one()
+
+        with self.assertRaises(FilterSyntaxError):
+            cache.list_entries(filter_="sample(insertId, 0.1)")
+        self.assertEqual(self.server.filters, [])
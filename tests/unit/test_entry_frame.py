@@ -0,0 +1,244 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+import mock
+
+try:
+    import numpy
+except ImportError:  # pragma: NO COVER
+    numpy = None
+
+try:
+    import pandas
+except ImportError:  # pragma: NO COVER
+    pandas = None
+
+PROJECT = "PROJECT"
+LOG_A = f"projects/{PROJECT}/logs/a"
+LOG_B = f"projects/{PROJECT}/logs/b"
+START = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+START_NS = 1672531200 * 10**9
+
+
+def _entry(seconds, severity=None, log_name=LOG_A, resource_type="global", **kw):
+    from google.cloud.logging_v2.entries import TextEntry
+    from google.cloud.logging_v2.resource import Resource
+
+    return TextEntry(
+        log_name=log_name,
+        timestamp=START + datetime.timedelta(seconds=seconds),
+        severity=severity,
+        resource=Resource(type=resource_type, labels={}),
+        **kw,
+    )
+
+
+def _entry_pb(seconds, nanos=0, severity=0, log_name=LOG_A, **kw):
+    from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+
+    entry = LogEntryPB(
+        log_name=log_name,
+        timestamp={"seconds": 1672531200 + seconds, "nanos": nanos},
+        severity=severity,
+        resource={"type": "gce_instance"},
+        **kw,
+    )
+    return LogEntryPB.pb(entry)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestLogEntryFrame(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.logging import LogEntryFrame
+
+        return LogEntryFrame
+
+    def _make_one(self, entries, **kw):
+        return self._get_target_class().from_entries(entries, **kw)
+
+    def test_empty(self):
+        frame = self._make_one([])
+
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(frame.severity_counts(), {})
+        starts, counts = frame.timestamp_histogram(datetime.timedelta(minutes=1))
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(counts), 0)
+
+    def test_columns_from_entries(self):
+        entries = [
+            _entry(0, "ERROR", insert_id="one", trace="t1", span_id="s1"),
+            _entry(1, "info", log_name=LOG_B, resource_type="gce_instance"),
+            _entry(2),
+        ]
+        entries[0].received_timestamp = START + datetime.timedelta(seconds=5)
+
+        columns = self._make_one(entries).to_numpy()
+
+        self.assertEqual(columns["timestamp"].dtype, numpy.int64)
+        self.assertEqual(
+            columns["timestamp"].tolist(),
+            [START_NS, START_NS + 10**9, START_NS + 2 * 10**9],
+        )
+        self.assertEqual(columns["received_timestamp"][0], START_NS + 5 * 10**9)
+        self.assertTrue(
+            numpy.isnat(columns["received_timestamp"][1:].view("M8[ns]")).all()
+        )
+        self.assertEqual(columns["severity"].dtype, numpy.int8)
+        self.assertEqual(columns["severity"].tolist(), [5, 2, 0])
+        self.assertEqual(columns["log_name"].tolist(), [0, 1, 0])
+        self.assertEqual(columns["resource_type"].tolist(), [0, 1, 0])
+        self.assertEqual(columns["insert_id"].tolist(), ["one", None, None])
+        self.assertEqual(columns["trace"].tolist(), ["t1", None, None])
+        self.assertEqual(columns["span_id"].tolist(), ["s1", None, None])
+        self.assertNotIn("payload", columns)
+
+    def test_columns_from_protobufs(self):
+        from google.cloud.logging_v2 import _entry_views
+
+        entries = [
+            _entry_pb(0, nanos=123456789, severity=400, insert_id="one"),
+            _entry_views.entry_view_from_pb(
+                _entry_pb(1, severity=500, log_name=LOG_B, text_payload="hi"),
+                mock.Mock(project=PROJECT),
+                {},
+            ),
+        ]
+
+        frame = self._make_one(entries, include_payload=True)
+        columns = frame.to_numpy()
+
+        # nanoseconds are kept, not truncated to microseconds
+        self.assertEqual(
+            columns["timestamp"].tolist(), [START_NS + 123456789, START_NS + 10**9]
+        )
+        self.assertEqual(columns["severity"].tolist(), [4, 5])
+        self.assertEqual(frame.log_names, (LOG_A, LOG_B))
+        self.assertEqual(frame.resource_types, ("gce_instance",))
+        self.assertEqual(columns["insert_id"].tolist(), ["one", None])
+        self.assertEqual(columns["payload"].tolist(), [None, "hi"])
+
+    def test_extend_api_repr(self):
+        frame = self._make_one([_entry(0)], include_payload=True)
+
+        frame.extend_api_repr(
+            [
+                {
+                    "logName": LOG_B,
+                    "resource": {"type": "gce_instance"},
+                    "timestamp": "2023-01-01T00:00:01.123456789Z",
+                    "receiveTimestamp": "2023-01-01T00:00:02Z",
+                    "severity": "WARNING",
+                    "insertId": "one",
+                    "textPayload": "hi",
+                },
+                {"logName": LOG_A, "jsonPayload": {"message": "hello"}},
+            ]
+        )
+
+        columns = frame.to_numpy()
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(columns["timestamp"][1], START_NS + 1123456789)
+        self.assertEqual(columns["received_timestamp"][1], START_NS + 2 * 10**9)
+        self.assertTrue(numpy.isnat(columns["timestamp"][2:].view("M8[ns]")).all())
+        self.assertEqual(columns["severity"].tolist(), [0, 4, 0])
+        self.assertEqual(columns["log_name"].tolist(), [0, 1, 0])
+        self.assertEqual(frame.resource_types, ("global", "gce_instance", ""))
+        self.assertEqual(columns["insert_id"].tolist(), [None, "one", None])
+        self.assertEqual(
+            columns["payload"].tolist(), [None, "hi", {"message": "hello"}]
+        )
+
+    def test_to_numpy_shares_memory(self):
+        frame = self._make_one([_entry(0), _entry(1)])
+
+        first = frame.to_numpy()["timestamp"]
+        second = frame.to_numpy()["timestamp"]
+
+        self.assertTrue(numpy.shares_memory(first, second))
+
+    def test_append_after_export(self):
+        frame = self._make_one([_entry(0)])
+        exported = frame.to_numpy()["timestamp"]
+
+        frame.append(_entry(1))
+
+        self.assertEqual(exported.tolist(), [START_NS])
+        self.assertEqual(
+            frame.to_numpy()["timestamp"].tolist(), [START_NS, START_NS + 10**9]
+        )
+
+    def test_counts(self):
+        frame = self._make_one(
+            [
+                _entry(0, "ERROR"),
+                _entry(1, "ERROR", log_name=LOG_B),
+                _entry(2, "DEBUG", resource_type="k8s_container"),
+            ]
+        )
+
+        self.assertEqual(frame.severity_counts(), {"DEBUG": 1, "ERROR": 2})
+        self.assertEqual(frame.log_name_counts(), {LOG_A: 2, LOG_B: 1})
+        self.assertEqual(
+            frame.resource_type_counts(), {"global": 2, "k8s_container": 1}
+        )
+
+    def test_timestamp_histogram(self):
+        frame = self._make_one(
+            [
+                _entry(0, "ERROR"),
+                _entry(30, "INFO"),
+                _entry(150, "ERROR"),
+                _entry(170, "CRITICAL"),
+            ]
+        )
+
+        starts, counts = frame.timestamp_histogram(datetime.timedelta(minutes=1))
+
+        self.assertEqual(starts.dtype, numpy.dtype("datetime64[ns]"))
+        self.assertEqual(
+            starts.astype(numpy.int64).tolist(),
+            [
+                START_NS,
+                START_NS + 60 * 10**9,
+                START_NS + 120 * 10**9,
+            ],
+        )
+        self.assertEqual(counts.tolist(), [2, 0, 2])
+
+        _, counts = frame.timestamp_histogram(
+            datetime.timedelta(minutes=1), severity="ERROR"
+        )
+        self.assertEqual(counts.tolist(), [1, 0, 2])
+
+    def test_timestamp_histogram_invalid_interval(self):
+        frame = self._make_one([_entry(0)])
+
+        with self.assertRaises(ValueError):
+            frame.timestamp_histogram(datetime.timedelta(0))
+
+    @unittest.skipIf(pandas is None, "requires pandas")
+    def test_to_pandas(self):
+        frame = self._make_one([_entry(0, "ERROR"), _entry(1, "INFO", log_name=LOG_B)])
+
+        df = frame.to_pandas()
+
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df["timestamp"].iloc[0], pandas.Timestamp(START))
+        self.assertEqual(list(df["log_name"]), [LOG_A, LOG_B])
+        self.assertEqual(list(df[df["severity"] >= "WARNING"]["log_name"]), [LOG_A])
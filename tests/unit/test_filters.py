@@ -0,0 +1,196 @@
+# Copyright 2023 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+LOG_NAME = "projects/PROJECT/logs/my%2Flog"
+
+RESOURCE = {
+    "logName": LOG_NAME,
+    "insertId": "abc",
+    "severity": "ERROR",
+    "timestamp": "2023-01-02T00:00:00.123456789Z",
+    "resource": {"type": "gce_instance", "labels": {"zone": "us-east1-b"}},
+    "labels": {"compute.googleapis.com/resource_name": "vm-1"},
+    "httpRequest": {"status": 503, "responseSize": "1234", "cacheHit": False},
+    "jsonPayload": {"message": "Hello World", "tags": ["a", "b"], "count": 5},
+}
+
+
+class Test_compile_filter(unittest.TestCase):
+    def _call_fut(self, filter_):
+        from google.cloud.logging_v2.filters import compile_filter
+
+        return compile_filter(filter_)
+
+    def _matches(self, filter_, entry=RESOURCE):
+        return self._call_fut(filter_)(entry)
+
+    def test_empty(self):
+        self.assertTrue(self._matches(""))
+        self.assertTrue(self._matches(None))
+
+    def test_severity(self):
+        self.assertTrue(self._matches("severity>=ERROR"))
+        self.assertTrue(self._matches("severity>=warning"))
+        self.assertTrue(self._matches("severity=500"))
+        self.assertFalse(self._matches("severity>ERROR"))
+        self.assertTrue(self._matches("severity=(ERROR OR CRITICAL)"))
+        self.assertTrue(self._matches("severity=ERROR OR severity=WARNING"))
+        self.assertTrue(self._matches("severity<INFO", {}))
+        self.assertTrue(self._matches("severity>=WARNING", {"severity": 400}))
+
+    def test_string_fields(self):
+        self.assertTrue(self._matches('resource.type="gce_instance"'))
+        self.assertTrue(self._matches("resource.labels.zone:EAST1"))
+        self.assertFalse(self._matches('jsonPayload.message="hello world"'))
+        self.assertTrue(self._matches("jsonPayload.message:hello"))
+        self.assertTrue(
+            self._matches('labels."compute.googleapis.com/resource_name"=vm-1')
+        )
+        self.assertTrue(self._matches("insert_id=abc"))
+
+    def test_numbers_and_booleans(self):
+        self.assertTrue(self._matches("httpRequest.status>=500"))
+        # 64-bit integers are strings in the API representation
+        self.assertTrue(self._matches("httpRequest.responseSize>1000"))
+        self.assertTrue(self._matches("jsonPayload.count<10"))
+        self.assertTrue(self._matches("httpRequest.cacheHit=false"))
+        self.assertFalse(self._matches("httpRequest.cacheHit=true"))
+
+    def test_timestamps(self):
+        self.assertTrue(self._matches('timestamp>="2023-01-01T00:00:00Z"'))
+        self.assertTrue(self._matches('timestamp>"2023-01-02T00:00:00.123455Z"'))
+        self.assertFalse(self._matches('timestamp<"2023-01-02"'))
+        self.assertTrue(self._matches('timestamp<"2023-01-01T20:00:00-05:00"'))
+        self.assertFalse(self._matches('receiveTimestamp>="2023-01-01T00:00:00Z"'))
+
+    def test_repeated_values(self):
+        self.assertTrue(self._matches("jsonPayload.tags=b"))
+        self.assertTrue(self._matches("jsonPayload.tags=(x OR b)"))
+        self.assertFalse(self._matches("jsonPayload.tags=c"))
+
+    def test_presence(self):
+        self.assertTrue(self._matches("jsonPayload.count:*"))
+        self.assertFalse(self._matches("jsonPayload.missing:*"))
+        self.assertFalse(self._matches("jsonPayload.message.nested:*"))
+
+    def test_negation(self):
+        self.assertTrue(self._matches("NOT jsonPayload.missing:*"))
+        self.assertTrue(self._matches("-severity=DEBUG"))
+        self.assertTrue(self._matches("jsonPayload.missing!=x"))
+        self.assertFalse(self._matches("NOT NOT jsonPayload.missing:*"))
+
+    def test_regular_expressions(self):
+        self.assertTrue(self._matches('jsonPayload.message=~"^Hel+o"'))
+        self.assertFalse(self._matches('jsonPayload.message=~"^hello"'))
+        self.assertTrue(self._matches('jsonPayload.message=~"(?i)^hello"'))
+        self.assertTrue(self._matches('jsonPayload.message!~"^x"'))
+
+    def test_global_restrictions(self):
+        self.assertTrue(self._matches("world"))
+        self.assertTrue(self._matches('"hello world" us-east1'))
+        self.assertFalse(self._matches('"goodbye"'))
+
+    def test_log_id(self):
+        self.assertTrue(self._matches('log_id("my/log")'))
+        self.assertFalse(self._matches("log_id(my)"))
+
+    def test_precedence(self):
+        # OR binds more tightly than AND
+        self.assertFalse(self._matches("severity=ERROR OR severity=INFO AND goodbye"))
+        self.assertTrue(self._matches("severity=INFO OR (severity=ERROR AND world)"))
+        self.assertTrue(self._matches("severity=ERROR world"))
+
+    def test_log_entries(self):
+        from google.cloud.logging_v2.entries import StructEntry
+        from google.cloud.logging_v2.entries import TextEntry
+        from google.cloud.logging_v2.resource import Resource
+
+        entry = StructEntry(
+            log_name=LOG_NAME,
+            severity="WARNING",
+            timestamp=datetime.datetime(2023, 1, 2, tzinfo=datetime.timezone.utc),
+            resource=Resource(type="global", labels={"project_id": "PROJECT"}),
+            payload={"message": "hi"},
+        )
+
+        self.assertTrue(self._matches("severity>=WARNING", entry))
+        self.assertTrue(self._matches("jsonPayload.message=hi", entry))
+        self.assertFalse(self._matches("textPayload:*", entry))
+        self.assertTrue(self._matches("resource.labels.project_id=PROJECT", entry))
+        self.assertTrue(self._matches('timestamp>"2023-01-01T00:00:00Z"', entry))
+        self.assertFalse(self._matches("logName.upper:*", entry))
+        self.assertTrue(self._matches("hi", entry))
+        self.assertTrue(self._matches("textPayload:bye", TextEntry(payload="bye")))
+
+    def test_entry_views(self):
+        from google.cloud.logging_v2._entry_views import entry_view_from_pb
+        from google.cloud.logging_v2.types import LogEntry as LogEntryPB
+
+        entry_pb = LogEntryPB.pb(
+            LogEntryPB(log_name=LOG_NAME, severity=500, text_payload="failed")
+        )
+        entry = entry_view_from_pb(entry_pb, None, {})
+
+        self.assertTrue(self._matches("severity=ERROR AND textPayload:fail", entry))
+
+    def test_folding(self):
+        from google.cloud.logging_v2.filters import _Parser
+        from google.cloud.logging_v2.filters import _simplify
+
+        node = _simplify(_Parser("a=x OR (a=y OR b=z) OR a=w AND NOT NOT c:*").parse())
+
+        self.assertEqual(
+            node,
+            (
+                "and",
+                [
+                    (
+                        "or",
+                        [
+                            ("in", ["a"], ["x", "y", "w"], 1),
+                            ("compare", ["b"], "=", "z", 16),
+                        ],
+                    ),
+                    ("compare", ["c"], ":", "*", 40),
+                ],
+            ),
+        )
+
+    def test_cached(self):
+        self.assertIs(
+            self._call_fut("severity>=ERROR"), self._call_fut("severity>=ERROR")
+        )
+
+    def test_syntax_errors(self):
+        from google.cloud.logging_v2.filters import FilterSyntaxError
+
+        for filter_, position in (
+            ("severity>=BOGUS", 8),
+            ("(a", 2),
+            ("a)", 1),
+            ("a=(b", 4),
+            ('"abc', 0),
+            ("a=", 2),
+            ("a!b", 1),
+            ('x=~"("', 1),
+            ('timestamp>"yesterday"', 9),
+            ("sample(insertId, 0.1)", 0),
+            ("a.=b", 0),
+        ):
+            with self.assertRaises(FilterSyntaxError) as raised:
+                self._call_fut(filter_)
+            self.assertEqual(raised.exception.position, position, filter_)
@@ -78,6 +78,23 @@ class TestLogger(unittest.TestCase):
         )
         self.assertEqual(logger.labels, LABELS)
 
+    def test_default_resource_detected_lazily(self):
+        from google.cloud.logging_v2.logger import _GLOBAL_RESOURCE
+
+        client = _Client(self.PROJECT, object())
+        patch = mock.patch(
+            "google.cloud.logging_v2.logger.detect_resource",
+            return_value=_GLOBAL_RESOURCE,
+        )
+        with patch as detect:
+            logger = self._make_one(self.LOGGER_NAME, client=client)
+            detect.assert_not_called()
+
+            self.assertIs(logger.default_resource, _GLOBAL_RESOURCE)
+            self.assertIs(logger.default_resource, _GLOBAL_RESOURCE)
+
+        detect.assert_called_once_with(self.PROJECT)
+
     def test_batch_w_bound_client(self):
         from google.cloud.logging import Batch
 
@@ -206,6 +223,22 @@ class TestLogger(unittest.TestCase):
             api._write_entries_called_with, (ENTRIES, None, None, None, True)
         )
 
+    def test_log_text_excluded(self):
+        from google.cloud.logging import TextEntry
+
+        client = _Client(self.PROJECT)
+        client.local_exclusions = mock.Mock(spec=["excluded"])
+        client.local_exclusions.excluded.return_value = True
+        api = client.logging_api = _DummyLoggingAPI()
+        logger = self._make_one(self.LOGGER_NAME, client=client)
+
+        logger.log_text("TEXT")
+
+        self.assertIsNone(api._write_entries_called_with)
+        ((entry,), _) = client.local_exclusions.excluded.call_args
+        self.assertIsInstance(entry, TextEntry)
+        self.assertEqual(entry.log_name, logger.full_name)
+
     def test_log_text_w_unicode_and_default_labels(self):
         from google.cloud.logging_v2.handlers._monitored_resources import (
             detect_resource,
@@ -1114,6 +1147,40 @@ class TestBatch(unittest.TestCase):
         batch.log_empty()
         self.assertEqual(batch.entries, [ENTRY])
 
+    def test_log_excluded(self):
+        from google.cloud.logging import Logger
+
+        client = _Client(project=self.PROJECT)
+        client.local_exclusions = mock.Mock(spec=["excluded"])
+        client.local_exclusions.excluded.side_effect = lambda entry, logger: (
+            entry.payload == "drop"
+        )
+        logger = Logger("NAME", client)
+        batch = self._make_one(logger, client=client)
+
+        batch.log("keep")
+        batch.log_text("drop")
+        batch.log_struct({"keep": True})
+
+        self.assertEqual(
+            [entry.payload for entry in batch.entries], ["keep", {"keep": True}]
+        )
+        self.assertEqual(client.local_exclusions.excluded.call_count, 3)
+        self.assertIs(client.local_exclusions.excluded.call_args[0][1], logger)
+
+    def test_log_wo_exclusions(self):
+        from google.cloud.logging import Logger
+
+        client = _Client(project=self.PROJECT)
+        client.local_exclusions = mock.Mock(spec=["excluded"])
+        logger = Logger("NAME", client)
+        batch = logger.batch(apply_exclusions=False)
+
+        batch.log_text("drop")
+
+        self.assertEqual([entry.payload for entry in batch.entries], ["drop"])
+        client.local_exclusions.excluded.assert_not_called()
+
     def test_log_empty_explicit(self):
         import datetime
 